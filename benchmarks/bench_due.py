@@ -0,0 +1,90 @@
+"""
+Due-date analytics over N projects: per-record Python parsing vs the NumPy
+columns used by `project-cli due` (needs numpy).
+
+    python -m benchmarks.bench_due --projects 1000000
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import random
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from utils import due, storage
+
+def _python(projects: list[dict], today: dt.date, within: int) -> Counter:
+    """What answering the question looks like without the columns: one date at a time."""
+    counts: Counter = Counter()
+    for p in projects:
+        value = p["due_date"]
+        if not value:
+            bucket = due.UNDATED
+        else:
+            try:
+                days = (dt.date.fromisoformat(value) - today).days
+            except ValueError:
+                bucket = due.UNREADABLE
+            else:
+                bucket = due.OVERDUE if days < 0 else due.DUE_SOON if days <= within else due.LATER
+        counts[p["user_id"], bucket] += 1
+    return counts
+
+def _timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=1_000_000)
+    parser.add_argument("--within", type=int, default=7)
+    args = parser.parse_args()
+    if not due.available():
+        raise SystemExit("numpy is not installed")
+
+    rng = random.Random(42)
+    today = dt.date(2026, 1, 1)
+    projects = [
+        {
+            "id": i,
+            "user_id": min(int(rng.paretovariate(1.2)), 10_000),
+            "due_date": rng.choice([None, "someday", "2026-02-30"]) if rng.random() < 0.3
+            else (today + dt.timedelta(days=rng.randint(-90, 180))).isoformat(),
+        }
+        for i in range(1, args.projects + 1)
+    ]
+    now = due.day_number(today.isoformat())
+
+    python_s, expected = _timed(lambda: _python(projects, today, args.within))
+    parse_s, days = _timed(lambda: due.parse_dates([p["due_date"] for p in projects]))
+    cols = {
+        "id": due.np.array([p["id"] for p in projects]),
+        "owner": due.np.array([p["user_id"] for p in projects]),
+        "day": days,
+    }
+    query_s, (owners, counts) = _timed(lambda: due.by_owner(cols, now, args.within))
+    window_s, _ = _timed(lambda: due.matching(cols, now, args.within, due.DUE_SOON))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DATA_DIR = Path(tmp)
+        storage.PROJECTS_FILE = storage.DATA_DIR / "projects.json"
+        storage._write_json(storage.PROJECTS_FILE, projects)
+        build_s, _ = _timed(due.build)
+        load_s, _ = _timed(due.columns)
+
+    got = {(int(o), b): int(n) for o, row in zip(owners, counts) for b, n in enumerate(row) if n}
+    assert got == dict(expected), "vectorized counts differ from the Python ones"
+
+    print(f"{args.projects} projects")
+    print(f"  python, per record       : {python_s * 1000:8.1f} ms")
+    print(f"  numpy parse_dates        : {parse_s * 1000:8.1f} ms")
+    print(f"  numpy histogram by owner : {query_s * 1000:8.1f} ms")
+    print(f"  numpy due-soon window    : {window_s * 1000:8.1f} ms")
+    print(f"  build columns from JSON  : {build_s * 1000:8.1f} ms  (once per change to projects)")
+    print(f"  load stored columns      : {load_s * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
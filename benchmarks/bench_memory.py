@@ -0,0 +1,54 @@
+"""
+Memory used by N tasks held as raw dicts, as Task objects and as a TaskTable.
+
+    python -m benchmarks.bench_memory --tasks 200000
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from models.task import Task
+from models.task_table import TaskTable
+
+def _measure(build) -> tuple[int, object]:
+    """Bytes still allocated by build() once it returns, plus its result."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    statuses = list(Task.STATUSES)
+    # Serialise and re-parse so every string is its own object, as after json.load
+    text = json.dumps([
+        {
+            "id": i,
+            "project_id": rng.randint(1, 2_000),
+            "title": f"Task {rng.randint(1, 5_000)}",
+            "status": rng.choice(statuses),
+            "assigned_to": rng.choice([None, rng.randint(1, 500)]),
+        }
+        for i in range(1, args.tasks + 1)
+    ])
+
+    dicts_bytes, raw = _measure(lambda: json.loads(text))
+    models_bytes, models = _measure(lambda: [Task.from_dict(d) for d in raw])
+    table_bytes, table = _measure(lambda: TaskTable.from_dicts(raw))
+
+    print(f"{args.tasks} tasks")
+    print(f"  raw dicts : {dicts_bytes / 1e6:8.1f} MB")
+    print(f"  Task objs : {models_bytes / 1e6:8.1f} MB  (on top of the dicts they were built from)")
+    print(f"  TaskTable : {table_bytes / 1e6:8.1f} MB  ({dicts_bytes / max(table_bytes, 1):.1f}x smaller than dicts)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Synthetic dataset generator for benchmarks.
+
+    python -m benchmarks.generate --out /tmp/pcli-large --size large
+
+Assignment is skewed: a few users own most projects and get most tasks,
+and a few projects hold most tasks, like real trackers.
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import random
+from pathlib import Path
+
+from models.task import Task
+from utils import storage
+
+SIZES = {
+    "small": (1_000, 10_000, 100_000),
+    "medium": (5_000, 50_000, 500_000),
+    "large": (10_000, 100_000, 1_000_000),
+}
+
+def _skewed(rng: random.Random, n: int) -> int:
+    """An id in 1..n where low ids are much more likely (Pareto-distributed)."""
+    return min(int(rng.paretovariate(1.2)), n)
+
+def generate(out: Path, users: int, projects: int, tasks: int, seed: int = 42) -> dict[str, int]:
+    """Write users.json, projects.json and tasks.json into `out`; returns record counts."""
+    rng = random.Random(seed)
+    out.mkdir(parents=True, exist_ok=True)
+    today = dt.date.today()
+    words = ["api", "docs", "billing", "search", "mobile", "infra", "auth", "reports", "export", "ui"]
+
+    storage._write_json(out / "users.json", [
+        {"id": i, "name": f"user{i}", "email": f"user{i}@example.com" if rng.random() < 0.8 else None}
+        for i in range(1, users + 1)
+    ])
+    storage._write_json(out / "projects.json", [
+        {
+            "id": i,
+            "title": f"{rng.choice(words)} project {i}",
+            "description": f"Synthetic project {i}" if rng.random() < 0.5 else None,
+            "due_date": (today + dt.timedelta(days=rng.randint(-90, 180))).isoformat() if rng.random() < 0.7 else None,
+            "user_id": _skewed(rng, users),
+        }
+        for i in range(1, projects + 1)
+    ])
+    statuses = list(Task.STATUSES)
+    storage._write_json(out / "tasks.json", [
+        {
+            "id": i,
+            "project_id": _skewed(rng, projects) if rng.random() < 0.5 else rng.randint(1, projects),
+            "title": f"{rng.choice(words)} task {rng.randint(1, 50_000)}",
+            "status": rng.choices(statuses, weights=(5, 2, 3))[0],
+            "assigned_to": _skewed(rng, users) if rng.random() < 0.85 else None,
+        }
+        for i in range(1, tasks + 1)
+    ])
+    return {"users": users, "projects": projects, "tasks": tasks}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic project-cli dataset.")
+    parser.add_argument("--out", required=True, help="Target data folder")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Preset (users, projects, tasks)")
+    parser.add_argument("--users", type=int, help="Override the preset user count")
+    parser.add_argument("--projects", type=int, help="Override the preset project count")
+    parser.add_argument("--tasks", type=int, help="Override the preset task count")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    users, projects, tasks = SIZES[args.size]
+    counts = generate(
+        Path(args.out),
+        args.users or users,
+        args.projects or projects,
+        args.tasks or tasks,
+        args.seed,
+    )
+    print(f"Wrote {counts['users']} users, {counts['projects']} projects, {counts['tasks']} tasks to {args.out}")
+
+if __name__ == "__main__":
+    main()
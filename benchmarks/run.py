@@ -0,0 +1,198 @@
+"""
+Benchmark suite: end-to-end subcommand timings plus storage/model micro-benchmarks.
+
+    python -m benchmarks.generate --out /tmp/pcli-small --size small
+    python -m benchmarks.run --data /tmp/pcli-small --output results.json --save-baseline
+    python -m benchmarks.run --data /tmp/pcli-small --output results.json --tolerance 0.2
+
+Every case runs `--repeat` times on a fresh copy of the dataset (so mutating
+commands always see the same data, with its sidecar indexes already built)
+and the fastest run is reported. With a
+baseline, any case slower than baseline * (1 + tolerance) fails the run.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from models.task import Task
+from utils import storage
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# name -> CLI arguments; names of existing users/projects come from benchmarks.generate
+COMMANDS = {
+    "cli.list-users": ["--plain", "list-users"],
+    "cli.list-projects": ["list-projects", "--format", "jsonl"],
+    "cli.list-projects.user": ["list-projects", "--user", "user1", "--format", "jsonl"],
+    "cli.list-tasks": ["list-tasks", "--format", "jsonl"],
+    "cli.list-tasks.project": ["list-tasks", "--project", "{project}", "--format", "jsonl"],
+    "cli.list-tasks.page": ["--plain", "list-tasks", "--limit", "50"],
+    "cli.report": ["report", "--format", "jsonl"],
+    "cli.report.assignee": ["report", "--by", "assignee", "--format", "jsonl"],
+    "cli.add-user": ["add-user", "--name", "bench user"],
+    "cli.add-project": ["add-project", "--user", "user1", "--title", "bench project"],
+    "cli.add-task": ["add-task", "--project", "{project}", "--title", "bench task", "--assigned-to", "user1"],
+    "cli.complete-task": ["complete-task", "--id", "1"],
+    "cli.import": ["import", "--file", "{import_file}"],
+    "cli.compact": ["--store", "journal", "compact"],
+    "cli.migrate": ["migrate", "--to", "sqlite"],
+}
+IMPORT_TASKS = 1_000
+
+def _env(data_dir: Path) -> dict[str, str]:
+    return dict(os.environ, PROJECT_CLI_DATA_DIR=str(data_dir), PROJECT_CLI_NO_DAEMON="1")
+
+def _prepare_template(data: Path, template: Path, project: str) -> None:
+    """
+    Copy the dataset once and build its indexes, so timed runs start warm;
+    one task added through the journal store leaves 'compact' a log to fold.
+    """
+    template.mkdir(parents=True)
+    for name in ("users.json", "projects.json", "tasks.json"):
+        if (data / name).exists():
+            shutil.copy2(data / name, template / name)
+    subprocess.run(
+        [sys.executable, "-c", "from utils import indexes, storage\n"
+                               "for e in storage.ENTITIES: indexes.ensure(e)"],
+        cwd=ROOT, env=_env(template), check=True,
+    )
+    subprocess.run(
+        [sys.executable, str(ROOT / "main.py"), "--store", "journal", "add-task",
+         "--project", project, "--title", "journaled task"],
+        stdout=subprocess.DEVNULL, env=_env(template), check=True,
+    )
+
+def _write_import_file(path: Path, project: str) -> None:
+    """A JSONL file for 'import': one new user and project, then IMPORT_TASKS tasks in it and `project`."""
+    lines = [
+        {"type": "user", "name": "bench importer", "email": None},
+        {"type": "project", "title": "bench import", "user": "bench importer"},
+    ]
+    lines += [{"type": "task", "project": "bench import" if i % 2 else project, "title": f"imported {i}",
+               "assigned_to": "user1"} for i in range(IMPORT_TASKS)]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+def _fresh_copy(template: Path, target: Path) -> None:
+    if target.exists():
+        shutil.rmtree(target)
+    # copy2 keeps mtimes, so the copied indexes still match their data files
+    shutil.copytree(template, target, copy_function=shutil.copy2)
+
+def _time_cli(args: list[str], data_dir: Path) -> float:
+    env = _env(data_dir)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, str(ROOT / "main.py"), *args],
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed: {proc.stderr.decode(errors='replace')}")
+    return elapsed
+
+def _best(repeat: int, run: Callable[[], float]) -> float:
+    return min(run() for _ in range(repeat))
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def run_suite(data: Path, repeat: int) -> dict[str, float]:
+    """Seconds per case (best of `repeat`)."""
+    results: dict[str, float] = {}
+    projects = storage._read_json(data / "projects.json")
+    first_project = projects[0]["title"] if projects else "none"
+
+    with tempfile.TemporaryDirectory(prefix="pcli-bench-") as tmp:
+        template, work = Path(tmp) / "template", Path(tmp) / "data"
+        _prepare_template(data, template, first_project)
+        import_file = Path(tmp) / "import.jsonl"
+        _write_import_file(import_file, first_project)
+        for name, args in COMMANDS.items():
+            args = [a.format(project=first_project, import_file=import_file) for a in args]
+
+            def one_run() -> float:
+                _fresh_copy(template, work)
+                return _time_cli(args, work)
+
+            results[name] = _best(repeat, one_run)
+            print(f"  {name:<28} {results[name] * 1000:9.1f} ms", flush=True)
+
+        tasks_file = data / "tasks.json"
+        raw = storage._read_json(tasks_file)
+        micro = {
+            "storage._read_json.tasks": lambda: storage._read_json(tasks_file),
+            "storage._write_json.tasks": lambda: storage._write_json(Path(tmp) / "out.json", raw),
+            "models.Task.from_dict": lambda: [Task.from_dict(d) for d in raw],
+        }
+        for name, fn in micro.items():
+            results[name] = _best(repeat, lambda: _timed(fn))
+            print(f"  {name:<28} {results[name] * 1000:9.1f} ms", flush=True)
+    return results
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Names of cases slower than the baseline allows."""
+    regressions = []
+    for name, base in sorted(baseline.items()):
+        if name not in results or base <= 0:
+            continue
+        ratio = results[name] / base
+        flag = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(f"  {name:<28} {ratio:6.2f}x baseline  {flag}")
+        if flag != "ok":
+            regressions.append(name)
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the project-cli benchmark suite.")
+    parser.add_argument("--data", required=True, help="Dataset folder (see benchmarks.generate)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest counts")
+    parser.add_argument("--output", help="Write results as JSON here")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    data = Path(args.data)
+    print(f"Benchmarking {data}")
+    results = run_suite(data, args.repeat)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "dataset": {e: len(storage._read_json(data / f"{e}.json")) for e in storage.ENTITIES},
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved baseline to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print("No baseline to compare against (use --save-baseline).")
+        return 0
+
+    print(f"Comparing with {baseline_path} (tolerance {args.tolerance:.0%})")
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,76 +1,207 @@
 from __future__ import annotations
 import argparse
+import itertools
+import json
 import re
-from typing import List, Optional
+import sys
+from collections import Counter
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, TypeVar
 
-from utils.printing import info, warn, error, table
-from utils import storage
+from utils.printing import info, warn, error, table, write_rows
+from utils import printing, storage, timing
 
 # Import model classes
 from models.user import User
 from models.project import Project
 from models.task import Task
 
+M = TypeVar("M", User, Project, Task)
+
+# Commands that write based on what they read (next id, name lookups, current
+# status); each runs inside one storage transaction so concurrent runs don't
+# hand out the same id or lose each other's changes. import takes the lock
+# itself, once its input has been read.
+WRITE_COMMANDS = {"add-user", "add-project", "add-task", "complete-task", "update-tasks", "complete-tasks",
+                  "compact", "migrate", "reshard"}
+
+# Commands a batch script can't run: they never return or would nest
+BATCH_EXCLUDED = {"batch", "serve", "watch"}
+# Commands that read or rewrite the stored files themselves, so a batch writes
+# its deferred changes out before running them
+BATCH_FLUSH_FIRST = {"migrate", "reshard", "fsck", "export", "sync"}
+
+# List commands whose output is cached on disk (utils/result_cache.py) -> entities they read
+CACHED_COMMANDS = {
+    "list-users": ("users",),
+    "list-projects": ("users", "projects"),
+    "list-tasks": ("users", "projects", "tasks"),
+}
+
 def _load_users_as_models() -> list[User]:
     """Load users.json and convert dicts to User models."""
-    users_raw = storage.load_users()
-    users: list[User] = []
-    for d in users_raw:
-        try:
-            users.append(User.from_dict(d))
-        except Exception:
-            continue
-    return users
+    return list(_all_models("users", User))
 
 def _load_projects_as_models() -> list[Project]:
     """Load projects.json and convert dicts to Project models."""
-    projects_raw = storage.load_projects()
-    projects: list[Project] = []
-    for d in projects_raw:
-        try:
-            projects.append(Project.from_dict(d))
-        except Exception:
-            continue
-    return projects
+    return list(_all_models("projects", Project))
+
+def _all_models(entity: str, cls: type[M]) -> Iterable[M]:
+    """
+    Every record of an entity as models. With --workers N (JSON store) the
+    file is parsed by N processes; otherwise records are converted as they stream in.
+    """
+    if storage.WORKERS > 1 and storage.STORE == "json" and storage._memory is None:
+        from utils import parallel
+        with timing.phase("models.parallel_load") as counts:
+            models, skipped = parallel.load_models(storage._path(entity), cls, storage.WORKERS)
+            counts["records"] = len(models)
+        _warn_skipped(cls, skipped)
+        return models
+    return _iter_models(storage.stream(entity), cls)
+
+def _warn_skipped(cls: type, skipped: int) -> None:
+    if skipped:
+        warn(f"Skipped {skipped} malformed {cls.__name__.lower()} record(s).")
+
+def _iter_models(records: Iterable[dict], cls: type[M]) -> Iterable[M]:
+    """Convert dicts to models lazily, skipping (and counting) malformed ones."""
+    return timing.wrap("models.build", _build_models(records, cls))
 
-def _load_tasks_as_models() -> list[Task]:
-    """Load tasks.json and convert dicts to Task models."""
-    tasks_raw = storage.load_tasks()
-    tasks: list[Task] = []
-    for d in tasks_raw:
+def _build_models(records: Iterable[dict], cls: type[M]) -> Iterator[M]:
+    skipped = 0
+    for d in records:
         try:
-            tasks.append(Task.from_dict(d))
-        except Exception:
-            continue
-    return tasks
+            yield cls.from_dict(d)
+        except (AttributeError, TypeError, ValueError):
+            skipped += 1
+    _warn_skipped(cls, skipped)
+
+def _paginate(rows: Iterable[list], offset: int, limit: int | None) -> Iterator[list]:
+    """Skip `offset` rows and stop after `limit` (all if None)."""
+    stop = offset + limit if limit is not None else None
+    return itertools.islice(rows, offset, stop)
+
+def _render(title: str, columns: list[str], rows: Iterable[list], fmt: str, empty_msg: str) -> None:
+    """Print rows as a rich table, or stream them as jsonl/csv."""
+    if fmt != "table":
+        write_rows(fmt, columns, rows)
+        return
+    rows = [["—" if x is None else x for x in r] for r in rows]
+    if not rows:
+        warn(empty_msg)
+        return
+    table(title, columns, rows)
+
+def _sort_key(value: object) -> tuple:
+    """Orders any stored value: numbers, then text (case-insensitively), then missing values."""
+    if value is None or value == "":
+        return (2,)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value).casefold())
 
-def _save_projects_from_models(projects: list[Project]) -> None:
-    """Serialize Project models to dicts and save to projects.json."""
-    storage.save_projects([p.to_dict() for p in projects])
+def _ordered(keyed: Iterable[tuple[tuple, list]], top: int | None, offset: int, limit: int | None) -> Iterator[list]:
+    """
+    Rows of (sort key, row) pairs in key order, paginated. When only the
+    first top (or offset + limit) rows are shown they are picked with a heap;
+    otherwise everything goes through the memory-bounded external sort.
+    """
+    from utils import external_sort
 
-def _save_tasks_from_models(tasks: list[Task]) -> None:
-    """Serialize Task models to dicts and save to tasks.json."""
-    storage.save_tasks([t.to_dict() for t in tasks])    
+    bounds = [n for n in (top, offset + limit if limit is not None else None) if n is not None]
+    if bounds:
+        ordered = external_sort.top(keyed, min(bounds), key=lambda item: item[0])
+    else:
+        ordered = external_sort.sort(keyed, key=lambda item: item[0])
+    return _paginate((row for _, row in ordered), offset, limit)
 
-def _find_user_by_name(users: list[User], name: str) -> Optional[User]:
+def _find_user_by_name(name: str) -> Optional[User]:
     """Find user by name (case-insensitive)."""
-    name_norm = name.strip().lower()
-    for u in users:
-        if u.name.strip().lower() == name_norm:
-            return u
-    return None
+    data = storage.find_user(name)
+    return User.from_dict(data) if data else None
 
-def _find_project_by_title(projects: list[Project], title: str) -> Optional[Project]:
+def _find_project_by_title(title: str) -> Optional[Project]:
     """Find project by title (case-insensitive)."""
-    title_norm = title.strip().lower()
-    for p in projects:
-        if p.title.strip().lower() == title_norm:
-            return p
-    return None
+    data = storage.find_project(title)
+    return Project.from_dict(data) if data else None
 
 def _is_iso_date(value: str) -> bool:
-    """Simple check for date format YYYY-MM-DD."""
-    return bool(re.fullmatch(r"\d{4}-\d{2}-\d{2}", value))
+    """Check for a real calendar date in format YYYY-MM-DD."""
+    if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+def _iso_date(value: str) -> str:
+    """argparse type for reference dates: a real YYYY-MM-DD date."""
+    if not _is_iso_date(value):
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM-DD date: {value!r}")
+    return value
+
+def _non_negative_int(value: str) -> int:
+    """argparse type for row counts: an integer >= 0."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an integer: {value!r}") from None
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {n}")
+    return n
+
+def _positive_int(value: str) -> int:
+    """argparse type for --top: an integer >= 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an integer: {value!r}") from None
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or more, got {n}")
+    return n
+
+def _add_listing_args(p: argparse.ArgumentParser) -> None:
+    """Pagination and output format shared by the list commands."""
+    p.add_argument("--limit", type=_non_negative_int, required=False, help="Show at most N rows")
+    p.add_argument("--offset", type=_non_negative_int, default=0, help="Skip the first N rows")
+    p.add_argument("--format", dest="fmt", choices=["table", "jsonl", "csv"], default="table",
+                   help="Output format; jsonl/csv stream rows as they are read")
+
+def _add_sort_args(p: argparse.ArgumentParser, fields: list[str]) -> None:
+    """Ordering options of the list commands."""
+    p.add_argument("--sort-by", choices=fields, required=False,
+                   help="Order rows by this field (empty values last, ties by id)")
+    p.add_argument("--top", type=_positive_int, required=False, help="Only the first K rows in that order (default order: id)")
+
+def _id_ranges(spec: str) -> list[tuple[int, int]]:
+    """Parse an id list like '3,7,10-20' into inclusive (low, high) ranges."""
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low, dash, high = part.partition("-")
+        try:
+            lo = int(low)
+            hi = int(high) if dash else lo
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid id or range '{part}'") from None
+        if hi < lo:
+            raise argparse.ArgumentTypeError(f"empty range '{part}'")
+        ranges.append((lo, hi))
+    if not ranges:
+        raise argparse.ArgumentTypeError("no ids given")
+    return ranges
+
+def _add_task_selection_args(p: argparse.ArgumentParser) -> None:
+    """Which tasks a bulk command touches; all given filters must match."""
+    p.add_argument("--ids", type=_id_ranges, required=False, help="Task ids and ranges, e.g. 3,7,10-20")
+    p.add_argument("--project", required=False, help="Only tasks of this project (title)")
+    p.add_argument("--assigned-to", required=False, help="Only tasks assigned to this user (name)")
+    p.add_argument("--status", choices=Task.STATUSES, required=False, help="Only tasks currently in this status")
+    p.add_argument("--dry-run", action="store_true", help="Only report how many tasks would change")
 
 def build_parser() -> argparse.ArgumentParser:
     """Define CLI structure and available subcommands."""
@@ -78,6 +209,11 @@ def build_parser() -> argparse.ArgumentParser:
         prog="project-cli",
         description=" CLI tool to manage users and projects."
     )
+    parser.add_argument("--store", choices=sorted(storage.STORES), help="Storage backend (default: $PROJECT_CLI_STORE or json)")
+    parser.add_argument("--plain", action="store_true", help="Plain-text output without rich (also $PROJECT_CLI_PLAIN)")
+    parser.add_argument("--workers", type=int, required=False, help="Processes used to parse large data files (also $PROJECT_CLI_WORKERS)")
+    parser.add_argument("--timings", action="store_true", help="Print a per-phase time/bytes/records breakdown to stderr")
+    parser.add_argument("--profile", metavar="FILE", required=False, help="Write a cProfile of the whole command to FILE")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # add-user
@@ -98,6 +234,8 @@ def build_parser() -> argparse.ArgumentParser:
     # list-projects
     p_list_projects = subparsers.add_parser("list-projects", help="List projects (optionally by user)")
     p_list_projects.add_argument("--user", required=False, help="Filter by user name")
+    _add_listing_args(p_list_projects)
+    _add_sort_args(p_list_projects, ["id", "title", "owner", "due"])
 
     # tasks
     p_add_task = subparsers.add_parser("add-task", help="Add a task to a project")
@@ -107,18 +245,91 @@ def build_parser() -> argparse.ArgumentParser:
 
     p_list_tasks = subparsers.add_parser("list-tasks", help="List tasks (optionally by project)")
     p_list_tasks.add_argument("--project", required=False, help="Filter by project title")
+    p_list_tasks.add_argument("--assigned-to", required=False, help="Filter by assignee name")
+    _add_listing_args(p_list_tasks)
+    _add_sort_args(p_list_tasks, ["id", "title", "status", "project", "assignee", "due"])
 
     p_complete_task = subparsers.add_parser("complete-task", help="Mark a task as completed")
     p_complete_task.add_argument("--id", type=int, required=True, help="Task id")
 
+    p_search = subparsers.add_parser("search", help="Find tasks and projects by words in titles and descriptions")
+    p_search.add_argument("query", nargs="+", help="Words to look for; each matches as a prefix")
+    p_search.add_argument("--limit", type=int, default=20, help="Show at most N results (default: 20)")
+    p_search.add_argument("--format", dest="fmt", choices=["table", "jsonl", "csv"], default="table", help="Output format")
+
+    p_cache = subparsers.add_parser("cache", help="Show hit/miss statistics of the list output cache")
+    p_cache.add_argument("--clear", action="store_true", help="Remove all cached output and reset the statistics")
+
+    p_report = subparsers.add_parser("report", help="Task rollups per project or assignee, or overdue projects")
+    p_report.add_argument("--by", choices=["project", "assignee", "overdue"], default="project",
+                          help="project: counts by status per project; assignee: open workload per user; "
+                               "overdue: projects past their due date with open tasks")
+    p_report.add_argument("--today", type=_iso_date, required=False, help="Reference date for --by overdue (YYYY-MM-DD, default: today)")
+    _add_listing_args(p_report)
+
+    p_due = subparsers.add_parser("due", help="Overdue and upcoming project due dates per owner (needs NumPy)")
+    p_due.add_argument("--within", type=int, default=7, help="Days ahead that count as due soon (default: 7)")
+    p_due.add_argument("--today", type=_iso_date, required=False, help="Reference date (YYYY-MM-DD, default: today)")
+    p_due.add_argument("--list", dest="which", choices=["overdue", "soon"], required=False,
+                       help="List the overdue / soon due projects instead of counts per owner")
+    _add_listing_args(p_due)
+
+    p_update_tasks = subparsers.add_parser("update-tasks", help="Set the status of many tasks in one write")
+    _add_task_selection_args(p_update_tasks)
+    p_update_tasks.add_argument("--set-status", required=True, choices=Task.STATUSES, help="New status")
+
+    p_complete_tasks = subparsers.add_parser("complete-tasks", help="Mark many tasks as done in one write")
+    _add_task_selection_args(p_complete_tasks)
+
+    p_import = subparsers.add_parser("import", help="Bulk import users, projects and tasks from JSONL or CSV")
+    p_import.add_argument("--file", default="-", help="Input file (default: stdin)")
+    p_import.add_argument("--format", dest="fmt", choices=["jsonl", "csv"], required=False,
+                          help="Input format (default: from the file extension, else jsonl)")
+
+    p_batch = subparsers.add_parser("batch", help="Run subcommands listed one per line, writing the data once")
+    p_batch.add_argument("--file", default="-", help="Script file (default: stdin)")
+    p_batch.add_argument("--flush-every", type=int, default=0,
+                         help="Also write the data after every N commands (default: only at the end)")
+
+    p_serve = subparsers.add_parser("serve", help="Keep data in memory and serve commands over a Unix socket")
+    p_serve.add_argument("--socket", required=False, help="Socket path (default: $PROJECT_CLI_SOCKET or data/.project-cli.sock)")
+
+    p_export = subparsers.add_parser("export", aliases=["sync"], help="Send new records to an HTTP endpoint in batches")
+    p_export.add_argument("--to", dest="url", required=True, help="Endpoint URL (http:// or https://)")
+    p_export.add_argument("--batch-size", type=int, default=500, help="Records per request (default: 500)")
+    p_export.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once (default: 4)")
+    p_export.add_argument("--gzip", action="store_true", help="Gzip-compress request bodies")
+    p_export.add_argument("--full", action="store_true", help="Send everything, not only records added since the last export")
+
+    p_watch = subparsers.add_parser("watch", help="Print add/complete events as JSON lines while they happen")
+    p_watch.add_argument("--since", type=int, required=False,
+                         help="Start after this sequence number (default: only events from now on)")
+    p_watch.add_argument("--once", action="store_true", help="Print the events already logged and exit")
+    p_watch.add_argument("--interval", type=float, default=0.5, help="Seconds between checks for new events (default: 0.5)")
+
+    # maintenance
+    subparsers.add_parser("compact", help="Fold journaled changes back into the JSON snapshots")
+
+    p_migrate = subparsers.add_parser("migrate", help="Copy all data from one store to another")
+    p_migrate.add_argument("--from", dest="source", default="json", choices=sorted(storage.STORES), help="Store to read (default: json)")
+    p_migrate.add_argument("--to", dest="target", required=True, choices=sorted(storage.STORES), help="Store to write")
+
+    p_fsck = subparsers.add_parser("fsck", help="Check for malformed rows, duplicate ids and dangling references")
+    p_fsck.add_argument("--repair", action="store_true",
+                        help="Fix what can be fixed and drop the rest, after backing up the data to data/backups/")
+    _add_listing_args(p_fsck)
+
+    p_reshard = subparsers.add_parser("reshard", help="Re-partition the tasks of the sharded store")
+    p_reshard.add_argument("--scheme", choices=["project", "hash"], default="project",
+                           help="One shard per project, or projects hashed into buckets (default: project)")
+    p_reshard.add_argument("--buckets", type=int, default=64, help="Number of buckets for --scheme hash (default: 64)")
+
     return parser
 
 def cmd_add_user(name: str, email: str | None) -> None:
     """Add new user to JSON."""
-    users = storage.load_users()
-    new_id = (max([u.get("id", 0) for u in users]) + 1) if users else 1
-    users.append({"id": new_id, "name": name, "email": email})
-    storage.save_users(users)
+    new_id = storage.max_id("users") + 1
+    storage.insert_users([{"id": new_id, "name": name, "email": email}])
     info(f"User created: id={new_id}, name='{name}'")
 
 def cmd_list_users() -> None:
@@ -132,8 +343,7 @@ def cmd_list_users() -> None:
 
 def cmd_add_project(user_name: str, title: str, description: str | None, due_date: str | None) -> None:
     """Add a new project assigned to a specific user."""
-    users = _load_users_as_models()
-    user = _find_user_by_name(users, user_name)
+    user = _find_user_by_name(user_name)
     if not user:
         error(f"User '{user_name}' not found. Create the user first with 'add-user'.")
         return
@@ -141,127 +351,637 @@ def cmd_add_project(user_name: str, title: str, description: str | None, due_dat
     if due_date and not _is_iso_date(due_date):
         warn("Due date is not in YYYY-MM-DD format. It will be stored as-is.")
 
-    projects = _load_projects_as_models()
+    from utils import search
+
+    Project.sync_counter(storage.max_id("projects"))
     project = Project(title=title, user_id=user.id, description=description, due_date=due_date)
-    projects.append(project)
-    _save_projects_from_models(projects)
+    index = search.current()
+    storage.insert_projects([project.to_dict()])
+    search.apply(index, projects=[project.to_dict()])
 
     info(f"Project created: id={project.id}, title='{project.title}', owner='{user.name}'")
 
-def cmd_list_projects(user_name: str | None) -> None:
-    """List all projects or filter by user."""
-    users = _load_users_as_models()
-    user_by_id = {u.id: u for u in users}
-
-    owner_filter_id: Optional[int] = None
+def cmd_list_projects(user_name: str | None, limit: int | None = None, offset: int = 0, fmt: str = "table",
+                      sort_by: str | None = None, top: int | None = None) -> None:
+    """List all projects or filter by user, optionally ordered by a field."""
+    columns = ["ID", "Title", "Owner", "Due", "Description"]
     if user_name:
-        user = _find_user_by_name(users, user_name)
+        user = _find_user_by_name(user_name)
         if not user:
             warn(f"No such user '{user_name}'.")
-            table("Projects", ["ID", "Title", "Owner", "Due", "Description"], [])
+            if fmt == "table":
+                table("Projects", columns, [])
             return
-        owner_filter_id = user.id
-
-    projects = _load_projects_as_models()
-    if owner_filter_id is not None:
-        projects = [p for p in projects if p.user_id == owner_filter_id]
-
-    if not projects:
-        warn("No projects yet.")
-        return
+        owner_names = {user.id: user.name}
+        projects = _iter_models(storage.iter_projects(user_id=user.id), Project)
+    else:
+        owner_names = {u.id: u.name for u in _load_users_as_models()}
+        projects = _all_models("projects", Project)
 
-    rows = []
-    for p in projects:
-        owner = user_by_id.get(p.user_id)
-        owner_name = owner.name if owner else f"#{p.user_id}"
-        rows.append([p.id, p.title, owner_name, p.due_date or "—", (p.description or "—")[:60]])
+    def row(p: Project) -> list:
+        owner_name = owner_names.get(p.user_id, f"#{p.user_id}")
+        description = (p.description or "—")[:60] if fmt == "table" else p.description
+        return [p.id, p.title, owner_name, p.due_date, description]
 
-    table("Projects", ["ID", "Title", "Owner", "Due", "Description"], rows)
+    if sort_by or top is not None:
+        value = {
+            "id": lambda p: p.id,
+            "title": lambda p: p.title,
+            "owner": lambda p: owner_names.get(p.user_id),
+            "due": lambda p: p.due_date,
+        }[sort_by or "id"]
+        rows = _ordered((((_sort_key(value(p)), p.id), row(p)) for p in projects), top, offset, limit)
+    else:
+        rows = _paginate(map(row, projects), offset, limit)
+    _render("Projects", columns, rows, fmt, "No projects yet.")
 
 def cmd_add_task(project_title: str, title: str, assigned_to_name: str | None) -> None:
     """Create a task inside a project and optionally assign to a user."""
-    projects = _load_projects_as_models()
-    project = _find_project_by_title(projects, project_title)
+    project = _find_project_by_title(project_title)
     if not project:
         error(f"Project '{project_title}' not found.")
         return
 
     assigned_to = None
     if assigned_to_name:
-        users = _load_users_as_models()
-        user = _find_user_by_name(users, assigned_to_name)
+        user = _find_user_by_name(assigned_to_name)
         if not user:
             warn(f"User '{assigned_to_name}' not found. Task will be unassigned.")
         else:
             assigned_to = user.id
 
-    tasks = _load_tasks_as_models()
+    from utils import search, summary
+
+    Task.sync_counter(storage.max_id("tasks"))
     task = Task(project_id=project.id, title=title, assigned_to=assigned_to)
-    tasks.append(task)
-    _save_tasks_from_models(tasks)
+    rollup, index = summary.current(), search.current()
+    storage.insert_tasks([task.to_dict()])
+    summary.apply(rollup, added=[task.to_dict()])
+    search.apply(index, tasks=[task.to_dict()])
 
     info(f"Task added: '{task.title}' for project '{project.title}'")
 
 
-def cmd_list_tasks(project_title: str | None) -> None:
-    """List tasks, optionally filter by project title."""
-    tasks = _load_tasks_as_models()
-    if not tasks:
-        warn("No tasks yet.")
-        return
-
-    projects = _load_projects_as_models()
-    users = _load_users_as_models()
-    project_by_id = {p.id: p for p in projects}
-    user_by_id = {u.id: u for u in users}
-
+def cmd_list_tasks(project_title: str | None, assigned_to_name: str | None = None,
+                   limit: int | None = None, offset: int = 0, fmt: str = "table",
+                   sort_by: str | None = None, top: int | None = None) -> None:
+    """List tasks, optionally filter by project title and/or assignee and order by a field."""
+    project_id: Optional[int] = None
     if project_title:
-        project = _find_project_by_title(projects, project_title)
+        project = _find_project_by_title(project_title)
         if not project:
             warn(f"No such project '{project_title}'.")
             return
-        tasks = [t for t in tasks if t.project_id == project.id]
+        project_id = project.id
 
-    if not tasks:
-        warn("No tasks yet.")
-        return
+    assigned_to: Optional[int] = None
+    if assigned_to_name:
+        user = _find_user_by_name(assigned_to_name)
+        if not user:
+            warn(f"No such user '{assigned_to_name}'.")
+            return
+        assigned_to = user.id
 
-    rows = []
-    for t in tasks:
-        proj = project_by_id.get(t.project_id)
-        assignee = user_by_id.get(t.assigned_to) if t.assigned_to else None
-        rows.append([
+    # Only the small id -> title/name maps are held in memory; tasks stream through
+    projects = _load_projects_as_models()
+    project_titles = {p.id: p.title for p in projects}
+    project_dues = {p.id: p.due_date for p in projects} if sort_by == "due" else {}
+    user_names = {u.id: u.name for u in _load_users_as_models()}
+    missing_project = "?" if fmt == "table" else None
+
+    if project_id is None and assigned_to is None:
+        tasks = _all_models("tasks", Task)
+    else:
+        tasks = _iter_models(storage.iter_tasks(project_id=project_id, assigned_to=assigned_to), Task)
+
+    def row(t: Task) -> list:
+        return [
             t.id,
             t.title,
-            proj.title if proj else "?",
-            assignee.name if assignee else "—",
+            project_titles.get(t.project_id, missing_project),
+            user_names.get(t.assigned_to) if t.assigned_to else None,
             t.status
-        ])
-    table("Tasks", ["ID", "Title", "Project", "Assigned To", "Status"], rows)
+        ]
+
+    if sort_by or top is not None:
+        # Names and titles come from the same id maps as the rows, so the order matches what is shown
+        value = {
+            "id": lambda t: t.id,
+            "title": lambda t: t.title,
+            "status": lambda t: Task.STATUSES.index(t.status),
+            "project": lambda t: project_titles.get(t.project_id),
+            "assignee": lambda t: user_names.get(t.assigned_to),
+            "due": lambda t: project_dues.get(t.project_id),
+        }[sort_by or "id"]
+        rows = _ordered((((_sort_key(value(t)), t.id), row(t)) for t in tasks), top, offset, limit)
+    else:
+        rows = _paginate(map(row, tasks), offset, limit)
+    _render("Tasks", ["ID", "Title", "Project", "Assigned To", "Status"], rows, fmt, "No tasks yet.")
 
 
 def cmd_complete_task(task_id: int) -> None:
     """Mark task as done by id."""
-    tasks = _load_tasks_as_models()
-    found = False
-    for t in tasks:
-        if t.id == task_id:
-            t.mark_done()
-            found = True
-            break
-
-    if not found:
+    matches = storage.select("tasks", id=task_id)
+    if not matches:
         error(f"No task with id={task_id}")
         return
 
-    _save_tasks_from_models(tasks)
+    from utils import search, summary
+
+    task = Task.from_dict(matches[0])
+    if matches[0].get("status") == "done":
+        # Nothing to write, and no second task_completed event
+        info(f"Task #{task_id} is already done.")
+        return
+    task.mark_done()
+    rollup, index = summary.current(), search.current()
+    storage.update_tasks([task.to_dict()])
+    summary.apply(rollup, changed=[(matches[0], task.to_dict())])
+    # Titles are unchanged, so the search index stays valid
+    search.apply(index)
     info(f"Task #{task_id} marked as done!")
 
-def main(argv: List[str] | None = None) -> int:
-    """CLI entry point."""
+def cmd_update_tasks(ids: list[tuple[int, int]] | None, project_title: str | None, assigned_to_name: str | None,
+                     status: str | None, new_status: str, dry_run: bool = False) -> None:
+    """Set the status of every selected task with a single storage update."""
+    from utils import search, summary
+
+    if not (ids or project_title or assigned_to_name or status):
+        error("Select tasks with --ids, --project, --assigned-to and/or --status.")
+        return
+
+    project_id: Optional[int] = None
+    if project_title:
+        project = _find_project_by_title(project_title)
+        if not project:
+            error(f"Project '{project_title}' not found.")
+            return
+        project_id = project.id
+
+    assigned_to: Optional[int] = None
+    if assigned_to_name:
+        user = _find_user_by_name(assigned_to_name)
+        if not user:
+            error(f"User '{assigned_to_name}' not found.")
+            return
+        assigned_to = user.id
+
+    # Project/assignee filters are indexed; ids and status are checked while streaming
+    selected, changes = 0, []
+    for r in storage.iter_tasks(project_id=project_id, assigned_to=assigned_to):
+        rid = r.get("id")
+        if not isinstance(rid, int):
+            continue
+        if ids and not any(lo <= rid <= hi for lo, hi in ids):
+            continue
+        current = Task.normalize_status(r.get("status"))
+        if status and current != status:
+            continue
+        selected += 1
+        if r.get("status") != new_status:
+            changes.append(r)
+
+    if dry_run:
+        info(f"Would set {len(changes)} of {selected} matching task(s) to '{new_status}'.")
+        return
+    if not changes:
+        info(f"Nothing to change: {selected} matching task(s) already '{new_status}'.")
+        return
+
+    updated = [dict(r, status=new_status) for r in changes]
+    rollup, index = summary.current(), search.current()
+    storage.update_tasks(updated)
+    summary.apply(rollup, changed=list(zip(changes, updated)))
+    search.apply(index)
+    info(f"Set {len(updated)} task(s) to '{new_status}'.")
+
+def _ratio(done: int, total: int, fmt: str) -> str | float | None:
+    """Completion ratio: '67%' in tables, 0.667 in jsonl/csv, None without tasks."""
+    if not total:
+        return None
+    return f"{done / total:.0%}" if fmt == "table" else round(done / total, 3)
+
+def cmd_report(by: str, today: str | None, limit: int | None = None, offset: int = 0, fmt: str = "table") -> None:
+    """Rollups from the task summary (see utils/summary.py); tasks themselves are not read."""
+    from utils import summary
+
+    today = today or date.today().isoformat()
+    rollup = summary.get()
+    empty = [0] * len(Task.STATUSES)
+    user_names = {u.id: u.name for u in _load_users_as_models()}
+
+    if by == "assignee":
+        columns = ["ID", "User", "Todo", "In Progress", "Done", "Open", "Completion"]
+        workloads = []
+        for key, (todo, in_progress, done) in rollup["by_assignee"].items():
+            user_id = int(key) or None
+            name = user_names.get(user_id, f"#{user_id}") if user_id else "(unassigned)"
+            workloads.append([user_id, name, todo, in_progress, done, todo + in_progress,
+                              _ratio(done, todo + in_progress + done, fmt)])
+        # Heaviest open workload first
+        workloads.sort(key=lambda r: (-r[5], r[0] or 0))
+        _render("Workload by assignee", columns, _paginate(iter(workloads), offset, limit), fmt, "No tasks yet.")
+        return
+
+    projects = _all_models("projects", Project)
+    if by == "overdue":
+        columns = ["ID", "Project", "Owner", "Due", "Open", "Days Late"]
+        late, unreadable = [], 0
+        for p in projects:
+            todo, in_progress, _ = rollup["by_project"].get(str(p.id), empty)
+            if p.due_date and not _is_iso_date(p.due_date):
+                unreadable += 1
+                continue
+            if p.due_date and p.due_date < today and todo + in_progress:
+                days = (date.fromisoformat(today) - date.fromisoformat(p.due_date)).days
+                late.append([p.id, p.title, user_names.get(p.user_id, f"#{p.user_id}"), p.due_date,
+                             todo + in_progress, days])
+        late.sort(key=lambda r: (r[3], r[0]))
+        if unreadable:
+            warn(f"Skipped {unreadable} project(s) with an unreadable due_date; see 'fsck'.")
+        _render(f"Overdue projects (as of {today})", columns, _paginate(iter(late), offset, limit), fmt,
+                "No overdue projects.")
+        return
+
+    def rows():
+        for p in projects:
+            todo, in_progress, done = rollup["by_project"].get(str(p.id), empty)
+            total = todo + in_progress + done
+            yield [p.id, p.title, user_names.get(p.user_id, f"#{p.user_id}"), todo, in_progress, done, total,
+                   _ratio(done, total, fmt), p.due_date]
+
+    columns = ["ID", "Project", "Owner", "Todo", "In Progress", "Done", "Total", "Completion", "Due"]
+    _render("Tasks by project", columns, _paginate(rows(), offset, limit), fmt, "No projects yet.")
+
+def cmd_due(within: int, today: str | None, which: str | None, limit: int | None = None, offset: int = 0,
+            fmt: str = "table") -> None:
+    """Due-date counts per owner, or the overdue/soon due projects, from vectorized columns."""
+    from utils import due
+
+    if not due.available():
+        error("The due command needs NumPy: pip install numpy")
+        return
+    if within < 0:
+        error("--within must not be negative.")
+        return
+    today = today or date.today().isoformat()
+    cols = due.columns()
+    now = due.day_number(today)
+    user_names = {u.id: u.name for u in _load_users_as_models()}
+
+    bad = due.invalid(cols)
+    if bad:
+        warn(f"{len(bad)} projects have an unreadable due_date:")
+        for project_id, value in bad[:20]:
+            warn(f"  project #{project_id}: {value!r}")
+        if len(bad) > 20:
+            warn(f"  ... and {len(bad) - 20} more")
+
+    if which is not None:
+        bucket = due.OVERDUE if which == "overdue" else due.DUE_SOON
+        positions = due.matching(cols, now, within, bucket)
+        page = positions[offset:offset + limit if limit is not None else None]
+        wanted = set(cols["id"][page].tolist())
+        projects = {p["id"]: p for p in storage.stream("projects") if p.get("id") in wanted} if wanted else {}
+
+        def rows():
+            for project_id, day in zip(cols["id"][page].tolist(), cols["day"][page].tolist()):
+                p = projects.get(project_id, {})
+                yield [project_id, p.get("title"), user_names.get(p.get("user_id"), f"#{p.get('user_id')}"),
+                       due.iso(day), now - day if which == "overdue" else day - now]
+
+        last = "Days Late" if which == "overdue" else "Days Left"
+        title = (f"Overdue projects (as of {today})" if which == "overdue"
+                 else f"Projects due within {within} days (as of {today})")
+        _render(title, ["ID", "Project", "Owner", "Due", last], rows(), fmt, "No matching projects.")
+        return
+
+    owners, counts = due.by_owner(cols, now, within)
+    # Most overdue first
+    order = sorted(range(len(owners)), key=lambda i: (-counts[i][due.OVERDUE], int(owners[i])))
+    rows = ([int(owners[i]) or None, user_names.get(int(owners[i]), f"#{owners[i]}") if owners[i] else "(no owner)",
+             *counts[i].tolist()] for i in order)
+    columns = ["ID", "Owner", "Overdue", f"Due ≤{within}d", "Later", "No Date", "Invalid"]
+    _render(f"Project due dates by owner (as of {today})", columns, _paginate(rows, offset, limit), fmt,
+            "No projects yet.")
+
+def cmd_import(path: str, fmt: str | None) -> None:
+    """Import a mixed stream of user/project/task records in one write per entity."""
+    from utils import importer
+
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+    try:
+        stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", newline="")
+    except OSError as exc:
+        error(f"Cannot open '{path}': {exc.strerror}")
+        return
+
+    with stream:
+        records = list(importer.read_records(stream, fmt))
+    with storage.transaction():
+        result = importer.import_records(records)
+        importer.commit(result)
+
+    info(f"Imported {len(result.users)} users, {len(result.projects)} projects, {len(result.tasks)} tasks.")
+    if result.rejected:
+        warn(f"Rejected {len(result.rejected)} row(s):")
+        for line_no, reason in result.rejected[:20]:
+            warn(f"  line {line_no}: {reason}")
+        if len(result.rejected) > 20:
+            warn(f"  ... and {len(result.rejected) - 20} more")
+
+def cmd_compact() -> None:
+    """Compact every entity of the current store."""
+    for entity in storage.ENTITIES:
+        storage.compact(entity)
+    info(f"Compacted {', '.join(storage.ENTITIES)} ({storage.STORE} store).")
+
+def cmd_migrate(source: str, target: str) -> None:
+    """Copy users, projects and tasks from one store to another."""
+    if source == target:
+        error("Source and target store are the same.")
+        return
+    try:
+        counts = storage.migrate(source, target)
+    except ValueError as exc:
+        # Rows the target can't hold (e.g. SQLite and duplicate ids): nothing of that entity was replaced
+        error(str(exc))
+        return
+    summary = ", ".join(f"{n} {entity}" for entity, n in counts.items())
+    info(f"Migrated {summary} from {source} to {target}.")
+
+def cmd_export(url: str, batch_size: int, concurrency: int, compress: bool, full: bool) -> None:
+    """Push records added since the last export to url."""
+    from utils import sync
+
+    if batch_size < 1 or concurrency < 1:
+        error("--batch-size and --concurrency must be at least 1.")
+        return
+    try:
+        counts = sync.export(url, batch_size, concurrency, compress, full)
+    except (OSError, EOFError, ValueError, sync.SyncError) as exc:
+        error(f"Export to {url} failed: {exc or type(exc).__name__}")
+        return
+    if not counts["batches"]:
+        info(f"Nothing new to export to {url}.")
+        return
+    summary = ", ".join(f"{counts[entity]} {entity}" for entity in storage.ENTITIES)
+    info(f"Exported {summary} to {url} in {counts['batches']} requests ({counts['bytes']} bytes).")
+
+def cmd_watch(since: int | None, once: bool, interval: float) -> None:
+    """Stream change events as JSONL until interrupted (or once, with --once)."""
+    from utils import changes
+
+    if once and since is None:
+        since = 0
+    if since is not None:
+        events, _ = changes.read(since)
+        first = events[0]["seq"] if events else changes.last_seq() + 1
+        if first > since + 1:
+            warn(f"Events {since + 1}..{first - 1} are no longer in the change log.")
+        if once:
+            for event in events:
+                sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+            return
+    try:
+        for event in changes.follow(since, interval):
+            sys.stdout.write(json.dumps(event, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+
+def cmd_fsck(repair: bool, limit: int | None = None, offset: int = 0, fmt: str = "table") -> bool:
+    """Report integrity problems (and repair them); returns True when the data is clean afterwards."""
+    from utils import fsck
+
+    result = fsck.check(repair)
+    checked = ", ".join(f"{n} {entity}" for entity, n in result.checked.items())
+    if not result.problems:
+        info(f"No problems found in {checked}.")
+        return True
+
+    if fmt == "table":
+        kinds = Counter((entity, kind) for entity, _, kind, _ in result.problems)
+        table("Problems by kind", ["Entity", "Kind", "Count"],
+              [[entity, kind, n] for (entity, kind), n in sorted(kinds.items())])
+        # A badly broken file can have millions of problems; --format jsonl streams them all
+        limit = 50 if limit is None else limit
+    rows = ([entity, rid, kind, text] for entity, rid, kind, text in result.problems)
+    _render("Problems", ["Entity", "ID", "Kind", "Problem"], _paginate(rows, offset, limit), fmt, "")
+    if repair and result.unreadable:
+        for path, at in result.unreadable:
+            error(f"Not repairing: {path} can't be read past byte {at}. Fix it by hand or restore it "
+                  f"from a backup, then run 'fsck --repair' again.")
+        return False
+    if repair:
+        info(f"Repaired {result.fixed} rows and dropped {result.dropped}; "
+             f"the previous data is in {result.backup}.")
+        return True
+    if result.unreadable:
+        warn(f"{len(result.problems)} problems in {checked}; --repair won't run until the unreadable "
+             f"file(s) are fixed or restored.")
+        return False
+    warn(f"{len(result.problems)} problems in {checked}: --repair would fix {result.fixed} rows "
+         f"and drop {result.dropped}, plus any rows that only belong to dropped ones.")
+    return False
+
+def cmd_reshard(scheme: str, buckets: int) -> None:
+    """Rewrite sharded tasks under a new partitioning scheme."""
+    from utils import sharded_store
+
+    if storage.STORE != "sharded":
+        error("reshard only applies to the sharded store (use --store sharded).")
+        return
+    if buckets < 1:
+        error("--buckets must be at least 1.")
+        return
+    shards = sharded_store.rebalance(scheme, buckets)
+    storage._drop_results("tasks")
+    info(f"Tasks re-partitioned by {scheme} into {shards} shards.")
+
+def cmd_search(query: str, limit: int = 20, fmt: str = "table") -> None:
+    """Ranked matches from the search index; only the hits themselves are read from storage."""
+    from utils import search
+
+    hits = search.search(query, limit)
+    tasks = storage.fetch("tasks", [rid for _, kind, rid in hits if kind == "task"])
+    # Hit projects and the projects of hit tasks, in one read
+    projects = storage.fetch("projects", [rid for _, kind, rid in hits if kind == "project"]
+                             + [t.get("project_id") for t in tasks.values()])
+
+    def rows():
+        for score, kind, rid in hits:
+            record = (tasks if kind == "task" else projects).get(rid)
+            if record is None:
+                continue
+            if kind == "task":
+                project = projects.get(record.get("project_id"), {}).get("title")
+            else:
+                project = record.get("title")
+            yield [kind, rid, record.get("title"), project, round(score, 2)]
+
+    _render(f"Search: {query}", ["Kind", "ID", "Title", "Project", "Score"], rows(), fmt, "No matches.")
+
+def cmd_cache(clear: bool) -> None:
+    """Print result cache statistics, or empty the cache."""
+    from utils import result_cache
+
+    if clear:
+        result_cache.clear()
+        info("Result cache cleared.")
+        return
+    st = result_cache.stats()
+    lookups = st["hits"] + st["misses"]
+    ratio = f"{st['hits'] / lookups:.0%}" if lookups else "—"
+    table("Result cache", ["Entries", "Bytes", "Limit", "Hits", "Misses", "Hit Ratio"],
+          [[st["entries"], st["bytes"], result_cache.MAX_BYTES, st["hits"], st["misses"], ratio]])
+
+def _dispatch_cached(args: argparse.Namespace) -> int:
+    """Replay a list command's output from the result cache, or run it and store the output."""
+    from utils import result_cache
+
+    if result_cache.MAX_BYTES <= 0:
+        return _dispatch(args)
+    entities = CACHED_COMMANDS[args.command]
+    # Hold the read lock so the output stored matches the files the key was computed from
+    with storage._reading():
+        key = result_cache.key(args.command, vars(args), entities)
+        output = result_cache.get(key)
+        if output is not None:
+            sys.stdout.write(output)
+            return 0
+        with result_cache.recording() as recorded:
+            code = _dispatch(args)
+        output = recorded.output()
+        if code == 0 and output is not None:
+            result_cache.put(key, entities, output)
+    return code
+
+def cmd_serve(socket: str | None) -> None:
+    """Run the in-memory server until Ctrl+C."""
+    from pathlib import Path
+    from utils import daemon
+
+    path = Path(socket) if socket else daemon.socket_path()
+    info(f"Serving on {path} (Ctrl+C to stop).")
+    daemon.serve(path, main)
+
+def cmd_batch(path: str, flush_every: int) -> bool:
+    """
+    Run one subcommand per line (shell quoting, # comments) in this process.
+    Records stay in memory and inserts/updates are written once at the end
+    (or every flush_every commands). A failing line is reported with its
+    number and the rest still run; returns whether every line succeeded.
+    """
+    import io
+    import shlex
+    from contextlib import redirect_stderr
+
+    try:
+        stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    except OSError as exc:
+        error(f"Cannot open '{path}': {exc.strerror}")
+        return False
+
+    parser = build_parser()
+    ran = failed = 0
+    with stream, storage.deferred_writes(), timing.phase("batch.run") as counts:
+        for line_no, line in enumerate(stream, 1):
+            printing.CONTEXT = f"line {line_no}: "
+            errors = printing.errors
+            try:
+                argv = shlex.split(line, comments=True)
+                if not argv:
+                    continue
+                messages = io.StringIO()
+                try:
+                    with redirect_stderr(messages):
+                        args = parser.parse_args(argv)
+                except SystemExit as exc:
+                    if exc.code:
+                        # argparse's "usage: ..." then "prog: error: message"
+                        error(messages.getvalue().strip().splitlines()[-1].partition("error: ")[2])
+                    continue
+                if args.command in BATCH_EXCLUDED:
+                    error(f"'{args.command}' can't run inside a batch.")
+                elif args.store or args.plain or args.workers or args.timings or args.profile:
+                    error("Global options go before 'batch', not on its lines.")
+                elif getattr(args, "file", None) == "-":
+                    # stdin is the batch's own input (or already used up by it)
+                    error(f"'{args.command}' needs --file PATH inside a batch, not stdin.")
+                else:
+                    ran += 1
+                    if args.command in BATCH_FLUSH_FIRST:
+                        storage.flush()
+                    if _dispatch(args) != 0 and printing.errors == errors:
+                        error(f"'{args.command}' failed.")
+                    if flush_every > 0 and ran % flush_every == 0:
+                        storage.flush()
+            except Exception as exc:
+                error(str(exc) or type(exc).__name__)
+            finally:
+                printing.CONTEXT = ""
+                failed += printing.errors > errors
+        counts["records"] = ran
+
+    if failed:
+        warn(f"Ran {ran} command(s); {failed} line(s) failed.")
+    else:
+        info(f"Ran {ran} command(s).")
+    return not failed
+
+def main(argv: List[str] | None = None, forward: bool = False) -> int:
+    """
+    CLI entry point. With forward=True the command is handed to a running
+    'serve' process when there is one.
+    """
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    # A profile of the forwarding client would be useless, so --profile runs locally
+    if forward and not args.profile:
+        from utils import daemon
+        if args.command not in daemon.LOCAL_COMMANDS:
+            response = daemon.forward(sys.argv[1:] if argv is None else argv)
+            if response is not None:
+                sys.stdout.write(response["stdout"])
+                sys.stderr.write(response["stderr"])
+                return response["code"]
+
+    if args.store:
+        storage.STORE = args.store
+    if args.plain:
+        printing.PLAIN = True
+    if args.workers:
+        storage.WORKERS = args.workers
+
+    # serve times each request it runs instead of its own lifetime
+    if (args.timings or timing.TRACE_FILE) and args.command != "serve":
+        timing.enable()
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        if args.command in WRITE_COMMANDS:
+            with storage.transaction():
+                return _dispatch(args)
+        if args.command in CACHED_COMMANDS:
+            return _dispatch_cached(args)
+        return _dispatch(args)
+    except (TimeoutError, storage.UnreadableFileError) as exc:
+        error(str(exc))
+        return 1
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        timing.finish(sys.argv[1:] if argv is None else argv, args.command, args.timings)
+
+def _dispatch(args: argparse.Namespace) -> int:
+    """Run the selected subcommand."""
     if args.command == "add-user":
         cmd_add_user(args.name, args.email)
         return 0
@@ -275,7 +995,7 @@ def main(argv: List[str] | None = None) -> int:
         return 0
 
     if args.command == "list-projects":
-        cmd_list_projects(args.user)
+        cmd_list_projects(args.user, args.limit, args.offset, args.fmt, args.sort_by, args.top)
         return 0
 
     if args.command == "add-task":
@@ -283,15 +1003,70 @@ def main(argv: List[str] | None = None) -> int:
         return 0
 
     if args.command == "list-tasks":
-        cmd_list_tasks(args.project)
+        cmd_list_tasks(args.project, args.assigned_to, args.limit, args.offset, args.fmt, args.sort_by, args.top)
         return 0
 
     if args.command == "complete-task":
         cmd_complete_task(args.id)
         return 0
 
+    if args.command in ("update-tasks", "complete-tasks"):
+        new_status = args.set_status if args.command == "update-tasks" else "done"
+        cmd_update_tasks(args.ids, args.project, args.assigned_to, args.status, new_status, args.dry_run)
+        return 0
+
+    if args.command == "search":
+        cmd_search(" ".join(args.query), args.limit, args.fmt)
+        return 0
+
+    if args.command == "cache":
+        cmd_cache(args.clear)
+        return 0
+
+    if args.command == "report":
+        cmd_report(args.by, args.today, args.limit, args.offset, args.fmt)
+        return 0
+
+    if args.command == "import":
+        cmd_import(args.file, args.fmt)
+        return 0
+
+    if args.command == "serve":
+        cmd_serve(args.socket)
+        return 0
+
+    if args.command == "batch":
+        return 0 if cmd_batch(args.file, args.flush_every) else 1
+
+    if args.command == "compact":
+        cmd_compact()
+        return 0
+
+    if args.command == "migrate":
+        cmd_migrate(args.source, args.target)
+        return 0
+
+    if args.command in ("export", "sync"):
+        cmd_export(args.url, args.batch_size, args.concurrency, args.gzip, args.full)
+        return 0
+
+    if args.command == "due":
+        cmd_due(args.within, args.today, args.which, args.limit, args.offset, args.fmt)
+        return 0
+
+    if args.command == "watch":
+        cmd_watch(args.since, args.once, args.interval)
+        return 0
+
+    if args.command == "fsck":
+        return 0 if cmd_fsck(args.repair, args.limit, args.offset, args.fmt) else 1
+
+    if args.command == "reshard":
+        cmd_reshard(args.scheme, args.buckets)
+        return 0
+
     error("Unknown command.")
     return 1
 
 if __name__ == "__main__":
-    raise SystemExit(main())
\ No newline at end of file
+    raise SystemExit(main(forward=True))
\ No newline at end of file
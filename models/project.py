@@ -11,11 +11,15 @@ class Project:
     - user_id: owner user id (one-to-many: User -> Projects)
     """
 
+    __slots__ = ("_id", "title", "description", "due_date", "user_id")
     _id_counter: ClassVar[int] = 1
 
-    def __init__(self, title: str, user_id: int, description: str | None = None, due_date: str | None = None) -> None:
-        self._id = Project._id_counter
-        Project._id_counter += 1
+    def __init__(self, title: str, user_id: int, description: str | None = None, due_date: str | None = None,
+                 *, id: int | None = None) -> None:
+        if id is None:
+            id = Project._id_counter
+            Project._id_counter += 1
+        self._id = id
 
         self.title = title
         self.description = description
@@ -36,19 +40,26 @@ class Project:
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Project":
-        obj = cls(
+    def sync_counter(cls, max_id: int) -> None:
+        """Make sure the next auto id is greater than max_id."""
+        if max_id >= cls._id_counter:
+            cls._id_counter = max_id + 1
+
+    @classmethod
+    def from_dict(cls, data: dict, sync_counter: bool = True) -> "Project":
+        user_id = int(data.get("user_id")) if data.get("user_id") is not None else 0
+        stored_id = data.get("id")
+        if not isinstance(stored_id, int):
+            stored_id = None
+        elif sync_counter:
+            cls.sync_counter(stored_id)
+        return cls(
             title=data.get("title", ""),
-            user_id=int(data.get("user_id")) if data.get("user_id") is not None else 0,
+            user_id=user_id,
             description=data.get("description"),
             due_date=data.get("due_date"),
+            id=stored_id,
         )
-        stored_id = data.get("id")
-        if isinstance(stored_id, int):
-            obj._id = stored_id
-            if stored_id >= cls._id_counter:
-                cls._id_counter = stored_id + 1
-        return obj
 
     def __repr__(self) -> str:
         return f"Project(id={self.id}, title={self.title!r}, user_id={self.user_id})"
\ No newline at end of file
@@ -11,18 +11,26 @@ class Task:
     - assigned_to:  user id (assignee)
     """
 
+    __slots__ = ("_id", "project_id", "title", "status", "assigned_to")
     _id_counter: ClassVar[int] = 1
-    VALID_STATUSES = {"todo", "in-progress", "done"}
+    # Order matters: position is the status code used by TaskTable
+    STATUSES: ClassVar[tuple[str, ...]] = ("todo", "in-progress", "done")
+    VALID_STATUSES: ClassVar[frozenset[str]] = frozenset(STATUSES)
+    # Maps any equal string to the shared constant, so loaded tasks don't each keep a copy
+    _CANONICAL_STATUS: ClassVar[dict[str, str]] = {s: s for s in STATUSES}
 
-    def __init__(self, project_id: int, title: str, status: str = "todo", assigned_to: int | None = None) -> None:
-        # auto id
-        self._id = Task._id_counter
-        Task._id_counter += 1
+    def __init__(self, project_id: int, title: str, status: str = "todo", assigned_to: int | None = None,
+                 *, id: int | None = None) -> None:
+        # auto id unless a stored one is given
+        if id is None:
+            id = Task._id_counter
+            Task._id_counter += 1
+        self._id = id
 
         # basic fields
         self.project_id = project_id
         self.title = title
-        self.status = status if status in self.VALID_STATUSES else "todo"
+        self.status = self.normalize_status(status)
         self.assigned_to = assigned_to
 
     @property
@@ -45,22 +53,35 @@ class Task:
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Task":
+    def normalize_status(cls, status: str | None) -> str:
+        """The shared status constant equal to status; unknown statuses read as 'todo'."""
+        return cls._CANONICAL_STATUS.get(status, "todo")
+
+    @classmethod
+    def sync_counter(cls, max_id: int) -> None:
+        """Make sure the next auto id is greater than max_id."""
+        if max_id >= cls._id_counter:
+            cls._id_counter = max_id + 1
+
+    @classmethod
+    def from_dict(cls, data: dict, sync_counter: bool = True) -> "Task":
         """
-        Build Task from dict; also keep id counter in sync.
+        Build Task from dict; also keep id counter in sync
+        (sync_counter=False leaves that to the caller, e.g. once per batch).
         """
-        obj = cls(
-            project_id=int(data.get("project_id", 0)),
+        project_id = int(data.get("project_id", 0))
+        stored_id = data.get("id")
+        if not isinstance(stored_id, int):
+            stored_id = None
+        elif sync_counter:
+            cls.sync_counter(stored_id)
+        return cls(
+            project_id=project_id,
             title=data.get("title", ""),
             status=data.get("status", "todo"),
             assigned_to=data.get("assigned_to"),
+            id=stored_id,
         )
-        stored_id = data.get("id")
-        if isinstance(stored_id, int):
-            obj._id = stored_id
-            if stored_id >= cls._id_counter:
-                cls._id_counter = stored_id + 1
-        return obj
 
     def __repr__(self) -> str:
         return f"Task(id={self.id}, title={self.title!r}, status={self.status!r})"
\ No newline at end of file
@@ -0,0 +1,119 @@
+from __future__ import annotations
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+from models.task import Task
+
+class TaskTable:
+    """
+    Column-oriented container for many tasks.
+    - ids, project_ids, assignees: array('i'); assignee 0 means unassigned
+    - statuses: array('b') of positions in Task.STATUSES
+    - titles: indexes into one pool of interned, de-duplicated strings
+    Filters and counts work on the columns without building Task objects.
+    """
+
+    __slots__ = ("ids", "project_ids", "assignees", "statuses", "title_refs", "_titles", "_title_index", "skipped")
+
+    def __init__(self) -> None:
+        self.ids = array("i")
+        self.project_ids = array("i")
+        self.assignees = array("i")
+        self.statuses = array("b")
+        self.title_refs = array("i")
+        self._titles: list[str] = []
+        self._title_index: dict[str, int] = {}
+        self.skipped = 0
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[dict]) -> "TaskTable":
+        """Build from raw task dicts; malformed ones are counted in `skipped`."""
+        table = cls()
+        for d in records:
+            try:
+                table.append_dict(d)
+            except (AttributeError, TypeError, ValueError, OverflowError):
+                table.skipped += 1
+        return table
+
+    def append_dict(self, data: dict) -> None:
+        """Add one raw task dict (same defaults as Task.from_dict)."""
+        task_id = data.get("id")
+        if not isinstance(task_id, int):
+            raise ValueError("task without an integer id")
+        project_id = int(data.get("project_id", 0))
+        assigned_to = data.get("assigned_to")
+        status = data.get("status", "todo")
+        code = Task.STATUSES.index(status) if status in Task.VALID_STATUSES else 0
+        title = str(data.get("title", ""))
+
+        # Raises OverflowError before any column is touched if an id doesn't fit 32 bits
+        ints = array("i", (task_id, project_id, int(assigned_to) if assigned_to else 0))
+        self.ids.append(ints[0])
+        self.project_ids.append(ints[1])
+        self.assignees.append(ints[2])
+        self.statuses.append(code)
+        self.title_refs.append(self._title_ref(title))
+
+    def _title_ref(self, title: str) -> int:
+        ref = self._title_index.get(title)
+        if ref is None:
+            ref = len(self._titles)
+            self._titles.append(sys.intern(title))
+            self._title_index[title] = ref
+        return ref
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def title(self, i: int) -> str:
+        return self._titles[self.title_refs[i]]
+
+    def status(self, i: int) -> str:
+        return Task.STATUSES[self.statuses[i]]
+
+    def where(self, project_id: int | None = None, assigned_to: int | None = None,
+              status: str | None = None) -> list[int]:
+        """Row positions matching every given filter."""
+        rows: Iterable[int] = range(len(self.ids))
+        if project_id is not None:
+            column = self.project_ids
+            rows = [i for i in rows if column[i] == project_id]
+        if assigned_to is not None:
+            column = self.assignees
+            rows = [i for i in rows if column[i] == assigned_to]
+        if status is not None:
+            code = Task.STATUSES.index(status)
+            column = self.statuses
+            rows = [i for i in rows if column[i] == code]
+        return list(rows)
+
+    def count_by_status(self, project_id: int | None = None, assigned_to: int | None = None) -> dict[str, int]:
+        """{status: count} over the matching rows (all statuses present, possibly 0)."""
+        counts = [0] * len(Task.STATUSES)
+        statuses = self.statuses
+        if project_id is None and assigned_to is None:
+            for code in range(len(counts)):
+                counts[code] = statuses.count(code)
+        else:
+            for i in self.where(project_id=project_id, assigned_to=assigned_to):
+                counts[statuses[i]] += 1
+        return dict(zip(Task.STATUSES, counts))
+
+    def task(self, i: int) -> Task:
+        """Materialise one row as a Task."""
+        return Task.from_dict(self.row(i))
+
+    def row(self, i: int) -> dict:
+        """One row as a raw dict, like the ones in tasks.json."""
+        return {
+            "id": self.ids[i],
+            "project_id": self.project_ids[i],
+            "title": self.title(i),
+            "status": self.status(i),
+            "assigned_to": self.assignees[i] or None,
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        return (self.row(i) for i in range(len(self.ids)))
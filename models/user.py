@@ -7,11 +7,14 @@ class User:
     - name: display name
     - email: optional email
     """
+    __slots__ = ("_id", "_name", "_email")
     _id_counter: ClassVar[int] = 1
 
-    def __init__(self, name: str, email: str | None = None) -> None:
-        self._id = User._id_counter
-        User._id_counter += 1
+    def __init__(self, name: str, email: str | None = None, *, id: int | None = None) -> None:
+        if id is None:
+            id = User._id_counter
+            User._id_counter += 1
+        self._id = id
 
         self._name = name
         self._email = email
@@ -48,19 +51,24 @@ class User:
         return {"id": self.id, "name": self.name, "email": self.email}
 
     @classmethod
-    def from_dict(cls, data: dict) -> "User":
+    def sync_counter(cls, max_id: int) -> None:
+        """Make sure the next auto id is greater than max_id."""
+        if max_id >= cls._id_counter:
+            cls._id_counter = max_id + 1
+
+    @classmethod
+    def from_dict(cls, data: dict, sync_counter: bool = True) -> "User":
         """
         Create a User from a dict.
-        Note: we also adjust _id_counter to keep it in sync.
+        Note: we also adjust _id_counter to keep it in sync, unless the caller
+        does that once for a whole batch (sync_counter=False).
         """
-        obj = cls(name=data.get("name", ""), email=data.get("email"))
-        # Overwrite auto id with stored id
         stored_id = data.get("id")
-        if isinstance(stored_id, int):
-            obj._id = stored_id
-            if stored_id >= cls._id_counter:
-                cls._id_counter = stored_id + 1
-        return obj
+        if not isinstance(stored_id, int):
+            stored_id = None
+        elif sync_counter:
+            cls.sync_counter(stored_id)
+        return cls(name=data.get("name", ""), email=data.get("email"), id=stored_id)
 
     def __repr__(self) -> str:
         return f"User(id={self.id}, name={self.name!r}, email={self.email!r})"
\ No newline at end of file
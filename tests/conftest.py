@@ -0,0 +1,13 @@
+import pytest
+
+from utils import storage
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point utils.storage at an empty temporary data folder."""
+    monkeypatch.setattr(storage, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(storage, "USERS_FILE", tmp_path / "users.json")
+    monkeypatch.setattr(storage, "PROJECTS_FILE", tmp_path / "projects.json")
+    monkeypatch.setattr(storage, "TASKS_FILE", tmp_path / "tasks.json")
+    return tmp_path
@@ -0,0 +1,65 @@
+import pytest
+
+from utils import changes, storage
+
+
+def test_change_log_resumes_by_sequence_number(data_dir, monkeypatch):
+    """Inserts and updates become numbered events; trimming keeps the numbering."""
+    task = {"id": 1, "project_id": 1, "title": "A", "status": "todo", "assigned_to": None}
+    storage.insert_users([{"id": 1, "name": "Alex", "email": None}])
+    storage.insert_tasks([task, dict(task, id=2)])
+    storage.update_tasks([dict(task, status="done"), dict(task, id=2, status="in-progress")])
+
+    events, position = changes.read()
+    assert [(e["seq"], e["event"]) for e in events] == [
+        (1, "user_added"), (2, "task_added"), (3, "task_added"), (4, "task_completed"), (5, "task_updated")]
+    assert [e["seq"] for e in changes.read(since=3)[0]] == [4, 5]
+
+    storage.insert_tasks([dict(task, id=3)])
+    assert [e["seq"] for e in changes.read(since=5, position=position)[0]] == [6]
+
+    monkeypatch.setattr(changes, "MAX_BYTES", 600)
+    storage.insert_tasks([dict(task, id=i) for i in range(4, 9)])
+    kept = [e["seq"] for e in changes.read()[0]]
+    assert kept[-1] == changes.last_seq() == 11
+    assert kept == list(range(kept[0], 12)) and kept[0] > 1
+    feed = changes.follow(since=9, interval=0)
+    assert [next(feed)["seq"], next(feed)["seq"]] == [10, 11]
+
+
+def test_last_seq_reads_back_past_a_large_event(data_dir):
+    """The newest event is found even when it is longer than one read-back block."""
+    task = {"id": 1, "project_id": 1, "title": "A", "status": "todo", "assigned_to": None}
+    storage.insert_tasks([task])
+    storage.insert_tasks([dict(task, id=2, title="x" * 200_000)])
+    assert changes.last_seq() == 2
+    storage.insert_tasks([dict(task, id=3)])
+    assert [e["seq"] for e in changes.read(since=2)[0]] == [3]
+
+
+def test_follow_waits_for_the_rest_of_a_partly_written_event(data_dir, monkeypatch):
+    """A log ending mid-line makes follow sleep, not re-read it in a busy loop."""
+    task = {"id": 1, "project_id": 1, "title": "A", "status": "todo", "assigned_to": None}
+    storage.insert_tasks([task])
+    with changes.log_path().open("ab") as f:
+        f.write(b'{"seq": 2, "event": "task_add')
+    reads = []
+    real_read = changes.read
+
+    def counting_read(since, position):
+        reads.append(position)
+        assert len(reads) < 5, "follow re-read the log without waiting"
+        return real_read(since, position)
+
+    class Slept(Exception):
+        pass
+
+    def sleep(_):
+        raise Slept
+
+    monkeypatch.setattr(changes, "read", counting_read)
+    monkeypatch.setattr(changes.time, "sleep", sleep)
+    with pytest.raises(Slept):
+        next(changes.follow(since=1, interval=0))
+    # One read up to the partial line, one that finds nothing new, then a sleep
+    assert len(reads) == 2
@@ -0,0 +1,57 @@
+import json
+import multiprocessing
+import sys
+
+import pytest
+
+import main
+from utils import storage, timing
+
+WORKERS = 6
+ROUNDS = 10
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs fork and fcntl")
+
+
+def _writer(worker):
+    """Add users through the CLI and tasks through a hand-written transaction."""
+    for i in range(ROUNDS):
+        assert main.main(["add-user", "--name", f"user {worker}-{i}"]) == 0
+        with storage.transaction():
+            tasks = storage.load_tasks()
+            next_id = max((t["id"] for t in tasks), default=0) + 1
+            tasks.append({"id": next_id, "project_id": 1, "title": f"{worker}-{i}", "status": "todo", "assigned_to": None})
+            storage.save_tasks(tasks)
+
+
+def _reader(_):
+    """Reads must never go backwards (e.g. see a half-written, empty file)."""
+    seen = 0
+    for _ in range(ROUNDS * 5):
+        count = len(storage.load_users())
+        assert count >= seen
+        seen = count
+
+
+def test_parallel_writers_lose_no_updates(data_dir, monkeypatch):
+    trace = data_dir / "trace.jsonl"
+    monkeypatch.setattr(timing, "TRACE_FILE", str(trace))
+    monkeypatch.setattr(storage, "LOCK_TIMEOUT", 20.0)
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_writer, args=(w,)) for w in range(WORKERS)]
+    procs += [ctx.Process(target=_reader, args=(w,)) for w in range(2)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(120)
+    assert [p.exitcode for p in procs] == [0] * len(procs)
+
+    users = storage.load_users()
+    tasks = storage.load_tasks()
+    assert sorted(u["id"] for u in users) == list(range(1, WORKERS * ROUNDS + 1))
+    assert sorted(t["id"] for t in tasks) == list(range(1, WORKERS * ROUNDS + 1))
+
+    waits = [line["phases"].get("storage.lock_wait", {}).get("seconds", 0.0)
+             for line in map(json.loads, trace.read_text().splitlines())]
+    assert len(waits) == WORKERS * ROUNDS
+    assert max(waits) < storage.LOCK_TIMEOUT
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs Unix domain sockets")
+
+
+def run_cli(args, env):  # type: (list, dict) -> subprocess.CompletedProcess
+    """Run main.py the way a user would, so it forwards to the server when one listens."""
+    return subprocess.run([sys.executable, "main.py", *args], capture_output=True, text=True, env=env)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A 'serve' process on an empty data folder; yields the client environment."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("PROJECT_CLI_")}
+    env.update(PROJECT_CLI_DATA_DIR=str(tmp_path), PROJECT_CLI_SOCKET=str(tmp_path / "s.sock"))
+    proc = subprocess.Popen([sys.executable, "main.py", "--plain", "serve"], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not (tmp_path / "s.sock").exists():
+        assert proc.poll() is None and time.monotonic() < deadline, "server did not start"
+        time.sleep(0.05)
+    try:
+        yield env
+    finally:
+        proc.terminate()
+        proc.wait(10)
+
+
+def test_forwarded_commands_use_the_clients_settings(server, tmp_path):
+    """Store, plain output and trace file come from the client's environment, per request."""
+    trace = tmp_path / "trace.jsonl"
+    sqlite = dict(server, PROJECT_CLI_STORE="sqlite", PROJECT_CLI_PLAIN="1", PROJECT_CLI_TRACE=str(trace))
+    assert run_cli(["add-user", "--name", "Only in sqlite"], sqlite).returncode == 0
+    assert run_cli(["add-user", "--name", "Only in json"], dict(server, PROJECT_CLI_PLAIN="1")).returncode == 0
+
+    listed = run_cli(["list-users"], sqlite)
+    assert listed.returncode == 0
+    assert "Only in sqlite" in listed.stdout and "Only in json" not in listed.stdout
+    assert json.loads((tmp_path / "users.json").read_text())[0]["name"] == "Only in json"
+    # The server wrote the trace lines, so they carry its pid rather than the clients'
+    lines = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert [line["command"] for line in lines] == ["add-user", "list-users"]
+    assert len({line["pid"] for line in lines}) == 1
+
+
+def test_client_with_another_data_folder_runs_locally(server, tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    env = dict(server, PROJECT_CLI_DATA_DIR=str(other), PROJECT_CLI_PLAIN="1")
+    assert run_cli(["add-user", "--name", "Elsewhere"], env).returncode == 0
+    assert json.loads((other / "users.json").read_text())[0]["name"] == "Elsewhere"
+    assert not (tmp_path / "users.json").exists()
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from utils import due, storage
+
+
+def test_due_dates_are_parsed_in_bulk_and_counted_per_owner(data_dir):
+    values = ["2026-03-01", "2024-02-29", "2025-02-29", "2026-3-01", "2026-03-011", None, "", 20260301, "２０２６-03-01"]
+    days = due.parse_dates(values)
+    assert [due.iso(d) for d in days[:2]] == ["2026-03-01", "2024-02-29"]
+    assert days[2:5].tolist() == [due.INVALID] * 3
+    assert days[5:7].tolist() == [due.NO_DATE] * 2
+    assert days[7:].tolist() == [due.INVALID] * 2
+
+    storage.save_projects([
+        {"id": 1, "user_id": 1, "title": "A", "description": None, "due_date": "2026-02-20"},
+        {"id": 2, "user_id": 1, "title": "B", "description": None, "due_date": "2026-03-05"},
+        {"id": 3, "user_id": 2, "title": "C", "description": None, "due_date": "2026-02-27"},
+        {"id": 4, "user_id": 2, "title": "D", "description": None, "due_date": "2026-06-01"},
+        {"id": 5, "user_id": 2, "title": "E", "description": None, "due_date": None},
+        {"id": 6, "user_id": 1, "title": "F", "description": None, "due_date": "tomorrow"},
+    ])
+    cols = due.columns()
+    today = due.day_number("2026-03-01")
+    owners, counts = due.by_owner(cols, today, within=7)
+    assert owners.tolist() == [1, 2]
+    assert counts.tolist() == [[1, 1, 0, 0, 1], [1, 0, 1, 1, 0]]
+    assert cols["id"][due.matching(cols, today, 7, due.OVERDUE)].tolist() == [1, 3]
+    assert due.invalid(cols) == [(6, "tomorrow")]
+
+    storage.update("projects", [{"id": 6, "user_id": 1, "title": "F", "description": None, "due_date": "2026-03-02"}])
+    assert due.invalid(due.columns()) == []
@@ -0,0 +1,15 @@
+import random
+
+from utils import external_sort
+
+
+def test_spilled_runs_merge_into_a_stable_sort():
+    rng = random.Random(7)
+    items = [(rng.randint(0, 50), i, "x" * rng.randint(0, 30)) for i in range(5000)]
+    key = lambda item: item[0]
+    expected = sorted(items, key=key)
+
+    assert list(external_sort.sort(iter(items), key)) == expected
+    # A tiny budget spills a run every few items and merges them in several rounds
+    assert list(external_sort.sort(iter(items), key, budget=2000)) == expected
+    assert external_sort.top(iter(items), 10, key) == expected[:10]
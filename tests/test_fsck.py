@@ -0,0 +1,85 @@
+import json
+
+from utils import fsck, storage
+
+
+def test_fsck_finds_and_repairs_broken_rows(data_dir):
+    storage._write_json(data_dir / "users.json", [{"id": 1, "name": "Alex", "email": None}])
+    storage._write_json(data_dir / "projects.json", [
+        {"id": 1, "title": "CLI", "description": None, "due_date": "2025-02-30", "user_id": 1},
+        {"id": 2, "title": "Lost", "description": None, "due_date": None, "user_id": 5},
+    ])
+    task = {"id": 1, "project_id": 1, "title": "A", "status": "done", "assigned_to": 1}
+    storage._write_json(data_dir / "tasks.json", [
+        task,
+        dict(task),                                       # exact duplicate
+        dict(task, title="B", status="doing", assigned_to=9),
+        dict(task, id="7", project_id="1"),
+        dict(task, id=8, project_id=2),                   # project 2 exists, but only until repair
+        "garbage",
+    ])
+
+    found = fsck.check()
+    assert {(e, rid, kind) for e, rid, kind, _ in found.problems} == {
+        ("projects", 1, "malformed"), ("projects", 2, "dangling"),
+        ("tasks", 1, "duplicate"), ("tasks", 1, "malformed"), ("tasks", 1, "dangling"),
+        ("tasks", "7", "malformed"), ("tasks", None, "malformed"),
+    }
+    assert found.backup is None
+    assert storage._read_json(data_dir / "tasks.json")[-1] == "garbage"
+
+    repaired = fsck.check(repair=True)
+    assert (repaired.fixed, repaired.dropped) == (3, 4)
+    assert json.loads((repaired.backup / "tasks.json").read_text())[1] == task
+    assert storage.load_projects() == [
+        {"id": 1, "title": "CLI", "description": None, "due_date": None, "user_id": 1}]
+    assert storage.load_tasks() == [
+        task,
+        dict(task, id=9, title="B", status="todo", assigned_to=None),
+        dict(task, id=7),
+    ]
+    assert fsck.check().problems == []
+
+
+def test_fsck_sees_journal_duplicates_and_backs_up_raw_files(data_dir, monkeypatch):
+    """Duplicate ids in a journal snapshot are reported, and the backup keeps the files as stored."""
+    monkeypatch.setattr(storage, "STORE", "journal")
+    task = {"id": 1, "project_id": 1, "title": "A", "status": "todo", "assigned_to": None}
+    storage._write_json(data_dir / "users.json", [{"id": 1, "name": "Alex", "email": None}])
+    storage._write_json(data_dir / "projects.json", [
+        {"id": 1, "title": "CLI", "description": None, "due_date": None, "user_id": 1}])
+    storage._write_json(data_dir / "tasks.json", [task, dict(task, title="B"), "garbage"])
+    storage.update_tasks([dict(task, status="done")])
+    raw = (data_dir / "tasks.json").read_bytes()
+
+    found = fsck.check()
+    assert {(e, rid, kind) for e, rid, kind, _ in found.problems} == {
+        ("tasks", 1, "duplicate"), ("tasks", None, "malformed")}
+
+    repaired = fsck.check(repair=True)
+    assert (repaired.backup / "tasks.json").read_bytes() == raw
+    assert (repaired.backup / "tasks.log").exists()
+    assert storage.load_tasks() == [dict(task, status="done"), dict(task, id=2, title="B")]
+
+
+def test_fsck_reports_a_file_cut_short_by_a_syntax_error_and_refuses_repair(data_dir):
+    """Rows after a syntax error are invisible to the loaders; fsck says so and won't save the rest."""
+    storage._write_json(data_dir / "users.json", [{"id": 1, "name": "Alex", "email": None}])
+    storage._write_json(data_dir / "projects.json", [
+        {"id": 1, "title": "CLI", "description": None, "due_date": None, "user_id": 1}])
+    tasks = [{"id": i, "project_id": 1, "title": f"t{i}", "status": "todo", "assigned_to": None} for i in (1, 2, 3)]
+    storage._write_json(data_dir / "tasks.json", tasks)
+    text = (data_dir / "tasks.json").read_text()
+    (data_dir / "tasks.json").write_text(text.replace('"t2"', '"t2" oops'))
+    before = (data_dir / "tasks.json").read_bytes()
+
+    found = fsck.check()
+    assert found.checked["tasks"] == 1
+    assert [(e, kind) for e, _, kind, _ in found.problems] == [("tasks", "unreadable")]
+    (path, offset), = found.unreadable
+    assert path == data_dir / "tasks.json" and before[offset:].startswith(b"{")
+    assert b'"t2" oops' in before[offset:]
+
+    repaired = fsck.check(repair=True)
+    assert repaired.backup is None
+    assert (data_dir / "tasks.json").read_bytes() == before
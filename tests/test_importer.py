@@ -0,0 +1,44 @@
+import io
+
+from utils import importer, storage
+
+
+def test_import_resolves_names_and_reports_rejects(data_dir):
+    """Rows may refer to entities created earlier in the same stream; bad rows are reported."""
+    storage.save_users([{"id": 4, "name": "Alex", "email": None}])
+    stream = io.StringIO(
+        '{"type": "user", "name": "Sam"}\n'
+        '{"type": "project", "title": "Import", "user": "sam"}\n'
+        '{"type": "task", "project": "IMPORT", "title": "One", "assigned_to": "alex"}\n'
+        '{"type": "task", "project": "Missing", "title": "Two"}\n'
+        '[1, 2]\n'
+    )
+
+    result = importer.import_records(importer.read_records(stream, "jsonl"))
+    importer.commit(result)
+
+    assert [u["id"] for u in storage.load_users()] == [4, 5]
+    assert storage.load_projects() == [{"id": 1, "title": "Import", "description": None, "due_date": None, "user_id": 5}]
+    assert [(t["title"], t["project_id"], t["assigned_to"]) for t in storage.load_tasks()] == [("One", 1, 4)]
+    assert result.rejected == [(4, "unknown project 'Missing'"), (5, "not a JSON object")]
+
+
+def test_import_reads_csv(data_dir):
+    """Empty CSV cells are treated as missing values."""
+    stream = io.StringIO("type,name,email\nuser,Alex,\nuser,,x@example.com\n")
+
+    result = importer.import_records(importer.read_records(stream, "csv"))
+
+    assert result.users == [{"id": 1, "name": "Alex", "email": None}]
+    assert result.rejected == [(3, "user without a name")]
+
+
+def test_import_resolves_colliding_names_like_lookup(data_dir):
+    """Names equal after case folding resolve to the first user, as find_user does."""
+    storage.save_users([{"id": 1, "name": "alex", "email": None}, {"id": 2, "name": "Alex", "email": None}])
+    storage.save_projects([{"id": 1, "title": "P", "description": None, "due_date": None, "user_id": 1}])
+    stream = io.StringIO('{"type": "task", "project": "P", "title": "T", "assigned_to": "ALEX"}\n')
+
+    result = importer.import_records(importer.read_records(stream, "jsonl"))
+
+    assert result.tasks[0]["assigned_to"] == storage.find_user("ALEX")["id"] == 1
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from utils import indexes, storage
+
+
+def _task(i, project_id, assigned_to=None):
+    return {"id": i, "project_id": project_id, "title": f"T{i}", "status": "todo", "assigned_to": assigned_to}
+
+
+def test_appends_keep_file_layout_and_index_current(data_dir):
+    """Inserts append in place; the file still matches json.dump(indent=2) and the index stays valid."""
+    storage.save_tasks([_task(1, 1, 5), _task(2, 2)])
+    storage.insert_tasks([_task(3, 1), _task(4, 2, 5)])
+
+    tasks = json.loads((data_dir / "tasks.json").read_text())
+    assert (data_dir / "tasks.json").read_text() == json.dumps(tasks, indent=2, ensure_ascii=False)
+    assert indexes.load_meta("tasks") == {"signature": indexes.signature(data_dir / "tasks.json"), "max_id": 4}
+    assert [t["id"] for t in storage.load_tasks(project_id=1)] == [1, 3]
+    assert [t["id"] for t in storage.load_tasks(project_id=2, assigned_to=5)] == [4]
+    assert storage.max_id("tasks") == 4
+
+
+def test_stale_index_is_rebuilt_after_outside_write(data_dir):
+    """A data file changed by someone else invalidates the index instead of returning wrong rows."""
+    storage.save_users([{"id": 1, "name": "Alex", "email": None}])
+    assert storage.find_user("alex")["id"] == 1
+
+    (data_dir / "users.json").write_text(json.dumps([{"id": 9, "name": "Ünal", "email": None}], indent=4))
+
+    assert indexes.load_meta("users") is None
+    assert storage.find_user("alex") is None
+    assert storage.find_user("ÜNAL")["id"] == 9
+
+
+def test_key_lookup_returns_first_of_colliding_names(data_dir):
+    """Names that case-fold alike resolve to the earliest record, before and after appends."""
+    storage.save_users([{"id": 1, "name": "alex", "email": None}, {"id": 2, "name": "Bo", "email": None}])
+    storage.insert_users([{"id": 3, "name": "ALEX", "email": None}, {"id": 4, "name": "Cy", "email": None}])
+
+    assert storage.find_user("Alex")["id"] == 1
+    assert storage.find_user("cy")["id"] == 4
+    assert storage.find_user("nobody") is None
+    assert indexes.key_candidates("users", storage._name_key("alex")) == [1, 3]
+
+
+def test_inserts_out_of_id_order_are_merged_into_the_index(data_dir):
+    """Rows that don't sort after the existing ones are merged in, not appended."""
+    storage.save_tasks([_task(5, 1), _task(9, 2)])
+    storage.insert_tasks([_task(7, 2, 3), _task(2, 1)])
+
+    assert [t["id"] for t in storage.load_tasks(project_id=2)] == [9, 7]
+    assert [t["id"] for t in storage.load_tasks(project_id=1)] == [5, 2]
+    assert storage.select("tasks", id=7)[0]["assigned_to"] == 3
+    assert storage.max_id("tasks") == 9
+    assert indexes.fetch("tasks", [2, 5, 7, 9]) == [_task(5, 1), _task(9, 2), _task(7, 2, 3), _task(2, 1)]
+
+
+def test_file_broken_mid_way_gets_no_trusted_index(data_dir):
+    """Readers see the records before a syntax error; writers refuse instead of reusing ids."""
+    storage.save_tasks([_task(1, 1), _task(2, 1), _task(3, 1)])
+    path = data_dir / "tasks.json"
+    path.write_text(path.read_text().replace('"T2"', '"T2" oops'))
+
+    assert [t["id"] for t in storage.load_tasks(project_id=1)] == [1]
+    assert indexes.load_meta("tasks") is None
+    with pytest.raises(storage.UnreadableFileError):
+        storage.insert_tasks([_task(2, 1)])
+    assert '"T2" oops' in path.read_text() and path.read_text().count('"id"') == 3
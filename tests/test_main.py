@@ -55,4 +55,77 @@ def test_add_task_creates_entry():
     tasks_file = DATA_PATH / "tasks.json"
     assert tasks_file.exists(), "tasks.json file does not exist"
     tasks = json.loads(tasks_file.read_text() or "[]")
-    assert any(t.get("title") == "Check README" for t in tasks), "Task not found in tasks.json"
\ No newline at end of file
+    assert any(t.get("title") == "Check README" for t in tasks), "Task not found in tasks.json"
+
+
+def test_list_tasks_streams_jsonl_with_pagination():
+    """Check that 'list-tasks --format jsonl' writes one JSON object per task."""
+    run_cli_args(["add-task", "--project", "Demo Project", "--title", "Second task"])
+    proc = run_cli_args(["list-tasks", "--format", "jsonl", "--offset", "1", "--limit", "1"])
+    assert proc.returncode == 0, f"CLI failed: {proc.stderr}\nSTDOUT:\n{proc.stdout}"
+
+    rows = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert [r["title"] for r in rows] == ["Second task"]
+    assert rows[0]["project"] == "Demo Project"
+
+
+def test_complete_tasks_by_filter_in_one_command():
+    """Check that 'complete-tasks' honours --dry-run and then updates every match."""
+    run_cli_args(["add-task", "--project", "Demo Project", "--title", "Third task", "--assigned-to", "TestUser"])
+    proc = run_cli_args(["complete-tasks", "--project", "Demo Project", "--status", "todo", "--dry-run"])
+    assert proc.returncode == 0, f"CLI failed: {proc.stderr}\nSTDOUT:\n{proc.stdout}"
+    assert "Would set 3 of 3" in proc.stdout
+
+    proc = run_cli_args(["update-tasks", "--ids", "1-2", "--set-status", "in-progress"])
+    assert "Set 2 task(s)" in proc.stdout
+    tasks = json.loads((DATA_PATH / "tasks.json").read_text())
+    assert [t["status"] for t in tasks] == ["in-progress", "in-progress", "todo"]
+
+
+def test_batch_runs_every_line_and_reports_failures():
+    """Check that 'batch' runs each line, names the failing ones and writes the data once."""
+    script = "\n".join([
+        "# comment lines and blank lines are skipped",
+        "",
+        "add-task --project 'Demo Project' --title 'Batch task'",
+        "add-task --project Nowhere --title Lost",
+        "complete-task --id 4",
+        "list-users --bogus",
+        "import --format jsonl",
+    ])
+    proc = subprocess.run([sys.executable, "main.py", "batch"], input=script, capture_output=True, text=True)
+    assert proc.returncode == 1, f"STDOUT:\n{proc.stdout}\nSTDERR:\n{proc.stderr}"
+    assert "line 4: Project 'Nowhere' not found." in proc.stdout
+    assert "line 6: unrecognized arguments: --bogus" in proc.stdout
+    assert "line 7: 'import' needs --file PATH inside a batch, not stdin." in proc.stdout
+    assert "Ran 3 command(s); 3 line(s) failed." in proc.stdout
+
+    tasks = json.loads((DATA_PATH / "tasks.json").read_text())
+    assert tasks[-1]["title"] == "Batch task" and tasks[-1]["status"] == "done"
+
+
+def test_list_tasks_sorted_by_title_with_top():
+    """Check that '--sort-by' orders the joined rows and '--top' keeps the first ones."""
+    proc = run_cli_args(["list-tasks", "--format", "jsonl", "--sort-by", "title", "--top", "2"])
+    assert proc.returncode == 0, f"CLI failed: {proc.stderr}\nSTDOUT:\n{proc.stdout}"
+    assert [json.loads(line)["title"] for line in proc.stdout.splitlines()] == ["Batch task", "Check README"]
+
+    proc = run_cli_args(["list-tasks", "--format", "jsonl", "--sort-by", "status"])
+    assert [json.loads(line)["status"] for line in proc.stdout.splitlines()] == [
+        "todo", "in-progress", "in-progress", "done"]
+
+    proc = run_cli_args(["list-tasks", "--sort-by", "title", "--top", "0"])
+    assert proc.returncode == 2
+    assert "must be 1 or more, got 0" in proc.stderr
+
+
+def test_impossible_dates_are_rejected():
+    """Check that dates like 2026-02-30 are usage errors, not crashes."""
+    proc = run_cli_args(["report", "--by", "overdue", "--today", "2026-02-30"])
+    assert proc.returncode == 2
+    assert "not a YYYY-MM-DD date" in proc.stderr
+
+    proc = run_cli_args(["add-project", "--user", "TestUser", "--title", "Bad Due", "--due-date", "2025-13-45"])
+    assert "YYYY-MM-DD" in proc.stderr + proc.stdout
+    proc = run_cli_args(["report", "--by", "overdue", "--today", "2026-01-01"])
+    assert proc.returncode == 0, f"CLI failed: {proc.stderr}\nSTDOUT:\n{proc.stdout}"
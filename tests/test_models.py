@@ -0,0 +1,29 @@
+from models.task import Task
+from models.task_table import TaskTable
+from models.user import User
+
+
+def test_models_use_slots():
+    """Models have no per-instance __dict__ and share status strings."""
+    task = Task.from_dict({"id": 5, "project_id": 1, "title": "A", "status": "".join(["do", "ne"])})
+    assert not hasattr(task, "__dict__")
+    assert not hasattr(User("Alex"), "__dict__")
+    assert task.status is Task.STATUSES[2]
+
+
+def test_task_table_filters_and_counts_on_columns():
+    """TaskTable answers filters/counts and skips malformed rows."""
+    table = TaskTable.from_dicts([
+        {"id": 1, "project_id": 1, "title": "Same", "status": "done", "assigned_to": 3},
+        {"id": 2, "project_id": 1, "title": "Same", "status": "todo", "assigned_to": None},
+        {"id": 3, "project_id": 2, "title": "Other", "status": "in-progress", "assigned_to": 3},
+        {"id": "x", "project_id": 2},
+    ])
+
+    assert len(table) == 3 and table.skipped == 1
+    assert table.title_refs[0] == table.title_refs[1]
+    assert table.where(project_id=1) == [0, 1]
+    assert table.where(assigned_to=3, status="in-progress") == [2]
+    assert table.count_by_status() == {"todo": 1, "in-progress": 1, "done": 1}
+    assert table.count_by_status(assigned_to=3) == {"todo": 0, "in-progress": 1, "done": 1}
+    assert table.row(1) == {"id": 2, "project_id": 1, "title": "Same", "status": "todo", "assigned_to": None}
@@ -0,0 +1,18 @@
+from models.task import Task
+from utils import parallel, storage
+
+
+def test_parallel_load_matches_serial_and_syncs_counter_once(data_dir, monkeypatch):
+    """Chunked parsing in worker processes returns every record and advances the id counter."""
+    monkeypatch.setattr(parallel, "MIN_PARALLEL_BYTES", 0)
+    tasks = [{"id": i, "project_id": i % 3, "title": f"T{i}", "status": "todo", "assigned_to": None} for i in range(1, 200)]
+    tasks.append({"id": 500, "project_id": "not a number"})
+    storage.save_tasks(tasks)
+
+    bounds = parallel._chunk_bounds(data_dir / "tasks.json", (data_dir / "tasks.json").stat().st_size, 4)
+    assert len(bounds) == 4
+
+    models, skipped = parallel.load_models(data_dir / "tasks.json", Task, workers=2)
+    assert [t.id for t in models] == list(range(1, 200))
+    assert skipped == 1
+    assert Task._id_counter >= 200
@@ -0,0 +1,41 @@
+import main
+from utils import result_cache, storage
+
+
+def test_list_output_is_replayed_until_data_changes(data_dir, capsys):
+    """Second identical listing is a hit; any storage write drops the entry."""
+    storage.save_users([{"id": 1, "name": "Alex", "email": None}])
+
+    assert main.main(["--plain", "list-users"]) == 0
+    first = capsys.readouterr().out
+    assert main.main(["--plain", "list-users"]) == 0
+    assert capsys.readouterr().out == first
+    assert result_cache.stats() == {"entries": 1, "bytes": len(first.encode()), "hits": 1, "misses": 1}
+
+    storage.insert_users([{"id": 2, "name": "Sam", "email": None}])
+    assert result_cache.stats()["entries"] == 0
+    assert main.main(["--plain", "list-users"]) == 0
+    assert "Sam" in capsys.readouterr().out
+
+
+def test_least_recently_used_entries_are_evicted(data_dir, monkeypatch):
+    monkeypatch.setattr(result_cache, "MAX_BYTES", 10)
+    result_cache.put("a", ("users",), "x" * 4)
+    result_cache.put("b", ("users",), "x" * 4)
+    assert result_cache.get("a") is not None
+    result_cache.put("c", ("users",), "x" * 4)
+
+    assert result_cache.get("b") is None
+    assert result_cache.get("a") == "xxxx"
+    assert result_cache.stats()["entries"] == 2
+
+
+def test_output_larger_than_the_cache_is_not_kept(data_dir, monkeypatch, capsys):
+    """The copy stops at MAX_BYTES; the output itself is still printed in full."""
+    monkeypatch.setattr(result_cache, "MAX_BYTES", 8)
+    with result_cache.recording() as recorded:
+        print("short")
+        assert recorded.output() == "short\n"
+        print("then too long")
+    assert recorded.output() is None
+    assert capsys.readouterr().out == "short\nthen too long\n"
@@ -0,0 +1,42 @@
+from utils import search, storage
+
+
+def test_prefix_search_ranks_and_follows_incremental_adds(data_dir, monkeypatch):
+    """Exact words outrank prefixes; added tasks are found without a rebuild."""
+    storage.save_projects([{"id": 1, "title": "Website relaunch", "description": "New design", "due_date": None, "user_id": 1}])
+    storage.save_tasks([
+        {"id": 1, "project_id": 1, "title": "Design review", "status": "todo", "assigned_to": None},
+        {"id": 2, "project_id": 1, "title": "Designer hiring", "status": "todo", "assigned_to": None},
+        {"id": 3, "project_id": 1, "title": "Write copy", "status": "todo", "assigned_to": None},
+    ])
+
+    assert [(kind, rid) for _, kind, rid in search.search("design")] == [("task", 1), ("task", 2), ("project", 1)]
+    assert [rid for _, _, rid in search.search("des rev")] == [1]
+    assert search.search("nothing") == []
+
+    monkeypatch.setattr(search, "MERGE_POSTINGS", 3)
+    for new_id, title in ((4, "Review logo"), (5, "Review fonts please")):
+        index = search.current()
+        task = {"id": new_id, "project_id": 1, "title": title, "status": "todo", "assigned_to": None}
+        storage.insert_tasks([task])
+        search.apply(index, tasks=[task])
+        assert search.current() is not None
+
+    # The second add pushed the delta over MERGE_POSTINGS and was merged into the segment
+    assert search.current()["delta"] == {}
+    assert sorted(rid for _, _, rid in search.search("review")) == [1, 4, 5]
+
+
+def test_postings_from_another_segment_are_not_paired_with_the_terms(data_dir):
+    """A postings file replaced under the terms file triggers a rebuild instead of wrong hits."""
+    storage.save_projects([{"id": 1, "title": "Launch", "description": None, "due_date": None, "user_id": 1}])
+    storage.save_tasks([{"id": 1, "project_id": 1, "title": "Draft launch plan", "status": "todo", "assigned_to": None}])
+    assert [rid for _, _, rid in search.search("plan")] == [1]
+
+    _, _, postings = search._paths()
+    data = bytearray(postings.read_bytes())
+    data[:8] = bytes(8)
+    postings.write_bytes(bytes(data))
+
+    assert [rid for _, _, rid in search.search("plan")] == [1]
+    assert postings.read_bytes()[:8].hex() == search.current()["generation"]
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+# Generous budget for everything main.py imports; a regression (e.g. rich imported eagerly) adds ~100 ms
+IMPORT_BUDGET_US = 150_000
+
+
+def run_importtime(args):  # type: (list) -> tuple
+    """Run main.py under -X importtime and return (imported module names, total cumulative us)."""
+    env = dict(os.environ, PROJECT_CLI_NO_DAEMON="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert proc.returncode == 0, proc.stderr
+    modules, total = set(), 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        # Top-level imports are the ones without extra indentation
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return modules, total
+
+
+def test_plain_mode_never_imports_rich():
+    """'--plain' output must not pull in rich at all."""
+    modules, _ = run_importtime(["--plain", "list-users"])
+    assert not any(m == "rich" or m.startswith("rich.") for m in modules)
+
+
+def test_startup_import_time_within_budget():
+    """Scripted one-shot commands stay within the import budget."""
+    _, total = run_importtime(["--plain", "complete-task", "--id", "999999"])
+    assert total < IMPORT_BUDGET_US, f"imports took {total / 1000:.1f} ms"
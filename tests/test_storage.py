@@ -0,0 +1,195 @@
+import json
+
+import pytest
+
+from utils import journal, sharded_store, storage
+
+
+def test_journal_appends_instead_of_rewriting(data_dir, monkeypatch):
+    """Inserts and updates go to tasks.log and are replayed on load."""
+    monkeypatch.setattr(storage, "STORE", "journal")
+    storage.save_tasks([{"id": 1, "project_id": 1, "title": "A", "status": "todo", "assigned_to": None}])
+    snapshot = (data_dir / "tasks.json").read_text()
+
+    storage.insert_tasks([{"id": 2, "project_id": 1, "title": "B", "status": "todo", "assigned_to": None}])
+    storage.update_tasks([{"id": 1, "project_id": 1, "title": "A", "status": "done", "assigned_to": None}])
+
+    assert (data_dir / "tasks.json").read_text() == snapshot
+    assert len((data_dir / "tasks.log").read_text().splitlines()) == 2
+    tasks = storage.load_tasks()
+    assert [(t["id"], t["status"]) for t in tasks] == [(1, "done"), (2, "todo")]
+
+
+def test_journal_compaction_folds_log_into_snapshot(data_dir, monkeypatch):
+    """Compaction rewrites the snapshot once and removes the log."""
+    monkeypatch.setattr(storage, "STORE", "journal")
+    monkeypatch.setattr(journal, "COMPACT_BYTES", 1)
+    storage.insert_users([{"id": 1, "name": "Alex", "email": None}])
+
+    assert not (data_dir / "users.log").exists()
+    assert json.loads((data_dir / "users.json").read_text()) == [{"id": 1, "name": "Alex", "email": None}]
+
+
+def test_sqlite_store_indexed_queries_after_migration(data_dir, monkeypatch):
+    """Migrating JSON data into SQLite keeps lookups and filters working."""
+    storage.save_users([{"id": 1, "name": "Alex", "email": None}, {"id": 2, "name": "Sam", "email": None}])
+    storage.save_projects([{"id": 1, "title": "CLI Tool", "description": None, "due_date": None, "user_id": 2}])
+    storage.save_tasks([
+        {"id": 1, "project_id": 1, "title": "A", "status": "todo", "assigned_to": 1},
+        {"id": 2, "project_id": 2, "title": "B", "status": "todo", "assigned_to": 2},
+    ])
+
+    assert storage.migrate("json", "sqlite") == {"users": 2, "projects": 1, "tasks": 2}
+    monkeypatch.setattr(storage, "STORE", "sqlite")
+
+    assert storage.find_user("  sam ")["id"] == 2
+    assert storage.find_project("cli tool")["id"] == 1
+    assert [p["id"] for p in storage.load_projects(user_id=2)] == [1]
+    assert [t["id"] for t in storage.load_tasks(project_id=1)] == [1]
+    assert [t["id"] for t in storage.load_tasks(assigned_to=2)] == [2]
+    assert storage.max_id("tasks") == 2
+
+    # Missing title/status are stored like the models read them; duplicate ids fail without emptying the table
+    storage.update_tasks([{"id": 2, "project_id": 2, "title": None, "assigned_to": 2}])
+    assert storage.select("tasks", id=2)[0]["status"] == "todo"
+    with pytest.raises(ValueError, match="duplicate id"):
+        storage.save_tasks([{"id": 3, "project_id": 1, "title": "C", "status": "todo", "assigned_to": None}] * 2)
+    assert len(storage.load_tasks()) == 2
+
+
+def test_iter_json_streams_records_across_chunks(data_dir):
+    """The incremental reader yields the same records as a full json.load."""
+    tasks = [{"id": i, "project_id": 1, "title": f"Task {i} ü", "status": "todo", "assigned_to": None} for i in range(1, 50)]
+    storage.save_tasks(tasks)
+
+    assert list(storage._iter_json(data_dir / "tasks.json", chunk_size=7)) == tasks
+    assert [t["id"] for t in storage.iter_tasks(project_id=1)][:3] == [1, 2, 3]
+
+
+def test_memory_cache_serves_indexes_and_notices_outside_writes(data_dir, monkeypatch):
+    """The daemon's in-memory tables follow both its own and other processes' writes."""
+    monkeypatch.setattr(storage, "_memory", None)
+    storage.save_users([{"id": 1, "name": "Alex", "email": None}])
+    storage.enable_memory_cache()
+
+    assert storage.find_user("alex")["id"] == 1
+    storage.insert_users([{"id": 2, "name": "Sam", "email": None}])
+    assert storage.find_user("SAM")["id"] == 2
+
+    # Another process rewrites the file behind the cache's back
+    (data_dir / "users.json").write_text(json.dumps([{"id": 7, "name": "Kim", "email": None, "pad": "x" * 10}]))
+    assert storage.find_user("sam") is None
+    assert storage.max_id("users") == 7
+
+
+def test_deferred_writes_reach_the_files_once_at_the_end(data_dir, monkeypatch):
+    """Inside deferred_writes() reads see every write; the files only change in flush()."""
+    monkeypatch.setattr(storage, "_memory", None)
+    storage.save_tasks([{"id": i, "project_id": 1, "title": f"T{i}", "status": "todo", "assigned_to": None}
+                        for i in range(1, 4)])
+    before = (data_dir / "tasks.json").read_bytes()
+
+    with storage.deferred_writes():
+        storage.insert_tasks([{"id": 4, "project_id": 2, "title": "T4", "status": "todo", "assigned_to": None}])
+        assert storage.select("tasks", project_id=2)[0]["id"] == 4
+        storage.update_tasks([{"id": 2, "project_id": 1, "title": "T2", "status": "done", "assigned_to": None}])
+        storage.update_tasks([{"id": 4, "project_id": 2, "title": "T4", "status": "done", "assigned_to": None}])
+        assert [t["status"] for t in storage.select("tasks", project_id=1)] == ["todo", "done", "todo"]
+        assert storage.max_id("tasks") == 4
+        assert (data_dir / "tasks.json").read_bytes() == before
+    assert [t["status"] for t in storage._read_json(data_dir / "tasks.json")] == ["todo", "done", "todo", "done"]
+    # The added task was written once, already done
+    assert [json.loads(line)["event"] for line in (data_dir / "changes.log").read_text().splitlines()] == [
+        "task_added", "task_completed", "task_completed"]
+
+
+def test_binary_store_patches_status_in_place_and_converts_back(data_dir, monkeypatch):
+    """Completing a task changes one byte of tasks.rows; migrate restores the JSON."""
+    tasks = [{"id": i, "project_id": i % 2, "title": f"Task {i} ü", "status": "todo", "assigned_to": i if i % 3 else None}
+             for i in range(1, 7)]
+    storage.save_users([{"id": 1, "name": "Alex", "email": None}])
+    storage.save_tasks(tasks)
+    storage.migrate("json", "binary")
+    monkeypatch.setattr(storage, "STORE", "binary")
+
+    rows = (data_dir / "tasks.rows").read_bytes()
+    storage.update_tasks([dict(tasks[3], status="done")])
+    patched = (data_dir / "tasks.rows").read_bytes()
+    assert len(patched) == len(rows)
+    assert sum(a != b for a, b in zip(rows, patched)) == 1
+
+    storage.insert_tasks([{"id": 7, "project_id": 1, "title": "New", "status": "in-progress", "assigned_to": None}])
+    assert [t["id"] for t in storage.load_tasks(project_id=1)] == [1, 3, 5, 7]
+    assert storage.select("tasks", id=4)[0]["status"] == "done"
+    assert storage.find_user(" ALEX ")["id"] == 1
+    assert storage.max_id("tasks") == 7
+
+    (data_dir / "tasks.json").unlink()
+    storage.migrate("binary", "json")
+    monkeypatch.setattr(storage, "STORE", "json")
+    assert storage.load_tasks()[:6] == [dict(t, status="done") if t["id"] == 4 else t for t in tasks]
+
+
+def test_binary_save_interrupted_between_renames_keeps_a_readable_pair(data_dir, monkeypatch):
+    """Rows renamed but heap not yet: reads use tasks.heap.new and the next write moves it in."""
+    from utils import binary_store
+
+    monkeypatch.setattr(storage, "STORE", "binary")
+    task = {"id": 1, "project_id": 1, "title": "Old", "status": "todo", "assigned_to": None}
+    storage.save_tasks([task])
+    real_replace = binary_store.os.replace
+
+    def replace(src, dst):
+        if str(src).endswith(".heap.new"):
+            raise KeyboardInterrupt
+        real_replace(src, dst)
+
+    monkeypatch.setattr(binary_store.os, "replace", replace)
+    with pytest.raises(KeyboardInterrupt):
+        storage.save_tasks([dict(task, title="New title")])
+    monkeypatch.setattr(binary_store.os, "replace", real_replace)
+
+    assert (data_dir / "tasks.heap.new").exists()
+    assert [t["title"] for t in storage.load_tasks()] == ["New title"]
+    storage.insert_tasks([dict(task, id=2, title="Second")])
+    assert not (data_dir / "tasks.heap.new").exists()
+    assert [t["title"] for t in storage.load_tasks()] == ["New title", "Second"]
+
+
+def test_sharded_store_writes_only_the_project_shard(data_dir, monkeypatch):
+    """Tasks live in their project's shard; moves and reshards keep every task."""
+    tasks = [{"id": i, "project_id": i % 3, "title": f"Task {i}", "status": "todo", "assigned_to": None}
+             for i in range(1, 10)]
+    storage.save_tasks(tasks)
+    storage.migrate("json", "sharded")
+    monkeypatch.setattr(storage, "STORE", "sharded")
+    shards = data_dir / "tasks"
+    assert sorted(p.name for p in shards.glob("project-*.json")) == ["project-0.json", "project-1.json", "project-2.json"]
+
+    other = (shards / "project-2.json").read_bytes()
+    ids = (shards / "ids.idx").read_bytes()
+    before = storage.fingerprint("tasks")
+    storage.insert_tasks([{"id": 10, "project_id": 1, "title": "New", "status": "todo", "assigned_to": None}])
+    assert storage.fingerprint("tasks") != before
+    before = storage.fingerprint("tasks")
+    storage.update_tasks([dict(tasks[3], status="done")])
+    assert storage.fingerprint("tasks") != before
+    # New ids go to the log; neither the other shard nor the sorted id index is rewritten
+    assert (shards / "project-2.json").read_bytes() == other
+    assert (shards / "ids.idx").read_bytes() == ids
+    assert (shards / "ids.log").exists()
+    assert [t["id"] for t in storage.load_tasks(project_id=1)] == [1, 4, 7, 10]
+    assert storage.select("tasks", id=4)[0]["status"] == "done"
+    assert storage.max_id("tasks") == 10
+
+    monkeypatch.setattr(sharded_store, "LOG_ROWS", 2)
+    storage.update_tasks([dict(tasks[0], project_id=5)])
+    assert not (shards / "ids.log").exists()
+    assert [t["id"] for t in storage.load_tasks(project_id=5)] == [1]
+    assert storage.select("tasks", id=1)[0]["project_id"] == 5
+    assert storage.select("tasks", id=10)[0]["title"] == "New"
+
+    assert sharded_store.rebalance("hash", 2) == 2
+    assert sorted(t["id"] for t in storage.load_tasks()) == list(range(1, 11))
+    assert [t["id"] for t in storage.load_tasks(project_id=1)] == [4, 7, 10]
+    assert not (shards / "project-1.json").exists()
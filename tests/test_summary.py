@@ -0,0 +1,29 @@
+from utils import storage, summary
+
+
+def _task(id, project_id, status="todo", assigned_to=None):
+    return {"id": id, "project_id": project_id, "title": f"T{id}", "status": status, "assigned_to": assigned_to}
+
+
+def test_incremental_updates_match_a_rebuild(data_dir):
+    """add/complete keep the summary current; other writers make it stale."""
+    storage.save_tasks([_task(1, 1), _task(2, 1, "in-progress", 7), _task(3, 2, "done", 7)])
+    assert summary.get()["by_project"] == {"1": [1, 1, 0], "2": [0, 0, 1]}
+
+    rollup = summary.current()
+    storage.insert_tasks([_task(4, 2, assigned_to=7)])
+    summary.apply(rollup, added=[_task(4, 2, assigned_to=7)])
+    rollup = summary.current()
+    storage.update_tasks([_task(2, 1, "done", 7)])
+    summary.apply(rollup, changed=[(_task(2, 1, "in-progress", 7), _task(2, 1, "done", 7))])
+
+    incremental = summary.current()
+    assert incremental["by_assignee"] == {"0": [1, 0, 0], "7": [1, 0, 2]}
+    incremental.pop("fingerprint")
+    rebuilt = summary.build()
+    rebuilt.pop("fingerprint")
+    assert incremental == rebuilt
+
+    storage.insert_tasks([_task(5, 3)])
+    assert summary.current() is None
+    assert summary.get()["by_project"]["3"] == [1, 0, 0]
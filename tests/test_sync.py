@@ -0,0 +1,113 @@
+import fcntl
+import gzip
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import storage, sync
+
+
+@pytest.fixture
+def endpoint():
+    """Local stand-in for the tracker: records every batch it receives."""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            if self.server.on_post:
+                self.server.on_post()
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            received.append(json.loads(body))
+            status = 500 if self.server.fail else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.fail = False
+    server.on_post = None
+    server.received = received
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_export_sends_only_new_records_in_batches(data_dir, endpoint):
+    url = f"http://127.0.0.1:{endpoint.server_port}/ingest"
+    storage.save_users([{"id": 1, "name": "Alex", "email": None}])
+    storage.save_projects([{"id": 1, "user_id": 1, "title": "P", "description": None, "due_date": None}])
+    storage.save_tasks([{"id": i, "project_id": 1, "title": f"T{i}", "status": "todo", "assigned_to": None}
+                        for i in range(1, 26)])
+
+    counts = sync.export(url, batch_size=10, concurrency=3, compress=True)
+    assert (counts["users"], counts["projects"], counts["tasks"], counts["batches"]) == (1, 1, 25, 5)
+    tasks = [r["id"] for batch in endpoint.received if batch["entity"] == "tasks" for r in batch["records"]]
+    assert sorted(tasks) == list(range(1, 26))
+    assert sync.marks(url) == {"users": 1, "projects": 1, "tasks": 25}
+
+    endpoint.received.clear()
+    assert sync.export(url, batch_size=10)["batches"] == 0
+    storage.insert_tasks([{"id": 26, "project_id": 1, "title": "New", "status": "todo", "assigned_to": None}])
+    endpoint.fail = True
+    with pytest.raises(sync.SyncError):
+        sync.export(url, batch_size=10)
+    assert sync.marks(url)["tasks"] == 25
+
+    endpoint.fail = False
+    endpoint.received.clear()
+    assert sync.export(url, batch_size=10)["tasks"] == 1
+    assert endpoint.received == [{"entity": "tasks", "records": [
+        {"id": 26, "project_id": 1, "title": "New", "status": "todo", "assigned_to": None}]}]
+
+
+def test_storage_is_unlocked_while_batches_are_sent(data_dir, endpoint):
+    """A writer could take the lock while the endpoint is busy with a batch."""
+    url = f"http://127.0.0.1:{endpoint.server_port}/ingest"
+    storage.save_tasks([{"id": i, "project_id": 1, "title": f"T{i}", "status": "todo", "assigned_to": None}
+                        for i in range(1, 41)])
+    free = []
+
+    def try_lock():
+        with (data_dir / storage.LOCK_NAME).open("a+b") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                free.append(False)
+            else:
+                free.append(True)
+
+    endpoint.on_post = try_lock
+    assert sync.export(url, batch_size=2, concurrency=1)["tasks"] == 40
+    assert free == [True] * 20
+
+
+def test_truncated_status_line_is_reported_as_a_malformed_response(data_dir):
+    """An endpoint answering half a status line fails the export with SyncError, not IndexError."""
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def answer():
+        conn, _ = listener.accept()
+        with conn:
+            conn.recv(65536)
+            conn.sendall(b"HTTP/1.1\r\n\r\n")
+
+    threading.Thread(target=answer, daemon=True).start()
+    url = f"http://127.0.0.1:{listener.getsockname()[1]}/ingest"
+    storage.save_users([{"id": 1, "name": "Alex", "email": None}])
+    try:
+        with pytest.raises(sync.SyncError, match="malformed response"):
+            sync.export(url, batch_size=10)
+    finally:
+        listener.close()
+    assert "users" not in sync.marks(url)
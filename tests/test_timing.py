@@ -0,0 +1,24 @@
+import json
+
+from utils import storage, timing
+
+
+def test_timings_are_exclusive_and_traced(data_dir, monkeypatch, capsys):
+    """Phases record byte/record counts; a trace line is appended per invocation."""
+    trace = data_dir / "trace.jsonl"
+    monkeypatch.setattr(timing, "TRACE_FILE", str(trace))
+    storage.save_tasks([{"id": i, "project_id": 1, "title": "T", "status": "todo", "assigned_to": None}
+                        for i in range(1, 4)])
+
+    timing.enable()
+    with timing.phase("outer"):
+        assert len(list(storage.stream("tasks"))) == 3
+        assert len(storage._read_json(data_dir / "tasks.json")) == 3
+    timing.finish(["list-tasks"], "list-tasks", show=True)
+
+    phases = json.loads(trace.read_text())["phases"]
+    assert phases["storage.stream"]["records"] == 3
+    assert phases["storage.read_json"]["bytes"] == (data_dir / "tasks.json").stat().st_size
+    assert phases["outer"]["calls"] == 1 and phases["outer"]["records"] == 0
+    assert "storage.read_json" in capsys.readouterr().err
+    assert not timing.ENABLED
@@ -0,0 +1,374 @@
+"""
+Binary backend: per entity a file of fixed-width rows plus a string heap.
+
+- <entity>.rows  header (magic, heap generation, ids-ascending flag), then one
+                 little-endian row per record in field order: int64 for ids and
+                 foreign keys (NULL_INT = None), one byte for a task's status
+                 (position in Task.STATUSES) and (int64 offset, int32 length)
+                 into the heap for strings (length -1 = None)
+- <entity>.heap  header (magic, generation), then UTF-8 string bytes
+
+A full save writes the new heap as <entity>.heap.new, renames the new row
+file into place (the commit point) and only then moves the heap over the old
+one; a heap.new whose generation matches the row file is the heap to use if
+a save stopped between the two renames.
+
+Reads memory-map both files and decode rows only when needed: filters on id
+and foreign-key columns look at those 8 bytes alone. Inserts append to both
+files in place and updates patch just the fields that changed, so completing
+a task writes a single byte. Changed strings are appended to the heap;
+`compact` rewrites both files without the dead bytes.
+
+Only the fields below are stored and records without an integer id are
+skipped, as in the SQLite store. Unknown task statuses are stored as 'todo',
+which is how Task.from_dict reads them anyway.
+"""
+from __future__ import annotations
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from models.task import Task
+from utils import storage
+
+ROWS_HEADER = struct.Struct("<8s8sB7x")
+HEAP_HEADER = struct.Struct("<8s8s")
+ROWS_MAGIC = b"PCLIROWS"
+HEAP_MAGIC = b"PCLIHEAP"
+SORTED_FLAG_OFFSET = 16
+NULL_INT = -2**63
+
+SCHEMA = {
+    "users": (("id", "int"), ("name", "str"), ("email", "str")),
+    "projects": (("id", "int"), ("title", "str"), ("description", "str"), ("due_date", "str"), ("user_id", "int")),
+    "tasks": (("id", "int"), ("project_id", "int"), ("title", "str"), ("status", "status"), ("assigned_to", "int")),
+}
+_CODES = {"int": "q", "str": "qi", "status": "b"}
+_FIELD_STRUCTS = {kind: struct.Struct("<" + code) for kind, code in _CODES.items()}
+_STATUS_CODES = {s: i for i, s in enumerate(Task.STATUSES)}
+
+def _layout(entity: str) -> tuple[struct.Struct, dict[str, tuple[int, str]]]:
+    """Row struct and field name -> (byte offset in the row, kind)."""
+    fields, pos = {}, 0
+    for name, kind in SCHEMA[entity]:
+        fields[name] = (pos, kind)
+        pos += _FIELD_STRUCTS[kind].size
+    return struct.Struct("<" + "".join(_CODES[kind] for _, kind in SCHEMA[entity])), fields
+
+LAYOUTS = {entity: _layout(entity) for entity in SCHEMA}
+
+def _paths(entity: str) -> tuple[Path, Path]:
+    path = storage._path(entity)
+    return path.with_suffix(".rows"), path.with_suffix(".heap")
+
+def _new_heap(entity: str) -> Path:
+    heap_path = _paths(entity)[1]
+    return heap_path.with_name(heap_path.name + ".new")
+
+def files(entity: str) -> list[Path]:
+    """Row file and string heap (plus the new heap of an interrupted save)."""
+    new_heap = _new_heap(entity)
+    return [*_paths(entity), *([new_heap] if new_heap.exists() else [])]
+
+def _generation(path: Path, header: struct.Struct) -> bytes | None:
+    try:
+        with path.open("rb") as f:
+            data = f.read(header.size)
+    except FileNotFoundError:
+        return None
+    return header.unpack(data)[1] if len(data) == header.size else None
+
+def _heap_path(entity: str) -> Path:
+    """The heap that belongs to the row file."""
+    rows_path, heap_path = _paths(entity)
+    new_heap = _new_heap(entity)
+    if new_heap.exists() and _generation(new_heap, HEAP_HEADER) == _generation(rows_path, ROWS_HEADER):
+        return new_heap
+    return heap_path
+
+def _settle(entity: str) -> None:
+    """Finish the heap rename of an interrupted save, or drop a heap.new it never committed."""
+    new_heap = _new_heap(entity)
+    if new_heap.exists():
+        if _heap_path(entity) == new_heap:
+            os.replace(new_heap, _paths(entity)[1])
+        else:
+            new_heap.unlink()
+
+def _int(value: Any) -> int:
+    if value is None or isinstance(value, bool):
+        return NULL_INT
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return NULL_INT
+    return value if NULL_INT < value < 2**63 else NULL_INT
+
+def _field_values(kind: str, value: Any, heap: bytearray, heap_end: int) -> tuple:
+    """Packed-struct values of one field; strings are added to `heap`."""
+    if kind == "int":
+        return (_int(value),)
+    if kind == "status":
+        return (_STATUS_CODES.get(value, 0),)
+    if value is None:
+        return (0, -1)
+    data = str(value).encode("utf-8")
+    offset = heap_end + len(heap)
+    heap += data
+    return (offset, len(data))
+
+def _normal(kind: str, value: Any) -> Any:
+    """The value a field reads back as after storing `value`."""
+    if kind == "int":
+        value = _int(value)
+        return None if value == NULL_INT else value
+    if kind == "status":
+        return Task.normalize_status(value)
+    return None if value is None else str(value)
+
+def _encode(entity: str, record: dict, heap: bytearray, heap_end: int) -> tuple | None:
+    """Row values of a record (None if it has no usable id)."""
+    rid = record.get("id") if isinstance(record, dict) else None
+    if not isinstance(rid, int) or isinstance(rid, bool) or _int(rid) == NULL_INT:
+        return None
+    values: list = []
+    for name, kind in SCHEMA[entity]:
+        values += _field_values(kind, record.get(name), heap, heap_end)
+    return tuple(values)
+
+def _decode(entity: str, values: tuple, heap: Any) -> dict:
+    record, i = {}, 0
+    for name, kind in SCHEMA[entity]:
+        if kind == "str":
+            offset, length = values[i], values[i + 1]
+            record[name] = None if length < 0 else heap[offset:offset + length].decode("utf-8")
+            i += 2
+        elif kind == "status":
+            record[name] = Task.STATUSES[values[i]]
+            i += 1
+        else:
+            record[name] = None if values[i] == NULL_INT else values[i]
+            i += 1
+    return record
+
+@contextmanager
+def _open(entity: str) -> Iterator[tuple[Any, Any, int, bool]]:
+    """(rows, heap, row count, ids ascending) mapped read-only; empty if not stored yet."""
+    rows_path = _paths(entity)[0]
+    if not rows_path.exists() or rows_path.stat().st_size <= ROWS_HEADER.size:
+        yield b"", b"", 0, True
+        return
+    with rows_path.open("rb") as rf, _heap_path(entity).open("rb") as hf:
+        rows = mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ)
+        heap = mmap.mmap(hf.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            ascending = _check_headers(entity, rows[:ROWS_HEADER.size], heap[:HEAP_HEADER.size])
+            count = (len(rows) - ROWS_HEADER.size) // LAYOUTS[entity][0].size
+            yield rows, heap, count, ascending
+        finally:
+            rows.close()
+            heap.close()
+
+def _check_headers(entity: str, rows_header: bytes, heap_header: bytes) -> bool:
+    """Validate both headers; returns the ids-ascending flag."""
+    magic, generation, ascending = ROWS_HEADER.unpack(rows_header)
+    heap_magic, heap_generation = HEAP_HEADER.unpack(heap_header)
+    if magic != ROWS_MAGIC or heap_magic != HEAP_MAGIC:
+        raise ValueError(f"{entity}: not a project-cli binary file")
+    if generation != heap_generation:
+        rows_name, heap_name = (p.name for p in _paths(entity))
+        raise storage.UnreadableFileError(f"{entity}: {rows_name} and {heap_name} come from different saves; copy both "
+                         f"back from the same backup, or delete them and rebuild the data from another "
+                         f"store with 'migrate --from <store> --to binary'")
+    return bool(ascending)
+
+def _row_offset(i: int, size: int) -> int:
+    return ROWS_HEADER.size + i * size
+
+def load(entity: str) -> list[dict]:
+    return list(stream(entity))
+
+def stream(entity: str, **where: int) -> Iterator[dict]:
+    """Decode rows one by one; int-column filters skip rows without decoding them."""
+    layout, fields = LAYOUTS[entity]
+    size = layout.size
+    fixed = [(fields[k][0], v) for k, v in where.items() if fields.get(k, (0, ""))[1] == "int"]
+    other = {k: v for k, v in where.items() if fields.get(k, (0, ""))[1] != "int"}
+    unpack_int = _FIELD_STRUCTS["int"].unpack_from
+    with _open(entity) as (rows, heap, count, ascending):
+        if isinstance(where.get("id"), int):
+            # Look the row up instead of scanning
+            found = _positions(rows, count, size, ascending, [where["id"]])
+            candidates: Iterable[int] = found.values()
+        elif not fixed:
+            body = rows[ROWS_HEADER.size:_row_offset(count, size)]
+            for values in layout.iter_unpack(body):
+                record = _decode(entity, values, heap)
+                if all(record.get(k) == v for k, v in other.items()):
+                    yield record
+            return
+        else:
+            candidates = range(count)
+        for i in candidates:
+            base = _row_offset(i, size)
+            if any(unpack_int(rows, base + offset)[0] != value for offset, value in fixed):
+                continue
+            record = _decode(entity, layout.unpack_from(rows, base), heap)
+            if all(record.get(k) == v for k, v in other.items()):
+                yield record
+
+def select(entity: str, **where: int) -> list[dict]:
+    return list(stream(entity, **where))
+
+def lookup(entity: str, key: str) -> dict | None:
+    """Compare only the name/title column until a row matches."""
+    layout, fields = LAYOUTS[entity]
+    offset, _ = fields["name" if entity == "users" else "title"]
+    ref = _FIELD_STRUCTS["str"]
+    with _open(entity) as (rows, heap, count, _):
+        for i in range(count):
+            base = _row_offset(i, layout.size)
+            start, length = ref.unpack_from(rows, base + offset)
+            if length >= 0 and storage._name_key(heap[start:start + length].decode("utf-8")) == key:
+                return _decode(entity, layout.unpack_from(rows, base), heap)
+    return None
+
+def max_id(entity: str) -> int:
+    layout, _ = LAYOUTS[entity]
+    unpack_int = _FIELD_STRUCTS["int"].unpack_from
+    with _open(entity) as (rows, _heap, count, ascending):
+        if not count:
+            return 0
+        if ascending:
+            return unpack_int(rows, _row_offset(count - 1, layout.size))[0]
+        return max(unpack_int(rows, _row_offset(i, layout.size))[0] for i in range(count))
+
+def save(entity: str, records: list[dict]) -> None:
+    """Rewrite both files: new heap, then rows, then heap rename (a shared generation tag pairs them)."""
+    layout, _ = LAYOUTS[entity]
+    heap, body, ids = bytearray(), bytearray(), []
+    for r in records:
+        values = _encode(entity, r, heap, HEAP_HEADER.size)
+        if values is not None:
+            body += layout.pack(*values)
+            ids.append(values[0])
+    generation = os.urandom(8)
+    ascending = all(a < b for a, b in zip(ids, ids[1:]))
+    rows_path, heap_path = _paths(entity)
+    new_heap = _new_heap(entity)
+    # The old heap stays in place until the new rows have replaced the old ones
+    with storage._atomic_file(new_heap) as f:
+        f.write(HEAP_HEADER.pack(HEAP_MAGIC, generation))
+        f.write(heap)
+    with storage._atomic_file(rows_path) as f:
+        f.write(ROWS_HEADER.pack(ROWS_MAGIC, generation, ascending))
+        f.write(body)
+    os.replace(new_heap, heap_path)
+
+def insert(entity: str, records: list[dict]) -> None:
+    """Append strings to the heap, then rows to the row file."""
+    rows_path, heap_path = _paths(entity)
+    _settle(entity)
+    if not rows_path.exists() or not heap_path.exists():
+        save(entity, records)
+        return
+    layout, _ = LAYOUTS[entity]
+    with rows_path.open("r+b") as rf, heap_path.open("r+b") as hf:
+        ascending = _check_headers(entity, rf.read(ROWS_HEADER.size), hf.read(HEAP_HEADER.size))
+        count = (rf.seek(0, 2) - ROWS_HEADER.size) // layout.size
+        last_id = None
+        if count:
+            rf.seek(_row_offset(count - 1, layout.size))
+            last_id = _FIELD_STRUCTS["int"].unpack(rf.read(8))[0]
+        heap, body = bytearray(), bytearray()
+        heap_end = hf.seek(0, 2)
+        for r in records:
+            values = _encode(entity, r, heap, heap_end)
+            if values is None:
+                continue
+            if last_id is not None and values[0] <= last_id:
+                ascending = False
+            last_id = values[0]
+            body += layout.pack(*values)
+
+        # Strings first: if we stop half way, unreferenced heap bytes are harmless
+        hf.write(heap)
+        hf.flush()
+        os.fsync(hf.fileno())
+        # Drop any partial row an interrupted append left behind
+        end = _row_offset(count, layout.size)
+        rf.truncate(end)
+        rf.seek(end)
+        rf.write(body)
+        if not ascending:
+            rf.seek(SORTED_FLAG_OFFSET)
+            rf.write(b"\0")
+        rf.flush()
+        os.fsync(rf.fileno())
+
+def _positions(rows: Any, count: int, size: int, ascending: bool, ids: list[int]) -> dict[int, int]:
+    """id -> row position for the given ids (binary search when ids are ascending)."""
+    unpack_int = _FIELD_STRUCTS["int"].unpack_from
+    if not ascending:
+        wanted = set(ids)
+        found = {}
+        for i in range(count):
+            rid = unpack_int(rows, _row_offset(i, size))[0]
+            if rid in wanted:
+                found.setdefault(rid, i)
+        return found
+    found = {}
+    for rid in ids:
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if unpack_int(rows, _row_offset(mid, size))[0] < rid:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < count and unpack_int(rows, _row_offset(lo, size))[0] == rid:
+            found[rid] = lo
+    return found
+
+def update(entity: str, records: list[dict]) -> None:
+    """Patch the changed fields of each row in place (ids that aren't stored are ignored)."""
+    layout, fields = LAYOUTS[entity]
+    rows_path, heap_path = _paths(entity)
+    by_id = {r["id"]: r for r in records if isinstance(r.get("id"), int)}
+    patches: list[tuple[int, bytes]] = []
+    heap = bytearray()
+    with _open(entity) as (rows, old_heap, count, ascending):
+        if not count:
+            return
+        heap_end = len(old_heap)
+        for rid, pos in _positions(rows, count, layout.size, ascending, list(by_id)).items():
+            base = _row_offset(pos, layout.size)
+            old = _decode(entity, layout.unpack_from(rows, base), old_heap)
+            new = by_id[rid]
+            for name, (offset, kind) in fields.items():
+                if name == "id" or old[name] == _normal(kind, new.get(name)):
+                    continue
+                values = _field_values(kind, new.get(name), heap, heap_end)
+                patches.append((base + offset, _FIELD_STRUCTS[kind].pack(*values)))
+    if not patches:
+        return
+    _settle(entity)
+    with rows_path.open("r+b") as rf, heap_path.open("r+b") as hf:
+        if heap:
+            hf.seek(0, 2)
+            hf.write(heap)
+            hf.flush()
+            os.fsync(hf.fileno())
+        for offset, data in patches:
+            rf.seek(offset)
+            rf.write(data)
+        rf.flush()
+        os.fsync(rf.fileno())
+
+def compact(entity: str) -> None:
+    """Rewrite both files, dropping heap bytes no row refers to anymore."""
+    if _paths(entity)[0].exists():
+        save(entity, load(entity))
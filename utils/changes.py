@@ -0,0 +1,153 @@
+"""
+Change feed: every storage.insert()/update() appends one JSON line per record
+to data/changes.log, inside the write's transaction:
+
+    {"seq": 42, "time": "2026-10-17T09:30:00Z", "event": "task_completed", "record": {...}}
+
+Events are <entity>_added for inserts, and <entity>_updated for updates
+except tasks set to done, which are task_completed. Sequence numbers
+increase by one per event, so a consumer that remembers the last one it
+processed can resume with `watch --since N` instead of re-reading the data.
+Whole-file replacements (save, migrate) are not events. Writes deferred by
+`batch` are logged when they are flushed, in the order they were made.
+
+Past MAX_BYTES the oldest half of the log is dropped; `watch` warns when
+the events a consumer asks for are gone.
+"""
+from __future__ import annotations
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+from utils import storage
+
+MAX_BYTES = int(os.environ.get("PROJECT_CLI_CHANGES_BYTES", 64 * 1024 * 1024))
+
+SINGULAR = {"users": "user", "projects": "project", "tasks": "task"}
+
+def log_path() -> Path:
+    return storage.DATA_DIR / "changes.log"
+
+def _event(entity: str, kind: str, record: dict) -> str:
+    if kind == "insert":
+        return f"{SINGULAR[entity]}_added"
+    if entity == "tasks" and record.get("status") == "done":
+        return "task_completed"
+    return f"{SINGULAR[entity]}_updated"
+
+def last_seq() -> int:
+    """Sequence number of the newest event (0 for an empty log)."""
+    try:
+        f = log_path().open("rb")
+    except FileNotFoundError:
+        return 0
+    with f:
+        end = f.seek(0, 2)
+        tail = b""
+        # Read backwards a block at a time until a whole line parses (events can be large)
+        while end > 0:
+            start = max(0, end - 65536)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            end = start
+            lines = tail.split(b"\n")
+            # Unless the file start was reached, the first line may be cut off
+            for line in reversed(lines if start == 0 else lines[1:]):
+                try:
+                    return int(json.loads(line)["seq"])
+                except (ValueError, KeyError, TypeError):
+                    # Blank, or a torn line from an interrupted append
+                    continue
+            # Keep only the possibly cut-off first line for the next round
+            tail = lines[0]
+    return 0
+
+def record(writes: list[tuple[str, str, list[dict]]]) -> None:
+    """
+    Append one event per record of (entity, 'insert'|'update', records)
+    writes, in order; the caller holds the storage transaction.
+    """
+    seq = last_seq()
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    lines = []
+    for entity, kind, records in writes:
+        for r in records:
+            seq += 1
+            lines.append(json.dumps({"seq": seq, "time": stamp, "event": _event(entity, kind, r), "record": r},
+                                    ensure_ascii=False))
+    if not lines:
+        return
+    path = log_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as f:
+        # Start on a fresh line if an earlier append was cut short
+        if f.tell() and not _ends_with_newline(path):
+            f.write(b"\n")
+        f.write(("\n".join(lines) + "\n").encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    if size > MAX_BYTES:
+        _trim(path, size)
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as f:
+        f.seek(-1, 2)
+        return f.read(1) == b"\n"
+
+def _trim(path: Path, size: int) -> None:
+    """Keep roughly the newest half of the log, starting at a line boundary."""
+    with path.open("rb") as f:
+        f.seek(size // 2)
+        f.readline()
+        kept = f.read()
+    with storage._atomic_file(path) as f:
+        f.write(kept)
+
+def read(since: int = 0, position: int = 0) -> tuple[list[dict], int]:
+    """Events with seq > since starting at byte position; returns them and where to read next."""
+    events = []
+    try:
+        with log_path().open("rb") as f:
+            f.seek(position)
+            for line in iter(f.readline, b""):
+                if not line.endswith(b"\n"):
+                    # Still being written: pick it up on the next read
+                    break
+                position += len(line)
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get("seq", 0) > since:
+                    events.append(event)
+    except FileNotFoundError:
+        return [], 0
+    return events, position
+
+def follow(since: int | None, interval: float = 0.5) -> Iterator[dict]:
+    """Events after since (None: after the newest one now), waiting for new ones forever."""
+    path = log_path()
+    if since is None:
+        since = last_seq()
+    position, inode = 0, None
+    while True:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            st = None
+        if st is not None and (st.st_ino != inode or st.st_size < position):
+            # New or trimmed log: start over, relying on seq to skip what was sent
+            position, inode = 0, st.st_ino
+        if st is not None and st.st_size > position:
+            start = position
+            events, position = read(since, position)
+            for event in events:
+                since = event["seq"]
+                yield event
+            if events or position != start:
+                continue
+            # Only a partly written line past position: wait for the rest of it
+        time.sleep(interval)
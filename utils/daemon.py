@@ -0,0 +1,136 @@
+"""
+Long-running server mode: `project-cli serve` keeps the data and its
+name/id indexes in memory (storage.enable_memory_cache) and runs the normal
+subcommands for clients connecting over a Unix domain socket.
+
+Protocol: the client sends one JSON line {"argv": [...], "settings": {...}}
+and reads back one JSON line {"code": int, "stdout": str, "stderr": str}.
+"settings" carries what the client's environment selects (store, workers,
+plain output, trace file); the server applies them for that request only. A
+client whose data folder is not the server's gets {"local": true} back and
+runs the command itself. Many clients can be connected at once; commands
+themselves run one at a time because they share the in-memory state.
+"""
+from __future__ import annotations
+import io
+import json
+import os
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Callable
+
+from utils import printing, storage, timing
+
+# Commands that need the caller's own stdin, cwd or terminal, or talk to the network
+# for a long time, so they always run locally
+LOCAL_COMMANDS = {"serve", "import", "batch", "export", "sync", "watch"}
+
+def socket_path() -> Path:
+    """$PROJECT_CLI_SOCKET, or a socket file inside the data folder."""
+    return Path(os.environ.get("PROJECT_CLI_SOCKET", storage.DATA_DIR / ".project-cli.sock"))
+
+def settings() -> dict:
+    """The settings this process took from its environment, as sent to the server."""
+    return {
+        "data_dir": str(storage.DATA_DIR.resolve()),
+        "store": storage.STORE,
+        "workers": storage.WORKERS,
+        "plain": printing.PLAIN,
+        "trace": os.path.abspath(timing.TRACE_FILE) if timing.TRACE_FILE else None,
+    }
+
+def run_command(entry: Callable[[list[str]], int], argv: list[str],
+                client: dict | None = None) -> dict:
+    """
+    Run one CLI invocation in this process and capture what it prints.
+    client holds the caller's settings(); they replace the server's own for
+    this invocation.
+    """
+    out, err = io.StringIO(), io.StringIO()
+    store, workers, plain = storage.STORE, storage.WORKERS, printing.PLAIN
+    trace = timing.TRACE_FILE
+    try:
+        if client is not None:
+            storage.STORE = str(client["store"])
+            storage.WORKERS = int(client["workers"])
+            printing.PLAIN = bool(client["plain"])
+            timing.TRACE_FILE = client["trace"]
+        with redirect_stdout(out), redirect_stderr(err):
+            code = entry(argv)
+    except SystemExit as exc:
+        # argparse errors and --help
+        code = exc.code if isinstance(exc.code, int) else 1
+    except Exception as exc:
+        err.write(f"ERROR: {exc}\n")
+        code = 1
+    finally:
+        # Global flags and client settings only apply to the request that passed them
+        storage.STORE, storage.WORKERS, printing.PLAIN = store, workers, plain
+        timing.TRACE_FILE = trace
+    return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+def serve(path: Path, entry: Callable[[list[str]], int]) -> None:
+    """Accept clients until interrupted; each request runs entry(argv)."""
+    import asyncio
+
+    async def main_loop() -> None:
+        lock = asyncio.Lock()
+        own_data_dir = str(storage.DATA_DIR.resolve())
+        loop = asyncio.get_running_loop()
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                request = json.loads(await reader.readline())
+                argv = [str(a) for a in request["argv"]]
+                client = request.get("settings")
+                local = client is not None and client["data_dir"] != own_data_dir
+            except (ValueError, KeyError, TypeError, AttributeError):
+                response = {"code": 2, "stdout": "", "stderr": "ERROR: bad request\n"}
+            else:
+                if local:
+                    response = {"local": True}
+                else:
+                    async with lock:
+                        # Run off the event loop so other clients can still connect
+                        response = await loop.run_in_executor(None, run_command, entry, argv, client)
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_unix_server(handle, path=str(path))
+        async with server:
+            await server.serve_forever()
+
+    storage.enable_memory_cache()
+    path.unlink(missing_ok=True)
+    try:
+        asyncio.run(main_loop())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        path.unlink(missing_ok=True)
+
+def forward(argv: list[str]) -> dict | None:
+    """
+    Send argv and this process's settings() to a running server. Returns its
+    response, or None when no server is listening or it serves another data
+    folder (the caller then runs the command itself).
+    """
+    if os.environ.get("PROJECT_CLI_NO_DAEMON"):
+        return None
+    path = socket_path()
+    if not path.exists():
+        return None
+    import socket
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+            sock.sendall(json.dumps({"argv": argv, "settings": settings()}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:
+        return None
+    response = json.loads(line) if line else None
+    if response is None or response.get("local"):
+        return None
+    return response
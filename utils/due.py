@@ -0,0 +1,155 @@
+"""
+Due-date analytics for `project-cli due`, vectorized with NumPy (optional
+dependency: pip install numpy).
+
+Project ids, owners and due dates are loaded once into int64 arrays (dates
+as days since 1970-01-01) and kept in data/<store>.due.npz together with the
+fingerprint of the project files, like the report summary; the next run only
+re-reads projects when they changed. Due dates are parsed in bulk: the
+strings are compared as fixed-width YYYY-MM-DD code points and turned into
+day numbers with array arithmetic, so impossible dates (2025-02-30) are
+caught along with malformed ones and reported together.
+
+Queries (overdue, due within N days, per-owner histograms) are masks and
+bincounts over those arrays.
+"""
+from __future__ import annotations
+import json
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the due command needs it
+    np = None
+
+from utils import storage, timing
+
+# Day numbers that are not dates
+NO_DATE = -(2**63)
+INVALID = NO_DATE + 1
+
+OVERDUE, DUE_SOON, LATER, UNDATED, UNREADABLE = range(5)
+BUCKETS = ("overdue", "due soon", "later", "no date", "invalid")
+
+def available() -> bool:
+    return np is not None
+
+def _path() -> Path:
+    return storage.DATA_DIR / f"{storage.STORE}.due.npz"
+
+def _fingerprint() -> str:
+    return json.dumps(storage.fingerprint("projects"))
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _days_from_civil(year, month, day):
+    """Days since 1970-01-01 of (proleptic Gregorian) dates given as int arrays."""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+def parse_dates(values: list) -> "np.ndarray":
+    """Day numbers for ISO dates; NO_DATE for None/"", INVALID for anything else."""
+    n = len(values)
+    # 11 code points: a longer string keeps a non-zero 11th one and fails the length check.
+    # Non-string values become "?", which fails it too.
+    text = np.array([v if isinstance(v, str) else "" if v is None else "?" for v in values], dtype="U11")
+    codes = text.view(np.uint32).reshape(n, 11)
+    days = np.full(n, INVALID, dtype=np.int64)
+    days[codes[:, 0] == 0] = NO_DATE
+
+    digits = codes[:, [0, 1, 2, 3, 5, 6, 8, 9]].astype(np.int64) - ord("0")
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    valid &= (codes[:, 4] == ord("-")) & (codes[:, 7] == ord("-")) & (codes[:, 10] == 0)
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    valid &= (month >= 1) & (month <= 12)
+
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_length = np.array(_DAYS_IN_MONTH)[np.clip(month, 1, 12) - 1] + (leap & (month == 2))
+    valid &= (day >= 1) & (day <= month_length)
+    days[valid] = _days_from_civil(year[valid], month[valid], day[valid])
+    return days
+
+def build() -> dict[str, "np.ndarray"]:
+    """Load project columns in one pass and store them."""
+    ids, owners, raw = [], [], []
+    with timing.phase("due.load") as counts:
+        for p in storage.stream("projects"):
+            ids.append(p.get("id") if isinstance(p.get("id"), int) else -1)
+            owner = p.get("user_id")
+            owners.append(owner if isinstance(owner, int) and owner > 0 else 0)
+            raw.append(p.get("due_date"))
+        days = parse_dates(raw)
+        bad = np.flatnonzero(days == INVALID)
+        columns = {
+            "id": np.array(ids, dtype=np.int64),
+            "owner": np.array(owners, dtype=np.int64),
+            "day": days,
+            "invalid_value": np.array([str(raw[i]) for i in bad], dtype=str),
+        }
+        with storage._atomic_file(_path(), durable=False) as f:
+            np.savez(f, fingerprint=np.array(_fingerprint()), **columns)
+        counts["records"] = len(ids)
+    return columns
+
+def columns() -> dict[str, "np.ndarray"]:
+    """Stored columns if they still match the project data, else freshly built ones."""
+    try:
+        with np.load(_path()) as stored:
+            if str(stored["fingerprint"]) == _fingerprint():
+                return {name: stored[name] for name in ("id", "owner", "day", "invalid_value")}
+    except (FileNotFoundError, ValueError, KeyError, OSError):
+        pass
+    return build()
+
+def day_number(iso: str) -> int:
+    return int(np.datetime64(iso, "D").astype(np.int64))
+
+def iso(day: int) -> str:
+    return str(np.datetime64(int(day), "D"))
+
+def buckets(cols: dict, today: int, within: int) -> "np.ndarray":
+    """Bucket of every project (OVERDUE, DUE_SOON, ...) as of day number today."""
+    day = cols["day"]
+    dated = day > INVALID
+    out = np.full(len(day), LATER, dtype=np.int64)
+    out[dated & (day < today)] = OVERDUE
+    out[dated & (day >= today) & (day <= today + within)] = DUE_SOON
+    out[day == NO_DATE] = UNDATED
+    out[day == INVALID] = UNREADABLE
+    return out
+
+def by_owner(cols: dict, today: int, within: int) -> tuple["np.ndarray", "np.ndarray"]:
+    """(owner ids, counts per owner and bucket) - one row of len(BUCKETS) counts per owner."""
+    with timing.phase("due.histogram") as counts:
+        owner = cols["owner"]
+        top = int(owner.max()) + 1 if len(owner) else 0
+        if top <= 4 * len(owner) + 1024:
+            # User ids are dense, so count straight into an owner-id-indexed table
+            flat = np.bincount(owner * len(BUCKETS) + buckets(cols, today, within), minlength=top * len(BUCKETS))
+            table = flat.reshape(top, len(BUCKETS))
+            owners = np.flatnonzero(table.any(axis=1))
+            result = owners, table[owners]
+        else:
+            owners, owner_index = np.unique(owner, return_inverse=True)
+            flat = np.bincount(owner_index * len(BUCKETS) + buckets(cols, today, within),
+                               minlength=len(owners) * len(BUCKETS))
+            result = owners, flat.reshape(len(owners), len(BUCKETS))
+        counts["records"] = len(owner)
+    return result
+
+def matching(cols: dict, today: int, within: int, bucket: int) -> "np.ndarray":
+    """Positions of projects in bucket, earliest due date first (ties by id)."""
+    found = np.flatnonzero(buckets(cols, today, within) == bucket)
+    order = np.lexsort((cols["id"][found], cols["day"][found]))
+    return found[order]
+
+def invalid(cols: dict) -> list[tuple[int, str]]:
+    """(project id, stored value) of every unreadable due date."""
+    ids = cols["id"][cols["day"] == INVALID]
+    return list(zip(ids.tolist(), cols["invalid_value"].tolist()))
@@ -0,0 +1,109 @@
+"""
+Ordering for `list-tasks`/`list-projects --sort-by`, within a memory budget.
+
+- top() keeps the first K items in a heap (heapq.nsmallest): one pass over
+  the input, K items in memory however large it is.
+- sort() collects items until their estimated size passes MEMORY_BYTES,
+  sorts that run and pickles it, in blocks, to an anonymous temporary file,
+  then merges the runs lazily with heapq.merge while rows are printed.
+  The merge holds one block of each run; blocks are sized so FAN_IN of
+  them take half the budget, and every FAN_IN runs of the same size are
+  merged into one as they pile up. Input that fits in the budget is
+  sorted in memory and never touches disk.
+
+Both are stable: items with equal keys keep their input order.
+"""
+from __future__ import annotations
+import heapq
+import itertools
+import os
+import pickle
+import sys
+import tempfile
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+
+from utils import timing
+
+MEMORY_BYTES = int(os.environ.get("PROJECT_CLI_SORT_MEMORY", 64 * 1024 * 1024))
+# Runs merged at once
+FAN_IN = 64
+# Measuring every item would cost more than sorting; one in SAMPLE stands for its neighbours
+SAMPLE = 16
+
+def _size(item: Any) -> int:
+    """Rough in-memory size of an item, counting what lists and tuples hold."""
+    size = sys.getsizeof(item)
+    if isinstance(item, (list, tuple)):
+        size += sum(_size(value) for value in item)
+    return size
+
+def top(items: Iterable, k: int, key: Callable[[Any], Any]) -> list:
+    """The k first items in key order."""
+    with timing.phase("sort.top") as counts:
+        found = heapq.nsmallest(k, items, key=key)
+        counts["records"] = len(found)
+    return found
+
+def _spill(items: Iterable, block: int, counts: dict) -> BinaryIO:
+    """Pickle sorted items, block by block, to a temporary file that is deleted when closed."""
+    f = tempfile.TemporaryFile()
+    it = iter(items)
+    while chunk := list(itertools.islice(it, block)):
+        pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+    counts["bytes"] = counts.get("bytes", 0) + f.tell()
+    return f
+
+def _read(f: BinaryIO) -> Iterator:
+    f.seek(0)
+    while True:
+        try:
+            block = pickle.load(f)
+        except EOFError:
+            return
+        yield from block
+
+def _merge_runs(group: list[BinaryIO], key: Callable[[Any], Any], block: int, counts: dict) -> BinaryIO:
+    merged = _spill(heapq.merge(*map(_read, group), key=key), block, counts)
+    for f in group:
+        f.close()
+    return merged
+
+def _merge_tail(runs: list[tuple[int, BinaryIO]], key: Callable[[Any], Any], block: int, counts: dict) -> None:
+    """Merge the last FAN_IN runs into one a level up (neighbours, so earlier input still wins ties)."""
+    group = runs[-FAN_IN:]
+    del runs[-FAN_IN:]
+    runs.append((group[0][0] + 1, _merge_runs([f for _, f in group], key, block, counts)))
+
+def sort(items: Iterable, key: Callable[[Any], Any], budget: int | None = None) -> Iterator:
+    """Items in key order, spilling sorted runs to disk past budget bytes (default MEMORY_BYTES)."""
+    budget = MEMORY_BYTES if budget is None else budget
+    # (level, file): a level n run merges FAN_IN ** n spilled ones
+    runs: list[tuple[int, BinaryIO]] = []
+    run: list = []
+    used = block = 0
+    try:
+        with timing.phase("sort.runs") as counts:
+            for item in items:
+                run.append(item)
+                if len(run) % SAMPLE == 1:
+                    used += _size(item) * SAMPLE
+                if used >= budget:
+                    run.sort(key=key)
+                    # Items per block, so that a block is about budget / (2 * FAN_IN) bytes
+                    block = block or max(1, len(run) // (2 * FAN_IN))
+                    runs.append((0, _spill(run, block, counts)))
+                    run, used = [], 0
+                    while len(runs) >= FAN_IN and runs[-FAN_IN][0] == runs[-1][0]:
+                        _merge_tail(runs, key, block, counts)
+            run.sort(key=key)
+            while len(runs) > FAN_IN:
+                _merge_tail(runs, key, block, counts)
+            counts["records"] = len(runs)
+        if not runs:
+            yield from run
+            return
+        # The last run stays in memory
+        yield from heapq.merge(*(_read(f) for _, f in runs), run, key=key)
+    finally:
+        for _, f in runs:
+            f.close()
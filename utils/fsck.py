@@ -0,0 +1,233 @@
+"""
+Integrity check for `project-cli fsck`.
+
+One streaming pass per entity, users -> projects -> tasks, keeps the ids
+seen so far in sets, which is all it needs to find:
+
+- malformed rows: not an object, no positive integer id, fields of the wrong
+  type, unknown task status (the models quietly read it as 'todo'), due
+  dates that aren't YYYY-MM-DD dates;
+- duplicate ids, which the models' id counters hide;
+- dangling references: Project.user_id, Task.project_id, Task.assigned_to;
+- JSON files that can't be read to their closing "]" (everything after the
+  break is invisible to the loaders).
+
+With repair=True the same pass also builds the fixed records:
+- numeric strings in id fields become ints, unknown statuses become 'todo',
+  unreadable due dates are cleared;
+- a duplicate identical to the first row with its id is dropped, any other
+  duplicate gets a fresh id;
+- dangling assignees are unassigned;
+- rows that can't be fixed are dropped: unusable ids or references,
+  projects of missing users, and tasks of missing (or dropped) projects.
+Entities that changed are saved once, after their data files are copied
+as they are to data/backups/fsck-<time>/. An unreadable file stops the
+repair altogether: saving what could be read would drop the rest, and rows
+referring to the missing part would look dangling.
+"""
+from __future__ import annotations
+import re
+import shutil
+import time
+from datetime import date
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from models.task import Task
+from utils import journal, sharded_store, storage, timing
+
+# entity -> fields referencing other entities: (field, target entity, may be null)
+REFERENCES = {
+    "users": (),
+    "projects": (("user_id", "users", False),),
+    "tasks": (("project_id", "projects", False), ("assigned_to", "users", True)),
+}
+# entity -> text fields: (field, may be null)
+TEXT_FIELDS = {
+    "users": (("name", False), ("email", True)),
+    "projects": (("title", False), ("description", True), ("due_date", True)),
+    "tasks": (("title", False),),
+}
+
+@dataclass
+class FsckResult:
+    """Rows checked per entity, problems found (entity, id, kind, description) and rows repair fixes/drops."""
+    checked: dict[str, int] = field(default_factory=dict)
+    problems: list[tuple[str, Any, str, str]] = field(default_factory=list)
+    fixed: int = 0
+    dropped: int = 0
+    backup: Path | None = None
+    # (file, byte offset) of JSON files whose parse stopped before the end; repair is refused
+    unreadable: list[tuple[Path, int]] = field(default_factory=list)
+
+def _as_id(value: Any) -> int | None:
+    """Positive int, also from a numeric string; None otherwise."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    return value if isinstance(value, int) and value > 0 else None
+
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+def _is_date(value: str) -> bool:
+    if not _DATE.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+def _check(entity: str, record: Any, ids: dict[str, set[int]], first: dict[int, dict],
+           result: FsckResult) -> dict | None:
+    """
+    Report the problems of one record and return its repaired form (the
+    record itself when nothing needs fixing; id None for a duplicate that
+    needs a fresh one), or None when it has to be dropped.
+    """
+    def problem(text: str, kind: str = "malformed") -> None:
+        result.problems.append((entity, record.get("id") if isinstance(record, dict) else None, kind, text))
+
+    if type(record) is not dict:
+        problem(f"not an object: {str(record)[:40]}")
+        return None
+    changes: dict[str, Any] = {}
+    rid = record.get("id")
+    if type(rid) is not int or rid <= 0:
+        rid = _as_id(rid)
+        if rid is None:
+            problem(f"bad id {record.get('id')!r}")
+            return None
+        problem(f"id stored as {record.get('id')!r}")
+        changes["id"] = rid
+
+    for name, nullable in TEXT_FIELDS[entity]:
+        value = record.get(name)
+        if type(value) is not str and not (value is None and nullable):
+            problem(f"{name} is {value!r}")
+            changes[name] = None if nullable else str(value if value is not None else "")
+    if entity == "projects" and type(record.get("due_date")) is str and not _is_date(record["due_date"]):
+        problem(f"due_date {record['due_date']!r} is not a YYYY-MM-DD date")
+        changes["due_date"] = None
+    if entity == "tasks" and record.get("status") not in Task.VALID_STATUSES:
+        problem(f"unknown status {record.get('status')!r}")
+        changes["status"] = "todo"
+
+    for name, target, nullable in REFERENCES[entity]:
+        value = record.get(name)
+        if (value is None and nullable) or (type(value) is int and value in ids[target]):
+            continue
+        ref = _as_id(value)
+        if ref is None or ref not in ids[target]:
+            if ref is None:
+                problem(f"bad {name} {value!r}")
+            else:
+                problem(f"{name} {ref} does not exist", "dangling")
+            if not nullable:
+                return None
+            changes[name] = None
+        else:
+            changes[name] = ref
+
+    fixed = {**record, **changes} if changes else record
+    if rid in first:
+        problem("duplicate id", "duplicate")
+        if fixed == first[rid]:
+            return None
+        fixed = {**fixed, "id": None}
+    return fixed
+
+def _records(entity: str, unreadable: list[tuple[Path, int]]):
+    """
+    Every stored item; the JSON store's loaders skip non-objects and the
+    journal's replay merges duplicate ids, so read their files directly.
+    JSON files that stop parsing before their end are added to unreadable.
+    """
+    def read(path: Path):
+        status: dict = {}
+        yield from storage._iter_json(path, objects_only=False, status=status)
+        if not status["complete"]:
+            unreadable.append((path, status["offset"]))
+
+    if storage.STORE == "json" or (storage.STORE == "sharded" and entity != "tasks"):
+        yield from read(storage._path(entity))
+    elif storage.STORE == "sharded":
+        for name in sharded_store.manifest()["shards"]:
+            yield from read(sharded_store._shard_path(name))
+    elif storage.STORE == "journal":
+        status: dict = {}
+        yield from journal.raw_records(entity, status)
+        if not status["complete"]:
+            unreadable.append((storage._path(entity), status["offset"]))
+    else:
+        yield from storage.stream(entity)
+
+def check(repair: bool = False) -> FsckResult:
+    """Validate every entity in one pass each; with repair, save fixed data after a backup."""
+    result = FsckResult()
+    # Ids other entities may refer to: every usable id when checking, kept rows when repairing
+    ids: dict[str, set[int]] = {}
+    repaired: dict[str, list[dict]] = {}
+    with storage.transaction() if repair else storage._reading():
+        for entity in storage.ENTITIES:
+            first: dict[int, dict] = {}
+            present: set[int] = set()
+            kept: list[dict] = []
+            renumber: list[dict] = []
+            n, changed = 0, False
+            with timing.phase("fsck.scan") as counts:
+                broken = len(result.unreadable)
+                for record in _records(entity, result.unreadable):
+                    n += 1
+                    if type(record) is dict:
+                        rid = record.get("id")
+                        present.add(rid if type(rid) is int and rid > 0 else _as_id(rid))
+                    fixed = _check(entity, record, ids, first, result)
+                    if fixed is None:
+                        result.dropped += 1
+                        changed = True
+                        continue
+                    if fixed is not record:
+                        result.fixed += 1
+                        changed = True
+                    if fixed["id"] is None:
+                        renumber.append(fixed)
+                    else:
+                        first[fixed["id"]] = fixed
+                    if repair:
+                        kept.append(fixed)
+                counts["records"] = n
+            for path, offset in result.unreadable[broken:]:
+                result.problems.append((entity, None, "unreadable",
+                                        f"{path.name} can't be read past byte {offset}; later rows are missing"))
+            present.discard(None)
+            # Duplicates get ids above everything stored
+            next_id = max(present, default=0) + 1
+            for fixed in renumber:
+                fixed["id"] = next_id
+                first[next_id] = fixed
+                next_id += 1
+            result.checked[entity] = n
+            ids[entity] = set(first) if repair else present
+            if repair and changed:
+                repaired[entity] = kept
+
+        if repaired and not result.unreadable:
+            result.backup = _backup(repaired)
+            for entity, records in repaired.items():
+                storage.save(entity, records)
+    return result
+
+def _backup(entities: dict) -> Path:
+    """Copy the data files of every entity about to be rewritten, byte for byte."""
+    folder = storage.DATA_DIR / "backups" / time.strftime("fsck-%Y%m%d-%H%M%S")
+    paths = {path for entity in entities for path in storage._store().files(entity)}
+    for path in sorted(paths):
+        if path.exists():
+            # Keep the layout under DATA_DIR, e.g. tasks/<shard>.json
+            target = folder / path.relative_to(storage.DATA_DIR)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+    return folder
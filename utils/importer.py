@@ -0,0 +1,158 @@
+"""
+Bulk import of users, projects and tasks from a JSONL or CSV stream.
+
+Every record carries a "type" ("user", "project" or "task") and refers to
+other entities by name/title, like the add-* commands do:
+
+    {"type": "user", "name": "Alex", "email": "alex@example.com"}
+    {"type": "project", "title": "CLI Tool", "user": "Alex", "due_date": "2025-01-31"}
+    {"type": "task", "project": "CLI Tool", "title": "Write README", "assigned_to": "Alex"}
+
+Names are resolved through dicts built once from the stored data (plus the
+rows imported so far), ids are handed out from the current maximum, and
+each entity is written with a single storage.insert() at the end.
+"""
+from __future__ import annotations
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, TextIO
+
+from models.task import Task
+from utils import storage
+
+@dataclass
+class ImportResult:
+    """What an import added, and which input rows it refused (line, reason)."""
+    users: list[dict] = field(default_factory=list)
+    projects: list[dict] = field(default_factory=list)
+    tasks: list[dict] = field(default_factory=list)
+    rejected: list[tuple[int, str]] = field(default_factory=list)
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[tuple[int, dict | str]]:
+    """
+    Yield (line number, record) pairs. Unparseable lines are yielded as an
+    error string instead of a dict so they can be reported as rejects.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # Empty CSV cells mean "not given"
+            yield reader.line_num, {k: (v if v != "" else None) for k, v in record.items() if k}
+        return
+
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_no, f"invalid JSON ({exc.msg})"
+            continue
+        yield line_no, record if isinstance(record, dict) else "not a JSON object"
+
+def _text(record: dict, key: str) -> str | None:
+    """Stripped string field, or None when missing/blank."""
+    value = record.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+def _first_ids(records: Iterable[dict], field: str) -> dict[str, int]:
+    """Case-folded name/title -> id of the first record with it, the one storage.lookup() finds."""
+    ids: dict[str, int] = {}
+    for r in records:
+        ids.setdefault(storage._name_key(str(r.get(field) or "")), r.get("id"))
+    return ids
+
+def import_records(records: Iterable[tuple[int, dict | str]]) -> ImportResult:
+    """Validate and resolve records in one pass; nothing is written here."""
+    user_ids = _first_ids(storage.stream("users"), "name")
+    project_ids = _first_ids(storage.stream("projects"), "title")
+    next_id = {entity: storage.max_id(entity) + 1 for entity in storage.ENTITIES}
+
+    result = ImportResult()
+    for line_no, record in records:
+        if isinstance(record, str):
+            result.rejected.append((line_no, record))
+            continue
+
+        kind = _text(record, "type")
+        if kind == "user":
+            name = _text(record, "name")
+            if not name:
+                result.rejected.append((line_no, "user without a name"))
+                continue
+            key = storage._name_key(name)
+            if key in user_ids:
+                result.rejected.append((line_no, f"user '{name}' already exists"))
+                continue
+            user_ids[key] = next_id["users"]
+            result.users.append({"id": next_id["users"], "name": name, "email": _text(record, "email")})
+            next_id["users"] += 1
+
+        elif kind == "project":
+            title = _text(record, "title")
+            owner = _text(record, "user")
+            if not title or not owner:
+                result.rejected.append((line_no, "project needs 'title' and 'user'"))
+                continue
+            owner_id = user_ids.get(storage._name_key(owner))
+            if owner_id is None:
+                result.rejected.append((line_no, f"unknown user '{owner}'"))
+                continue
+            key = storage._name_key(title)
+            if key in project_ids:
+                result.rejected.append((line_no, f"project '{title}' already exists"))
+                continue
+            project_ids[key] = next_id["projects"]
+            result.projects.append({
+                "id": next_id["projects"],
+                "title": title,
+                "description": _text(record, "description"),
+                "due_date": _text(record, "due_date"),
+                "user_id": owner_id,
+            })
+            next_id["projects"] += 1
+
+        elif kind == "task":
+            title = _text(record, "title")
+            project = _text(record, "project")
+            if not title or not project:
+                result.rejected.append((line_no, "task needs 'title' and 'project'"))
+                continue
+            project_id = project_ids.get(storage._name_key(project))
+            if project_id is None:
+                result.rejected.append((line_no, f"unknown project '{project}'"))
+                continue
+            assignee = _text(record, "assigned_to")
+            assigned_to = None
+            if assignee:
+                assigned_to = user_ids.get(storage._name_key(assignee))
+                if assigned_to is None:
+                    result.rejected.append((line_no, f"unknown user '{assignee}'"))
+                    continue
+            status = _text(record, "status") or "todo"
+            if status not in Task.VALID_STATUSES:
+                result.rejected.append((line_no, f"invalid status '{status}'"))
+                continue
+            result.tasks.append({
+                "id": next_id["tasks"],
+                "project_id": project_id,
+                "title": title,
+                "status": status,
+                "assigned_to": assigned_to,
+            })
+            next_id["tasks"] += 1
+
+        else:
+            result.rejected.append((line_no, f"unknown record type '{kind}'"))
+
+    return result
+
+def commit(result: ImportResult) -> None:
+    """Write everything an import produced, one insert per entity."""
+    storage.insert_users(result.users)
+    storage.insert_projects(result.projects)
+    storage.insert_tasks(result.tasks)
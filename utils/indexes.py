@@ -0,0 +1,333 @@
+"""
+Sidecar indexes for the JSON store, kept next to each data file:
+
+- <entity>.idx.json      signature of the data file (mtime, size, head/tail hash) and max id
+- <entity>.offsets.idx   sorted int64 rows (id, byte offset, byte length) of every record
+- <entity>.keys.idx      sorted int64 rows (hash of the case-folded user name /
+                         project title, byte offset, id)
+- <entity>.<fk>.idx      sorted int64 rows (fk value, id): projects.user_id,
+                         tasks.project_id, tasks.assigned_to
+
+Lookups binary-search these fixed-width rows by seeking in the index file,
+so they read O(log N) rows plus the matches, then only the matching records
+from the data file; a name/title match is confirmed on the record itself.
+The index is only trusted while its signature matches the data file;
+otherwise it is rebuilt with one scan. A data file that doesn't parse to
+its closing "]" gets no idx.json: readers see the records before the break,
+and writers refuse to touch it (storage.UnreadableFileError).
+"""
+from __future__ import annotations
+import hashlib
+import heapq
+import json
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from utils import storage, timing
+
+KEY_FIELDS = {"users": "name", "projects": "title"}
+FK_FIELDS = {"users": (), "projects": ("user_id",), "tasks": ("project_id", "assigned_to")}
+
+def _sidecar(entity: str, suffix: str) -> Path:
+    path = storage._path(entity)
+    return path.with_name(f"{path.stem}.{suffix}")
+
+def signature(path: Path) -> list | None:
+    """mtime/size plus a hash of the first and last 4 KB of the file."""
+    try:
+        st = path.stat()
+        with path.open("rb") as f:
+            digest = hashlib.blake2b(f.read(4096), digest_size=8)
+            if st.st_size > 4096:
+                f.seek(max(st.st_size - 4096, 4096))
+                digest.update(f.read())
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size, digest.hexdigest()]
+
+def _read_rows(path: Path) -> array:
+    rows = array("q")
+    try:
+        rows.frombytes(path.read_bytes())
+    except FileNotFoundError:
+        pass
+    return rows
+
+def _write_file(path: Path, data: bytes) -> None:
+    # Atomic so a concurrent reader never sees half an index; no fsync since
+    # a lost index only fails its signature check and gets rebuilt
+    with storage._atomic_file(path, durable=False) as f:
+        f.write(data)
+
+def _write_rows(path: Path, rows: array) -> None:
+    _write_file(path, rows.tobytes())
+
+def _insert_rows(path: Path, stride: int, tuples: list[tuple]) -> None:
+    """
+    Add rows to a sorted .idx file: appended in place when they all sort
+    after its last row (ids only growing), otherwise merged in one pass.
+    """
+    if not tuples:
+        return
+    new = sorted(tuples)
+    row_size = 8 * stride
+    try:
+        with path.open("r+b") as f:
+            size = f.seek(0, 2)
+            if size % row_size == 0:
+                f.seek(max(size - row_size, 0))
+                last = tuple(array("q", f.read(row_size)))
+                if not last or last <= new[0]:
+                    f.write(array("q", [v for t in new for v in t]).tobytes())
+                    return
+    except FileNotFoundError:
+        pass
+    existing = _read_rows(path)
+    current = (tuple(existing[i:i + stride]) for i in range(0, len(existing) - stride + 1, stride))
+    rows = array("q")
+    for t in heapq.merge(current, new):
+        rows.extend(t)
+    _write_rows(path, rows)
+
+def _lower_bound(rows: array, stride: int, key: int) -> int:
+    """First row whose leading column is >= key."""
+    lo, hi = 0, len(rows) // stride
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if rows[mid * stride] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _key_hash(key: str) -> int:
+    """Signed 64-bit hash of a case-folded name/title, the leading column of keys.idx."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+def _file_lower_bound(f: BinaryIO, stride: int, key: int) -> int:
+    """_lower_bound over the rows of an open .idx file, reading one int64 per probe."""
+    row_size = 8 * stride
+    lo, hi = 0, f.seek(0, 2) // row_size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid * row_size)
+        if array("q", f.read(8))[0] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _matching_rows(path: Path, stride: int, key: int) -> array:
+    """The rows of a sorted .idx file whose leading column is key, without reading the rest."""
+    row_size = 8 * stride
+    found = array("q")
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        return found
+    with f:
+        f.seek(_file_lower_bound(f, stride, key) * row_size)
+        while True:
+            chunk = array("q", f.read(256 * row_size))
+            for i in range(0, len(chunk) - stride + 1, stride):
+                if chunk[i] != key:
+                    return found
+                found.extend(chunk[i:i + stride])
+            if len(chunk) < 256 * stride:
+                return found
+
+def _sorted_rows(tuples: list[tuple]) -> array:
+    rows = array("q")
+    for t in sorted(tuples):
+        rows.extend(t)
+    return rows
+
+def _fits(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and -2**63 <= value < 2**63
+
+def rebuild(entity: str, records: list, spans: list[tuple[int, int]], complete: bool = True) -> int:
+    """
+    Write every index of an entity from the records just written (or
+    scanned) and their spans; returns the max id. Without `complete` (the
+    scan stopped early) no idx.json is written, so nothing trusts the index.
+    """
+    with timing.phase("indexes.rebuild") as counts:
+        counts["records"] = len(records)
+        return _rebuild(entity, records, spans, complete)
+
+def _rebuild(entity: str, records: list, spans: list[tuple[int, int]], complete: bool) -> int:
+    offsets, keys, fks = [], [], {f: [] for f in FK_FIELDS[entity]}
+    max_id = 0
+    key_field = KEY_FIELDS.get(entity)
+    for r, (offset, length) in zip(records, spans):
+        if not isinstance(r, dict) or not _fits(r.get("id")):
+            continue
+        rid = r["id"]
+        max_id = max(max_id, rid)
+        offsets.append((rid, offset, length))
+        if key_field:
+            keys.append((_key_hash(storage._name_key(str(r.get(key_field) or ""))), offset, rid))
+        for f in fks:
+            if _fits(r.get(f)):
+                fks[f].append((r[f], rid))
+
+    _write_rows(_sidecar(entity, "offsets.idx"), _sorted_rows(offsets))
+    if key_field:
+        _write_rows(_sidecar(entity, "keys.idx"), _sorted_rows(keys))
+        # Replaced by keys.idx
+        _sidecar(entity, "keys.idx.json").unlink(missing_ok=True)
+    for f, pairs in fks.items():
+        _write_rows(_sidecar(entity, f"{f}.idx"), _sorted_rows(pairs))
+    if complete:
+        _write_meta(entity, max_id)
+    else:
+        _sidecar(entity, "idx.json").unlink(missing_ok=True)
+    return max_id
+
+def add(entity: str, records: list[dict], spans: list[tuple[int, int]], meta: dict) -> None:
+    """Fold records just appended to the data file into the index `meta` described before."""
+    with timing.phase("indexes.add") as counts:
+        counts["records"] = len(records)
+        _add(entity, records, spans, meta)
+
+def _add(entity: str, records: list[dict], spans: list[tuple[int, int]], meta: dict) -> None:
+    max_id = meta["max_id"]
+    key_field = KEY_FIELDS.get(entity)
+    offsets, keys, fks = [], [], {f: [] for f in FK_FIELDS[entity]}
+    for r, (offset, length) in zip(records, spans):
+        if not _fits(r.get("id")):
+            continue
+        rid = r["id"]
+        max_id = max(max_id, rid)
+        offsets.append((rid, offset, length))
+        if key_field:
+            # Appended records are last in the file, so their offsets order them after equal hashes
+            keys.append((_key_hash(storage._name_key(str(r.get(key_field) or ""))), offset, rid))
+        for f, pairs in fks.items():
+            if _fits(r.get(f)):
+                pairs.append((r[f], rid))
+
+    _insert_rows(_sidecar(entity, "offsets.idx"), 3, offsets)
+    if key_field:
+        _insert_rows(_sidecar(entity, "keys.idx"), 3, keys)
+    for f, pairs in fks.items():
+        _insert_rows(_sidecar(entity, f"{f}.idx"), 2, pairs)
+    _write_meta(entity, max_id)
+
+def _write_meta(entity: str, max_id: int) -> None:
+    meta = {"signature": signature(storage._path(entity)), "max_id": max_id}
+    _write_file(_sidecar(entity, "idx.json"), json.dumps(meta).encode("utf-8"))
+
+def load_meta(entity: str) -> dict | None:
+    """The index metadata if the index still describes the data file, else None."""
+    try:
+        meta = json.loads(_sidecar(entity, "idx.json").read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    if meta.get("signature") != signature(storage._path(entity)):
+        return None
+    if entity in KEY_FIELDS and not _sidecar(entity, "keys.idx").exists():
+        # Written before the key index was fixed-width
+        return None
+    return meta
+
+def ensure(entity: str) -> dict:
+    """
+    Valid index metadata, rebuilding the index from one scan if needed. For
+    a data file that stops parsing early the metadata is only returned, with
+    "unreadable_at" (the byte offset of the break), and the index is rebuilt
+    on every call.
+    """
+    meta = load_meta(entity)
+    if meta is None:
+        path = storage._path(entity)
+        with timing.phase("indexes.scan") as counts:
+            records, spans, stop = scan(path)
+            counts["records"] = len(records)
+        max_id = rebuild(entity, records, spans, complete=stop is None)
+        meta = load_meta(entity)
+        if stop is not None:
+            meta = {"signature": signature(path), "max_id": max_id, "unreadable_at": stop}
+    return meta
+
+def scan(path: Path) -> tuple[list, list[tuple[int, int]], int | None]:
+    """
+    Parse a JSON list file and locate every item's byte span. The third
+    value is None when the closing "]" was reached (or there is no file),
+    else the byte offset where parsing stopped.
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return [], [], None
+    decoder = json.JSONDecoder()
+    records, spans = [], []
+    pos = text.find("[") + 1
+    byte_pos, char_pos = 0, 0
+    if pos == 0:
+        return [], [], None if not text.strip() else 0
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(text) and text[pos] == "]":
+            break
+        if pos >= len(text):
+            return records, spans, len(text.encode("utf-8"))
+        try:
+            item, end = decoder.raw_decode(text, pos)
+        except ValueError:
+            return records, spans, byte_pos + len(text[char_pos:pos].encode("utf-8"))
+        # Convert character positions to byte offsets incrementally
+        byte_pos += len(text[char_pos:pos].encode("utf-8"))
+        length = len(text[pos:end].encode("utf-8"))
+        records.append(item)
+        spans.append((byte_pos, length))
+        byte_pos += length
+        char_pos = end
+        pos = end
+    return records, spans, None
+
+def key_candidates(entity: str, key: str) -> list[int]:
+    """
+    Ids of the users/projects whose case-folded name/title may be key, in
+    file order; the caller confirms on the records (hashes can collide).
+    """
+    ensure(entity)
+    rows = _matching_rows(_sidecar(entity, "keys.idx"), 3, _key_hash(key))
+    return [rows[i + 2] for i in range(0, len(rows), 3)]
+
+def ids_for(entity: str, field: str, value: int) -> list[int]:
+    """Ids of records whose foreign key `field` equals value."""
+    ensure(entity)
+    rows = _matching_rows(_sidecar(entity, f"{field}.idx"), 2, value)
+    return [rows[i + 1] for i in range(0, len(rows), 2)]
+
+def fetch(entity: str, ids: list[int]) -> list[dict]:
+    """Read just the given records from the data file, in file order."""
+    ensure(entity)
+    path = _sidecar(entity, "offsets.idx")
+    wanted = set(ids)
+    spans = []
+    try:
+        rows = path.stat().st_size // 24
+    except FileNotFoundError:
+        rows = 0
+    if len(wanted) * max(rows.bit_length(), 1) < rows:
+        # A few ids: binary-search each one in the file
+        for rid in wanted:
+            match = _matching_rows(path, 3, rid)
+            if match:
+                spans.append((match[1], match[2]))
+    else:
+        offsets = _read_rows(path)
+        for rid in wanted:
+            pos = _lower_bound(offsets, 3, rid) * 3
+            if pos < len(offsets) and offsets[pos] == rid:
+                spans.append((offsets[pos + 1], offsets[pos + 2]))
+    records = []
+    with storage._path(entity).open("rb") as f:
+        for offset, length in sorted(spans):
+            f.seek(offset)
+            records.append(json.loads(f.read(length)))
+    return records
@@ -0,0 +1,120 @@
+"""
+Default backend: one pretty-printed JSON file per entity.
+
+Lookups and foreign-key filters go through the sidecar indexes in
+utils/indexes.py; new records are appended in place when the index is
+current, other changes rewrite the file.
+"""
+from __future__ import annotations
+import os
+from pathlib import Path
+from typing import Iterator
+
+from utils import indexes, storage, timing
+
+def files(entity: str) -> list[Path]:
+    """Files whose change means the entity changed."""
+    return [storage._path(entity)]
+
+def load(entity: str) -> list[dict]:
+    """Read the whole entity file."""
+    return storage._read_json(storage._path(entity))
+
+def stream(entity: str, **where: int) -> Iterator[dict]:
+    """Stream the entity file record by record (indexed when filtering)."""
+    if where:
+        yield from select(entity, **where)
+        return
+    yield from storage._iter_json(storage._path(entity))
+
+def select(entity: str, **where: int) -> list[dict]:
+    """Equality filter; id and foreign-key filters read only the matching records."""
+    indexed = {"id", *indexes.FK_FIELDS[entity]}
+    if not where or not set(where) <= indexed or not all(indexes._fits(v) for v in where.values()):
+        return [r for r in storage._iter_json(storage._path(entity))
+                if all(r.get(k) == v for k, v in where.items())]
+    ids: set[int] | None = None
+    for field, value in where.items():
+        found = {value} if field == "id" else set(indexes.ids_for(entity, field, value))
+        ids = found if ids is None else ids & found
+    records = indexes.fetch(entity, sorted(ids))
+    # Double-check against the records themselves (e.g. an id listed twice)
+    return [r for r in records if all(r.get(k) == v for k, v in where.items())]
+
+def fetch(entity: str, ids: list[int]) -> list[dict]:
+    """Records with the given ids, read through the offsets index in one pass."""
+    wanted = set(ids)
+    records = indexes.fetch(entity, [i for i in wanted if indexes._fits(i)])
+    return [r for r in records if r.get("id") in wanted]
+
+def lookup(entity: str, key: str) -> dict | None:
+    """User by name / project by title through the key index."""
+    field = indexes.KEY_FIELDS[entity]
+    for r in indexes.fetch(entity, indexes.key_candidates(entity, key)):
+        if storage._name_key(str(r.get(field) or "")) == key:
+            return r
+    return None
+
+def _writable(entity: str) -> dict:
+    """Index metadata, raising UnreadableFileError if the file only parses up to a break."""
+    meta = indexes.ensure(entity)
+    if "unreadable_at" in meta:
+        raise storage.UnreadableFileError(
+            f"{storage._path(entity)} can't be read past byte {meta['unreadable_at']}, so writing to it would "
+            f"lose or duplicate records. Run 'fsck', then fix or restore the file.")
+    return meta
+
+def max_id(entity: str) -> int:
+    return _writable(entity)["max_id"]
+
+def save(entity: str, records: list[dict]) -> None:
+    """Rewrite the whole entity file and its indexes."""
+    spans = storage._write_json(storage._path(entity), records)
+    indexes.rebuild(entity, records, spans)
+
+def _ends_like_write_json(path: Path) -> bool:
+    """True if the file is a non-empty list closed by '\\n]', as _write_json leaves it."""
+    try:
+        with path.open("rb") as f:
+            size = f.seek(0, 2)
+            f.seek(max(size - 2, 0))
+            return size > 2 and f.read(2) == b"\n]"
+    except FileNotFoundError:
+        return False
+
+def insert(entity: str, records: list[dict]) -> None:
+    """
+    Append in place: overwrite the closing bracket with the new items.
+    Falls back to a full rewrite if the file isn't in the layout _write_json
+    produces, and refuses a file that doesn't parse to its end. Readers are
+    kept out by the storage lock; if the append is cut short, _read_json
+    still recovers every record written before it.
+    """
+    path = storage._path(entity)
+    meta = _writable(entity)
+    if not _ends_like_write_json(path):
+        save(entity, load(entity) + records)
+        return
+    spans = []
+    with timing.phase("storage.append") as counts, path.open("r+b") as f:
+        start = pos = f.seek(-2, 2)
+        for item in records:
+            pos += f.write(b",\n")
+            chunk = storage._dump_item(item)
+            spans.append((pos + 2, len(chunk) - 2))
+            pos += f.write(chunk)
+        pos += f.write(b"\n]")
+        f.flush()
+        os.fsync(f.fileno())
+        counts["bytes"], counts["records"] = pos - start, len(records)
+    indexes.add(entity, records, spans, meta)
+
+def update(entity: str, records: list[dict]) -> None:
+    """Load, replace records by id and rewrite."""
+    _writable(entity)
+    changed = {r["id"]: r for r in records}
+    current = load(entity)
+    save(entity, [changed.get(r.get("id"), r) for r in current])
+
+def compact(entity: str) -> None:
+    """Nothing to compact: every change is already in the snapshot."""
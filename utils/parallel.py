@@ -0,0 +1,108 @@
+"""
+Parallel loading of large JSON data files.
+
+A file in the layout _write_json produces ("[\n  {...},\n  {...}\n]") can be
+cut between top-level items without parsing it: every item starts on a line
+beginning with exactly two spaces and "{". Each worker process parses one
+byte range and builds models with sync_counter=False; the parent holds the
+shared storage lock until every worker is done, then advances the class id
+counter once, from the largest id any worker saw.
+"""
+from __future__ import annotations
+import importlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from utils import storage
+
+# Smaller files are parsed in-process: starting workers would cost more than it saves
+MIN_PARALLEL_BYTES = int(os.environ.get("PROJECT_CLI_MIN_PARALLEL_BYTES", 4 * 1024 * 1024))
+
+SEPARATOR = b",\n  {"
+
+def _chunk_bounds(path: Path, size: int, parts: int) -> list[tuple[int, int]] | None:
+    """
+    Byte ranges [start, end) each holding whole items, or None if the file
+    isn't laid out the way _write_json writes it.
+    """
+    with path.open("rb") as f:
+        if f.read(5) != b"[\n  {":
+            return None
+        f.seek(size - 2)
+        if f.read(2) != b"\n]":
+            return None
+
+        bounds = []
+        start = 2
+        for i in range(1, parts):
+            # Move each cut forward to the next item separator
+            f.seek(max(size * i // parts, start))
+            window, hit = b"", -1
+            while True:
+                block = f.read(1 << 16)
+                if not block:
+                    break
+                window += block
+                hit = window.find(SEPARATOR)
+                if hit != -1:
+                    break
+            if hit == -1:
+                break
+            cut = f.tell() - len(window) + hit
+            if cut > start:
+                bounds.append((start, cut))
+                start = cut + 2
+        bounds.append((start, size - 2))
+    return bounds
+
+def _parse_chunk(path: str, start: int, end: int, model: str) -> tuple[list, int, int]:
+    """Worker: parse one byte range into models. Returns (models, max id, skipped)."""
+    module_name, class_name = model.rsplit(".", 1)
+    cls = getattr(importlib.import_module(module_name), class_name)
+    with open(path, "rb") as f:
+        f.seek(start)
+        items = json.loads(b"[" + f.read(end - start) + b"]")
+    return _build(items, cls)
+
+def _build(items: list, cls: Any) -> tuple[list, int, int]:
+    """Models from raw dicts without touching the id counter: (models, max id, skipped)."""
+    models, max_id, skipped = [], 0, 0
+    for d in items:
+        try:
+            obj = cls.from_dict(d, sync_counter=False)
+        except (AttributeError, TypeError, ValueError):
+            skipped += 1
+            continue
+        models.append(obj)
+        if obj.id > max_id:
+            max_id = obj.id
+    return models, max_id, skipped
+
+def load_models(path: Path, cls: Any, workers: int) -> tuple[list, int]:
+    """
+    All records of a JSON list file as models of `cls`, parsed by up to
+    `workers` processes. Returns (models, number of malformed records skipped).
+    """
+    model = f"{cls.__module__}.{cls.__name__}"
+    # Workers read byte ranges computed here, so no writer may touch the file until they are done
+    with storage._reading():
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return [], 0
+
+        bounds = _chunk_bounds(path, size, workers * 4) if workers > 1 and size >= MIN_PARALLEL_BYTES else None
+        if bounds is None or len(bounds) == 1:
+            results = [_build(storage._read_json(path), cls)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_parse_chunk, str(path), start, end, model) for start, end in bounds]
+                results = [f.result() for f in futures]
+
+    models = [m for chunk, _, _ in results for m in chunk]
+    # One counter update for the whole file instead of one per record
+    cls.sync_counter(max((max_id for _, max_id, _ in results), default=0))
+    return models, sum(skipped for _, _, skipped in results)
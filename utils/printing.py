@@ -1,26 +1,99 @@
 from __future__ import annotations
-from rich.console import Console
-from rich.table import Table
+import json
+import os
+import sys
+from typing import Any, Iterable
 
-console = Console()
+from utils import timing
+
+# Plain mode never imports rich: messages and tables are written as plain text.
+PLAIN = bool(os.environ.get("PROJECT_CLI_PLAIN"))
+
+_console: Any = None
+
+# Put before warnings and errors, e.g. "line 3: " while `batch` runs a script
+CONTEXT = ""
+# Number of error() messages so far, so a caller can tell whether a command failed
+errors = 0
+
+def console() -> Any:
+    """The shared rich Console, created (and rich imported) on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+def _message(label: str, color: str, msg: str) -> None:
+    # Without a terminal rich would drop the colors anyway, so skip importing it
+    if PLAIN or not sys.stdout.isatty():
+        print(f"{label}: {msg}")
+        return
+    console().print(f"[bold {color}]{label}:[/bold {color}] {msg}")
 
 def info(msg: str) -> None:
     """Simple info message."""
-    console.print(f"[bold green]INFO:[/bold green] {msg}")
+    _message("INFO", "green", msg)
 
 def warn(msg: str) -> None:
     """Simple warning message."""
-    console.print(f"[bold yellow]WARN:[/bold yellow] {msg}")
+    _message("WARN", "yellow", CONTEXT + msg)
 
 def error(msg: str) -> None:
     """Simple error message."""
-    console.print(f"[bold red]ERROR:[/bold red] {msg}")
+    global errors
+    errors += 1
+    _message("ERROR", "red", CONTEXT + msg)
 
 def table(title: str, columns: list[str], rows: list[list[str]]) -> None:
-    """Render a simple table using rich."""
+    """Render a simple table using rich (or aligned plain text in plain mode)."""
+    with timing.phase("render.table") as counts:
+        counts["records"] = len(rows)
+        _table(title, columns, rows)
+
+def _table(title: str, columns: list[str], rows: list[list[str]]) -> None:
+    if PLAIN:
+        _plain_table(title, columns, rows)
+        return
+    from rich.table import Table
     t = Table(title=title)
     for c in columns:
         t.add_column(c)
     for r in rows:
         t.add_row(*[str(x) for x in r])
-    console.print(t)
\ No newline at end of file
+    console().print(t)
+
+def _plain_table(title: str, columns: list[str], rows: list[list[str]]) -> None:
+    """Title line, then header and rows padded to column width."""
+    cells = [columns] + [[str(x) for x in r] for r in rows]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(columns))]
+    print(title)
+    for r in cells:
+        print("  ".join(c.ljust(w) for c, w in zip(r, widths)).rstrip())
+
+def write_rows(fmt: str, columns: list[str], rows: Iterable[list]) -> int:
+    """
+    Write rows to stdout as they arrive ('jsonl' or 'csv'), bypassing rich.
+    Returns the number of rows written.
+    """
+    with timing.phase("render.stream") as counts:
+        counts["records"] = _write_rows(fmt, columns, rows)
+    return counts["records"]
+
+def _write_rows(fmt: str, columns: list[str], rows: Iterable[list]) -> int:
+    out = sys.stdout
+    count = 0
+    if fmt == "csv":
+        import csv
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        for r in rows:
+            writer.writerow(["" if x is None else x for x in r])
+            count += 1
+    else:
+        keys = [c.lower().replace(" ", "_") for c in columns]
+        for r in rows:
+            out.write(json.dumps(dict(zip(keys, r)), ensure_ascii=False) + "\n")
+            count += 1
+    out.flush()
+    return count
@@ -0,0 +1,159 @@
+"""
+On-disk cache of what the list commands print.
+
+Entries live in data/.cache/: <key>.out holds the command's exact output and
+index.json maps each key to the entities it was computed from, its size and
+when it was last used, next to hit/miss counters. The key covers the command,
+its arguments, the store, the output settings and the fingerprint of every
+file the command reads, so a write anywhere makes older entries unreachable;
+storage writes also delete them straight away. Least recently used entries
+are evicted once the cache holds more than MAX_BYTES (0 turns caching off).
+
+The index is replaced atomically but not locked, so counters from
+concurrent runs can occasionally be lost; cached output never is wrong.
+"""
+from __future__ import annotations
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from utils import printing, storage
+
+MAX_BYTES = int(os.environ.get("PROJECT_CLI_CACHE_BYTES", 64 * 1024 * 1024))
+# Options that don't change what a list command prints
+IGNORED_OPTIONS = {"command", "timings", "profile", "workers"}
+
+def _dir() -> Path:
+    return storage.DATA_DIR / ".cache"
+
+def _load_index() -> dict:
+    try:
+        index = json.loads((_dir() / "index.json").read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        index = {}
+    index.setdefault("entries", {})
+    index.setdefault("hits", 0)
+    index.setdefault("misses", 0)
+    return index
+
+def _save_index(index: dict) -> None:
+    with storage._atomic_file(_dir() / "index.json", durable=False) as f:
+        f.write(json.dumps(index).encode("utf-8"))
+
+def key(command: str, options: dict[str, Any], entities: tuple[str, ...]) -> str:
+    """Cache key of one invocation against the current state of its data files."""
+    width = shutil.get_terminal_size().columns if sys.stdout.isatty() else 0
+    parts = [
+        command,
+        sorted((k, v) for k, v in options.items() if k not in IGNORED_OPTIONS),
+        storage.STORE,
+        [printing.PLAIN, sys.stdout.isatty(), width],
+        [storage.fingerprint(e) for e in entities],
+    ]
+    return hashlib.blake2b(json.dumps(parts, default=str).encode("utf-8"), digest_size=16).hexdigest()
+
+def get(key: str) -> str | None:
+    """Cached output for key (counted as a hit), or None (a miss)."""
+    index = _load_index()
+    entry = index["entries"].get(key)
+    output = None
+    if entry is not None:
+        try:
+            output = (_dir() / f"{key}.out").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            del index["entries"][key]
+    if output is None:
+        index["misses"] += 1
+    else:
+        index["hits"] += 1
+        entry["used"] = time.time()
+    _save_index(index)
+    return output
+
+def put(key: str, entities: tuple[str, ...], output: str) -> None:
+    """Store output, then evict least recently used entries above MAX_BYTES."""
+    data = output.encode("utf-8")
+    if len(data) > MAX_BYTES:
+        return
+    with storage._atomic_file(_dir() / f"{key}.out", durable=False) as f:
+        f.write(data)
+    index = _load_index()
+    entries = index["entries"]
+    entries[key] = {"entities": list(entities), "size": len(data), "used": time.time()}
+    total = sum(e["size"] for e in entries.values())
+    for old in sorted(entries, key=lambda k: entries[k]["used"]):
+        if total <= MAX_BYTES:
+            break
+        total -= entries.pop(old)["size"]
+        (_dir() / f"{old}.out").unlink(missing_ok=True)
+    _save_index(index)
+
+def invalidate(entity: str) -> None:
+    """Drop every entry computed from entity."""
+    index = _load_index()
+    stale = [k for k, e in index["entries"].items() if entity in e["entities"]]
+    if not stale:
+        return
+    for k in stale:
+        del index["entries"][k]
+        (_dir() / f"{k}.out").unlink(missing_ok=True)
+    _save_index(index)
+
+def clear() -> None:
+    """Remove all entries and reset the counters."""
+    shutil.rmtree(_dir(), ignore_errors=True)
+
+def stats() -> dict[str, int]:
+    """Entries, bytes, hits and misses."""
+    index = _load_index()
+    entries = index["entries"].values()
+    return {"entries": len(entries), "bytes": sum(e["size"] for e in entries),
+            "hits": index["hits"], "misses": index["misses"]}
+
+class _Tee:
+    """
+    Passes writes through to stdout while keeping a copy, up to MAX_BYTES:
+    output too large to cache stops being copied as soon as it gets there.
+    """
+
+    def __init__(self, target: Any) -> None:
+        self._target = target
+        self._copy: io.StringIO | None = io.StringIO()
+        self._size = 0
+
+    def write(self, text: str) -> int:
+        if self._copy is not None:
+            # Characters, a lower bound on the UTF-8 size put() checks again
+            self._size += len(text)
+            if self._size > MAX_BYTES:
+                self._copy.close()
+                self._copy = None
+            else:
+                self._copy.write(text)
+        return self._target.write(text)
+
+    def output(self) -> str | None:
+        """Everything written, or None if it outgrew the cache."""
+        return self._copy.getvalue() if self._copy is not None else None
+
+    def __getattr__(self, name: str) -> Any:
+        # flush, isatty, encoding... come from the real stream
+        return getattr(self._target, name)
+
+@contextmanager
+def recording() -> Iterator[_Tee]:
+    """Capture what is written to stdout while still printing it; see _Tee.output()."""
+    previous = sys.stdout
+    tee = _Tee(previous)
+    sys.stdout = tee
+    try:
+        yield tee
+    finally:
+        sys.stdout = previous
@@ -0,0 +1,246 @@
+"""
+Persistent inverted index for `project-cli search`.
+
+Every token of Task.title, Project.title and Project.description points to
+postings encoded as int64 (id << 2 | field). The index has a main segment,
+written in one go by a full build or a merge:
+
+- data/<store>.search.terms.json  sorted [term, offset, count] entries
+- data/<store>.search.postings    int64 postings, one contiguous run per term
+
+Both files carry the segment's generation (the postings in their first 8
+bytes), and a reader only pairs files with the same one; there is also
+data/<store>.search.json with the fingerprint of the task and project
+files it covers, document counts and a delta of postings added since the
+segment was written. add-task and add-project only rewrite that small file;
+once the delta holds MERGE_POSTINGS postings it is merged into a new segment.
+Like the report summary, any other write makes the index stale and the next
+search rebuilds it with one pass over projects and tasks.
+
+Queries match tokens by prefix; exact tokens, rarer tokens and titles score
+higher, and every query word must match.
+"""
+from __future__ import annotations
+import bisect
+import heapq
+import json
+import math
+import os
+import re
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+from utils import storage, timing
+
+MERGE_POSTINGS = int(os.environ.get("PROJECT_CLI_SEARCH_MERGE", 50_000))
+
+TASK_TITLE, PROJECT_TITLE, PROJECT_DESCRIPTION = 0, 1, 2
+FIELD_WEIGHTS = {TASK_TITLE: 2.0, PROJECT_TITLE: 2.0, PROJECT_DESCRIPTION: 1.0}
+PREFIX_WEIGHT = 0.5
+
+_TOKEN = re.compile(r"\w+")
+
+def tokenize(text: str | None) -> list[str]:
+    """Lower-cased word tokens."""
+    return _TOKEN.findall(text.lower()) if text else []
+
+def _paths() -> tuple[Path, Path, Path]:
+    base = f"{storage.STORE}.search"
+    return (storage.DATA_DIR / f"{base}.json", storage.DATA_DIR / f"{base}.terms.json",
+            storage.DATA_DIR / f"{base}.postings")
+
+def _fingerprint() -> list:
+    # Compared after a JSON round trip, so store it in that form
+    return json.loads(json.dumps([storage.fingerprint("tasks"), storage.fingerprint("projects")]))
+
+def _postings_of(kind: str, record: dict) -> Iterable[tuple[str, int]]:
+    rid = record.get("id")
+    if not isinstance(rid, int) or rid < 0:
+        return
+    if kind == "tasks":
+        fields = ((TASK_TITLE, record.get("title")),)
+    else:
+        fields = ((PROJECT_TITLE, record.get("title")), (PROJECT_DESCRIPTION, record.get("description")))
+    for field, text in fields:
+        for token in set(tokenize(str(text) if text is not None else None)):
+            yield token, rid << 2 | field
+
+def _write_segment(meta: dict, postings: dict[str, array]) -> None:
+    """Write postings + terms, then meta (which names the segment) with an empty delta."""
+    _, terms_path, postings_path = _paths()
+    terms, offset = [], 0
+    stamp = os.urandom(8)
+    generation = stamp.hex()
+    with storage._atomic_file(postings_path, durable=False) as f:
+        f.write(stamp)
+        for term in sorted(postings):
+            codes = postings[term]
+            f.write(codes.tobytes())
+            terms.append([term, offset, len(codes)])
+            offset += len(codes)
+    with storage._atomic_file(terms_path, durable=False) as f:
+        f.write(json.dumps({"generation": generation, "terms": terms}, ensure_ascii=False).encode("utf-8"))
+    meta["generation"] = generation
+    meta["delta"] = {}
+    _save_meta(meta)
+
+def _save_meta(meta: dict) -> None:
+    meta["fingerprint"] = _fingerprint()
+    with storage._atomic_file(_paths()[0], durable=False) as f:
+        f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+def current() -> dict | None:
+    """Index metadata if the index still covers the stored data, else None."""
+    if storage.deferring():
+        # Like the summary: a batch's flush makes the index stale anyway
+        return None
+    try:
+        meta = json.loads(_paths()[0].read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    return meta if meta.get("fingerprint") == _fingerprint() else None
+
+def build() -> dict:
+    """Index all projects and tasks in one pass."""
+    postings: dict[str, array] = {}
+    docs = {"tasks": 0, "projects": 0}
+    # One shared lock so the fingerprint saved is the one of the records indexed
+    with storage._reading(), timing.phase("search.build") as counts:
+        for kind in ("projects", "tasks"):
+            for record in storage.stream(kind):
+                docs[kind] += 1
+                for token, code in _postings_of(kind, record):
+                    postings.setdefault(token, array("q")).append(code)
+        meta = {"docs": docs}
+        _write_segment(meta, postings)
+        counts["records"] = docs["tasks"] + docs["projects"]
+    return meta
+
+def _load_segment() -> tuple[str, list[str], list[list]] | None:
+    """(generation, sorted terms, [term, offset, count] entries) of the main segment."""
+    try:
+        data = json.loads(_paths()[1].read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    entries = data["terms"]
+    return data["generation"], [e[0] for e in entries], entries
+
+def _open_postings(generation: str) -> BinaryIO | None:
+    """
+    The postings file positioned after its stamp, or None unless it belongs
+    to the segment `generation` (e.g. a concurrent build replaced one file of the pair).
+    """
+    try:
+        f = _paths()[2].open("rb")
+    except FileNotFoundError:
+        return None
+    if f.read(8).hex() != generation:
+        f.close()
+        return None
+    return f
+
+def _read_postings(f: BinaryIO, offset: int, count: int) -> array:
+    codes = array("q")
+    # Offsets count postings after the 8-byte stamp
+    f.seek(8 + offset * 8)
+    codes.frombytes(f.read(count * 8))
+    return codes
+
+def _doc(code: int) -> int:
+    """Document key of a posting: tasks and projects share ids, so the kind is the low bit."""
+    return (code >> 2) << 1 | (code & 3 != TASK_TITLE)
+
+def apply(meta: dict | None, tasks: list[dict] = (), projects: list[dict] = ()) -> None:
+    """
+    Add new tasks/projects to an index taken with current() before the
+    write (with no records this just records that titles didn't change).
+    A missing or stale index is left for the next search to rebuild.
+    """
+    if meta is None:
+        return
+    delta = meta["delta"]
+    for kind, records in (("tasks", tasks), ("projects", projects)):
+        for record in records:
+            meta["docs"][kind] += 1
+            for token, code in _postings_of(kind, record):
+                delta.setdefault(token, []).append(code)
+    if sum(len(codes) for codes in delta.values()) < MERGE_POSTINGS:
+        _save_meta(meta)
+        return
+    _merge(meta)
+
+def _merge(meta: dict) -> None:
+    """Fold the delta into a new main segment (left stale if the segment changed meanwhile)."""
+    segment = _load_segment()
+    f = _open_postings(segment[0]) if segment is not None and segment[0] == meta.get("generation") else None
+    if f is None:
+        return
+    postings: dict[str, array] = {}
+    with f:
+        for term, offset, count in segment[2]:
+            postings[term] = _read_postings(f, offset, count)
+    for term, codes in meta["delta"].items():
+        postings.setdefault(term, array("q")).extend(codes)
+    _write_segment(meta, postings)
+
+def search(query: str, limit: int = 20) -> list[tuple[float, str, int]]:
+    """Best matches as (score, 'task' | 'project', id), highest score first."""
+    words = tokenize(query)
+    if not words:
+        return []
+    meta = current()
+    segment = _load_segment() if meta is not None else None
+    f = _open_postings(segment[0]) if segment is not None and segment[0] == meta.get("generation") else None
+    # A concurrent build can replace the files between our write and read; build again then
+    for _ in range(3):
+        if f is not None:
+            break
+        meta = build()
+        segment = _load_segment()
+        f = _open_postings(segment[0]) if segment is not None and segment[0] == meta["generation"] else None
+    if f is None:
+        raise RuntimeError("The search index keeps changing while being read; try again.")
+    _, terms, entries = segment
+
+    with f, timing.phase("search.query") as counts:
+        ranked = _rank(words, meta, terms, entries, f, limit)
+        counts["records"] = len(ranked)
+    return ranked
+
+def _rank(words: list[str], meta: dict, terms: list[str], entries: list[list], f: BinaryIO,
+          limit: int) -> list[tuple[float, str, int]]:
+    total_docs = max(1, meta["docs"]["tasks"] + meta["docs"]["projects"])
+    delta = meta["delta"]
+    scores: dict[int, float] | None = None
+    for word in words:
+        matched: dict[str, list[int] | array] = {}
+        # Segment terms sharing the prefix are contiguous in the sorted list
+        i = bisect.bisect_left(terms, word)
+        while i < len(terms) and terms[i].startswith(word):
+            _, offset, count = entries[i]
+            matched[terms[i]] = _read_postings(f, offset, count)
+            i += 1
+        for term, codes in delta.items():
+            if term.startswith(word):
+                matched[term] = list(matched.get(term, ())) + codes
+
+        word_scores: dict[int, float] = {}
+        for term, codes in matched.items():
+            idf = math.log(1 + total_docs / len(codes))
+            weight = idf * (1.0 if term == word else PREFIX_WEIGHT)
+            for code in codes:
+                # A document hit by several tokens counts its best one
+                doc = _doc(code)
+                score = weight * FIELD_WEIGHTS[code & 3]
+                if score > word_scores.get(doc, 0.0):
+                    word_scores[doc] = score
+        if scores is None:
+            scores = word_scores
+        else:
+            scores = {doc: s + word_scores[doc] for doc, s in scores.items() if doc in word_scores}
+        if not scores:
+            return []
+
+    ranked = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+    return [(score, "project" if doc & 1 else "task", doc >> 1) for doc, score in ranked]
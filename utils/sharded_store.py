@@ -0,0 +1,308 @@
+"""
+Sharded backend: tasks are split into partitions under data/tasks/; users and
+projects are kept exactly like the json store keeps them.
+
+- tasks/manifest.json  partitioning scheme ("project": one shard per project,
+                       or "hash": project id modulo `buckets`), shard names and
+                       a generation per shard, bumped by every write to it
+- tasks/<shard>.json   the shard's tasks, in the layout _write_json produces
+- tasks/ids.idx        sorted int64 rows (task id, shard number)
+- tasks/ids.log        int64 rows (task id, shard number) appended since ids.idx
+                       was written, later rows winning; folded into ids.idx
+                       once it holds LOG_ROWS rows
+
+Tasks always live in the shard of their project, so listing or adding tasks
+of one project reads or writes that project's shard only, and an id lookup
+reads one shard through ids.log and a binary search of ids.idx. Other
+filters read every shard, and full listings come shard by shard rather
+than in global id order. Since every write goes through the manifest, its
+state alone fingerprints the tasks; shard files edited by hand go unnoticed.
+"""
+from __future__ import annotations
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from utils import indexes, json_store, storage
+
+DEFAULT_SCHEME = os.environ.get("PROJECT_CLI_SHARD_SCHEME", "project")
+DEFAULT_BUCKETS = int(os.environ.get("PROJECT_CLI_SHARD_BUCKETS", 64))
+# ids.log rows kept before they are folded into ids.idx
+LOG_ROWS = int(os.environ.get("PROJECT_CLI_SHARD_LOG_ROWS", 4096))
+
+def _dir() -> Path:
+    return storage.DATA_DIR / "tasks"
+
+def _manifest_path() -> Path:
+    return _dir() / "manifest.json"
+
+def _ids_path() -> Path:
+    return _dir() / "ids.idx"
+
+def _log_path() -> Path:
+    return _dir() / "ids.log"
+
+def _shard_path(name: str) -> Path:
+    return _dir() / f"{name}.json"
+
+def manifest() -> dict:
+    """The current manifest, or an empty one with the default scheme."""
+    try:
+        return json.loads(_manifest_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {"scheme": DEFAULT_SCHEME, "buckets": DEFAULT_BUCKETS, "shards": []}
+
+def _write_manifest(m: dict, written: Iterable[str]) -> None:
+    """Write the manifest with the generation of every shard in `written` bumped."""
+    generations = m.setdefault("generations", {})
+    for name in written:
+        generations[name] = generations.get(name, 0) + 1
+    with storage._atomic_file(_manifest_path()) as f:
+        f.write(json.dumps(m, indent=2).encode("utf-8"))
+
+def _shard_of(m: dict, project_id: Any) -> str:
+    """Shard name for tasks of a project."""
+    if not indexes._fits(project_id):
+        project_id = None
+    if m["scheme"] == "hash":
+        return f"bucket-{(project_id or 0) % m['buckets']}"
+    return f"project-{project_id if project_id is not None else 'none'}"
+
+def _read_ids() -> array:
+    rows = array("q")
+    try:
+        rows.frombytes(_ids_path().read_bytes())
+    except FileNotFoundError:
+        pass
+    return rows
+
+def _write_ids(rows: array) -> None:
+    """Replace ids.idx with rows, which then hold everything ids.log did."""
+    with storage._atomic_file(_ids_path(), durable=False) as f:
+        f.write(rows.tobytes())
+    _log_path().unlink(missing_ok=True)
+
+def _read_log() -> dict[int, int]:
+    """id -> shard number of the rows in ids.log, later rows winning."""
+    rows = array("q")
+    try:
+        data = _log_path().read_bytes()
+    except FileNotFoundError:
+        return {}
+    # Ignore a torn last row
+    rows.frombytes(data[:len(data) - len(data) % 16])
+    return dict(zip(rows[::2], rows[1::2]))
+
+def _log_ids(pairs: list[tuple[int, int]]) -> None:
+    """Record (id, shard number) pairs: appended to ids.log, or folded into ids.idx once it is full."""
+    if not pairs:
+        return
+    try:
+        logged = _log_path().stat().st_size // 16
+    except FileNotFoundError:
+        logged = 0
+    if logged + len(pairs) >= LOG_ROWS:
+        rows = _read_ids()
+        _add_ids(rows, [*_read_log().items(), *pairs])
+        _write_ids(rows)
+        return
+    with _log_path().open("ab") as f:
+        f.write(array("q", [v for pair in pairs for v in pair]).tobytes())
+
+def _add_ids(rows: array, pairs: list[tuple[int, int]]) -> None:
+    for rid, shard in pairs:
+        pos = indexes._lower_bound(rows, 2, rid) * 2
+        if pos < len(rows) and rows[pos] == rid:
+            rows[pos + 1] = shard
+        else:
+            rows[pos:pos] = array("q", (rid, shard))
+
+def _shards_for_ids(m: dict, ids: Iterable[int]) -> dict[int, str]:
+    """Shard name of each of the given task ids that is stored."""
+    logged = _read_log()
+    numbers: dict[int, int] = {}
+    rest = []
+    for rid in ids:
+        if rid in logged:
+            numbers[rid] = logged[rid]
+        elif indexes._fits(rid):
+            rest.append(rid)
+    if rest:
+        try:
+            rows = _ids_path().stat().st_size // 16
+        except FileNotFoundError:
+            rows = 0
+        if len(rest) * max(rows.bit_length(), 1) < rows:
+            # A few ids: binary-search each one in the file
+            for rid in rest:
+                found = indexes._matching_rows(_ids_path(), 2, rid)
+                if found:
+                    numbers[rid] = found[1]
+        else:
+            all_rows = _read_ids()
+            for rid in rest:
+                pos = indexes._lower_bound(all_rows, 2, rid) * 2
+                if pos < len(all_rows) and all_rows[pos] == rid:
+                    numbers[rid] = all_rows[pos + 1]
+    return {rid: m["shards"][n] for rid, n in numbers.items() if n < len(m["shards"])}
+
+def files(entity: str) -> list[Path]:
+    """For tasks: manifest, id index and log, and every shard."""
+    if entity != "tasks":
+        return json_store.files(entity)
+    return [_manifest_path(), _ids_path(), _log_path()] + [_shard_path(name) for name in manifest()["shards"]]
+
+def fingerprint_files(entity: str) -> list[Path]:
+    """Files whose change means the entity changed: for tasks just the manifest, rewritten by every write."""
+    if entity != "tasks":
+        return json_store.files(entity)
+    return [_manifest_path()]
+
+def load(entity: str) -> list[dict]:
+    if entity != "tasks":
+        return json_store.load(entity)
+    return list(stream(entity))
+
+def stream(entity: str, **where: int) -> Iterator[dict]:
+    """Tasks shard by shard; project and id filters read a single shard."""
+    if entity != "tasks":
+        yield from json_store.stream(entity, **where)
+        return
+    m = manifest()
+    if "project_id" in where:
+        names = [_shard_of(m, where["project_id"])]
+    elif "id" in where:
+        found = _shards_for_ids(m, [where["id"]]).get(where["id"])
+        names = [found] if found else m["shards"]
+    else:
+        names = m["shards"]
+    for name in names:
+        for r in storage._iter_json(_shard_path(name)):
+            if all(r.get(k) == v for k, v in where.items()):
+                yield r
+
+def select(entity: str, **where: int) -> list[dict]:
+    if entity != "tasks":
+        return json_store.select(entity, **where)
+    return list(stream(entity, **where))
+
+def lookup(entity: str, key: str) -> dict | None:
+    return json_store.lookup(entity, key)
+
+def max_id(entity: str) -> int:
+    if entity != "tasks":
+        return json_store.max_id(entity)
+    largest = 0
+    try:
+        with _ids_path().open("rb") as f:
+            if f.seek(0, 2) >= 16:
+                f.seek(-16, 2)
+                largest = array("q", f.read(8))[0]
+    except FileNotFoundError:
+        pass
+    return max(largest, *_read_log(), 0)
+
+def _group(m: dict, records: list[dict]) -> dict[str, list[dict]]:
+    groups: dict[str, list[dict]] = {}
+    for r in records:
+        groups.setdefault(_shard_of(m, r.get("project_id")), []).append(r)
+    return groups
+
+def _shard_number(m: dict, name: str) -> int:
+    if name not in m["shards"]:
+        m["shards"].append(name)
+    return m["shards"].index(name)
+
+def save(entity: str, records: list[dict], m: dict | None = None) -> None:
+    """Rewrite every shard (dropping ones left empty), the id index and the manifest."""
+    if entity != "tasks":
+        json_store.save(entity, records)
+        return
+    old = manifest()
+    m = m or dict(old, shards=[])
+    m["shards"] = []
+    ids: list[tuple[int, int]] = []
+    for name, group in _group(m, records).items():
+        storage._write_json(_shard_path(name), group)
+        number = _shard_number(m, name)
+        ids += [(r["id"], number) for r in group if indexes._fits(r.get("id"))]
+    rows = array("q")
+    for pair in sorted(ids):
+        rows.extend(pair)
+    _write_ids(rows)
+    m["generations"] = {name: old.get("generations", {}).get(name, 0) for name in m["shards"]}
+    _write_manifest(m, m["shards"])
+    for name in set(old["shards"]) - set(m["shards"]):
+        _shard_path(name).unlink(missing_ok=True)
+
+def _append(path: Path, records: list[dict]) -> None:
+    """Append to a shard in place, like json_store.insert does for whole files."""
+    if not json_store._ends_like_write_json(path):
+        storage._write_json(path, storage._read_json(path) + records)
+        return
+    with path.open("r+b") as f:
+        f.seek(-2, 2)
+        for item in records:
+            f.write(b",\n")
+            f.write(storage._dump_item(item))
+        f.write(b"\n]")
+        f.flush()
+        os.fsync(f.fileno())
+
+def insert(entity: str, records: list[dict]) -> None:
+    """Append each task to its project's shard."""
+    if entity != "tasks":
+        json_store.insert(entity, records)
+        return
+    m = manifest()
+    groups = _group(m, records)
+    pairs = []
+    for name, group in groups.items():
+        _append(_shard_path(name), group)
+        number = _shard_number(m, name)
+        pairs += [(r["id"], number) for r in group if indexes._fits(r.get("id"))]
+    _log_ids(pairs)
+    _write_manifest(m, groups)
+
+def update(entity: str, records: list[dict]) -> None:
+    """Rewrite only the shards holding the changed tasks (moving tasks whose project changed)."""
+    if entity != "tasks":
+        json_store.update(entity, records)
+        return
+    m = manifest()
+    changed = {r["id"]: r for r in records}
+    by_shard: dict[str, set[int]] = {}
+    for rid, name in _shards_for_ids(m, changed).items():
+        by_shard.setdefault(name, set()).add(rid)
+
+    moved: list[dict] = []
+    for name, ids in by_shard.items():
+        kept = []
+        for r in storage._read_json(_shard_path(name)):
+            new = changed.get(r.get("id")) if r.get("id") in ids else None
+            if new is None:
+                kept.append(r)
+            elif _shard_of(m, new.get("project_id")) == name:
+                kept.append(new)
+            else:
+                moved.append(new)
+        storage._write_json(_shard_path(name), kept)
+    pairs = []
+    moved_to = _group(m, moved)
+    for name, group in moved_to.items():
+        _append(_shard_path(name), group)
+        pairs += [(r["id"], _shard_number(m, name)) for r in group]
+    _log_ids(pairs)
+    _write_manifest(m, [*by_shard, *moved_to])
+
+def compact(entity: str) -> None:
+    """Nothing to compact: every change is already in the shard files."""
+
+def rebalance(scheme: str, buckets: int) -> int:
+    """Re-partition all tasks with a new scheme/bucket count; returns the number of shards."""
+    records = load("tasks")
+    m = {"scheme": scheme, "buckets": buckets, "shards": []}
+    save("tasks", records, m)
+    return len(m["shards"])
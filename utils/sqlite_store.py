@@ -0,0 +1,172 @@
+"""
+SQLite backend: users, projects and tasks as tables in data/project-cli.db.
+
+Name/title lookups go through indexes on case-folded key columns, and the
+foreign keys used as filters (projects.user_id, tasks.project_id,
+tasks.assigned_to) are indexed as well.
+"""
+from __future__ import annotations
+import sqlite3
+from pathlib import Path
+from typing import Iterator
+
+from utils import storage
+
+DB_NAME = "project-cli.db"
+
+FIELDS = {
+    "users": ("id", "name", "email"),
+    "projects": ("id", "title", "description", "due_date", "user_id"),
+    "tasks": ("id", "project_id", "title", "status", "assigned_to"),
+}
+
+# Column holding the case-folded lookup key, and the field it is derived from
+KEYS = {"users": ("name_key", "name"), "projects": ("title_key", "title")}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    email TEXT
+);
+CREATE INDEX IF NOT EXISTS users_name_key ON users (name_key);
+
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    description TEXT,
+    due_date TEXT,
+    user_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS projects_title_key ON projects (title_key);
+CREATE INDEX IF NOT EXISTS projects_user_id ON projects (user_id);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER,
+    title TEXT NOT NULL,
+    status TEXT NOT NULL,
+    assigned_to INTEGER
+);
+CREATE INDEX IF NOT EXISTS tasks_project_id ON tasks (project_id);
+CREATE INDEX IF NOT EXISTS tasks_assigned_to ON tasks (assigned_to);
+"""
+
+_connections: dict[Path, sqlite3.Connection] = {}
+
+def _db_path() -> Path:
+    return storage.DATA_DIR / DB_NAME
+
+def _connect() -> sqlite3.Connection:
+    """One connection per database file, schema created on first use."""
+    path = _db_path()
+    conn = _connections.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(SCHEMA)
+        _connections[path] = conn
+    return conn
+
+# NOT NULL columns and what a missing value is stored as (the models read it the same way)
+DEFAULTS = {"name": "", "title": "", "status": "todo"}
+
+def _row_values(entity: str, record: dict) -> tuple:
+    """Column values for INSERT, including the derived key column."""
+    values = [record.get(f) for f in FIELDS[entity]]
+    values = [DEFAULTS.get(f, v) if v is None else v for f, v in zip(FIELDS[entity], values)]
+    if entity in KEYS:
+        _, source = KEYS[entity]
+        values.append(storage._name_key(record.get(source) or ""))
+    return tuple(values)
+
+def _rows(entity: str, records: list[dict]) -> list[tuple]:
+    """
+    INSERT rows for records. INTEGER PRIMARY KEY only holds one row per
+    integer id, so records without one, or sharing one, raise ValueError
+    instead of being dropped or merged.
+    """
+    seen: set[int] = set()
+    bad, duplicates = [], []
+    for r in records:
+        rid = r.get("id") if isinstance(r, dict) else None
+        if type(rid) is not int:
+            bad.append(rid)
+        elif rid in seen:
+            duplicates.append(rid)
+        seen.add(rid)
+    if bad or duplicates:
+        problems = []
+        if bad:
+            problems.append(f"{len(bad)} without an integer id ({', '.join(map(repr, bad[:5]))})")
+        if duplicates:
+            problems.append(f"{len(duplicates)} with a duplicate id ({', '.join(map(str, duplicates[:5]))})")
+        raise ValueError(f"Can't store {entity} in SQLite: {'; '.join(problems)}. "
+                         f"Run 'fsck --repair' on the source store first.")
+    return [_row_values(entity, r) for r in records]
+
+def _upsert(conn: sqlite3.Connection, entity: str, records: list[dict]) -> None:
+    columns = list(FIELDS[entity])
+    if entity in KEYS:
+        columns.append(KEYS[entity][0])
+    sql = (
+        f"INSERT OR REPLACE INTO {entity} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    conn.executemany(sql, _rows(entity, records))
+
+def _select(entity: str, where: str = "", params: tuple = ()) -> list[dict]:
+    sql = f"SELECT {', '.join(FIELDS[entity])} FROM {entity} {where} ORDER BY id"
+    return [dict(row) for row in _connect().execute(sql, params)]
+
+def files(entity: str) -> list[Path]:
+    """All tables live in the one database file."""
+    return [_db_path()]
+
+def load(entity: str) -> list[dict]:
+    return _select(entity)
+
+def save(entity: str, records: list[dict]) -> None:
+    """Replace the table in one transaction: a failing row leaves the old contents."""
+    conn = _connect()
+    with conn:
+        conn.execute(f"DELETE FROM {entity}")
+        _upsert(conn, entity, records)
+
+def insert(entity: str, records: list[dict]) -> None:
+    conn = _connect()
+    with conn:
+        _upsert(conn, entity, records)
+
+def update(entity: str, records: list[dict]) -> None:
+    conn = _connect()
+    with conn:
+        _upsert(conn, entity, records)
+
+def compact(entity: str) -> None:
+    _connect().execute("VACUUM")
+
+def select(entity: str, **where: int) -> list[dict]:
+    """Equality filter on indexed foreign-key columns."""
+    clause = " AND ".join(f"{column} = ?" for column in where)
+    return _select(entity, f"WHERE {clause}", tuple(where.values()))
+
+def stream(entity: str, **where: int) -> Iterator[dict]:
+    """Stream rows from a cursor instead of materialising the result."""
+    clause = ("WHERE " + " AND ".join(f"{column} = ?" for column in where)) if where else ""
+    sql = f"SELECT {', '.join(FIELDS[entity])} FROM {entity} {clause} ORDER BY id"
+    for row in _connect().execute(sql, tuple(where.values())):
+        yield dict(row)
+
+def lookup(entity: str, key: str) -> dict | None:
+    """First record whose case-folded name/title equals key."""
+    column, _ = KEYS[entity]
+    rows = _select(entity, f"WHERE {column} = ?", (key,))
+    return rows[0] if rows else None
+
+def max_id(entity: str) -> int:
+    row = _connect().execute(f"SELECT MAX(id) FROM {entity}").fetchone()
+    return row[0] or 0
@@ -1,56 +1,684 @@
 from __future__ import annotations
+import importlib
 import json
+import os
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, List, Dict
+from types import ModuleType
+from typing import Any, BinaryIO, Iterable, Iterator, List, Dict
 
-DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+try:
+    import fcntl
+except ImportError:  # not on Windows: locking is skipped there
+    fcntl = None
+
+from utils import timing
+
+DATA_DIR = Path(os.environ.get("PROJECT_CLI_DATA_DIR") or Path(__file__).resolve().parent.parent / "data")
 USERS_FILE = DATA_DIR / "users.json"
 PROJECTS_FILE = DATA_DIR / "projects.json"
 TASKS_FILE = DATA_DIR / "tasks.json"
 
+ENTITIES = ("users", "projects", "tasks")
+
+# Storage backends: name -> module implementing load/save/insert/update/compact/files
+# (and optionally select/lookup/max_id/stream for indexed or streaming queries)
+STORES = {
+    "json": "utils.json_store",
+    "journal": "utils.journal",
+    "sqlite": "utils.sqlite_store",
+    "binary": "utils.binary_store",
+    "sharded": "utils.sharded_store",
+}
+STORE = os.environ.get("PROJECT_CLI_STORE", "json")
+# Worker processes for loading whole JSON files (see utils/parallel.py); 1 = in-process
+WORKERS = int(os.environ.get("PROJECT_CLI_WORKERS", 1))
+# Longest wait for another process's lock before giving up, in seconds
+LOCK_TIMEOUT = float(os.environ.get("PROJECT_CLI_LOCK_TIMEOUT", 30))
+LOCK_NAME = ".project-cli.lock"
+
+class UnreadableFileError(Exception):
+    """
+    A data file can't be read as it is (it doesn't parse to its end, or its
+    parts don't belong together), so writing to it would lose or duplicate records.
+    """
+
+# Advisory lock on DATA_DIR/.project-cli.lock, shared by readers and exclusive
+# for writers; nested use within the process only counts depth
+_lock_file: Any = None
+_lock_depth = 0
+_lock_exclusive = False
+
+def _flock(f: Any, exclusive: bool) -> None:
+    """Take (or convert) the lock, polling so the wait can time out."""
+    if fcntl is None:
+        return
+    op = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    delay = 0.001
+    with timing.phase("storage.lock_wait"):
+        while True:
+            try:
+                fcntl.flock(f.fileno(), op)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Data folder is locked by another process (waited {LOCK_TIMEOUT:g}s).") from None
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+@contextmanager
+def _locked(exclusive: bool) -> Iterator[None]:
+    global _lock_file, _lock_depth, _lock_exclusive
+    if _lock_depth and (_lock_exclusive or not exclusive):
+        _lock_depth += 1
+        try:
+            yield
+        finally:
+            _lock_depth -= 1
+        return
+
+    upgraded = _lock_depth > 0
+    if not upgraded:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        _lock_file = open(DATA_DIR / LOCK_NAME, "a+b")
+    try:
+        _flock(_lock_file, exclusive)
+    except BaseException:
+        if not upgraded:
+            _lock_file.close()
+            _lock_file = None
+        raise
+    _lock_exclusive = exclusive
+    _lock_depth += 1
+    try:
+        yield
+    finally:
+        _lock_depth -= 1
+        if _lock_depth == 0:
+            _lock_file.close()  # closing releases the lock
+            _lock_file, _lock_exclusive = None, False
+        elif upgraded:
+            # Back to the shared lock the outer reader holds
+            if fcntl is not None:
+                fcntl.flock(_lock_file.fileno(), fcntl.LOCK_SH)
+            _lock_exclusive = False
+
+def transaction() -> Any:
+    """
+    Exclusive lock for a read-modify-write across processes:
+
+        with storage.transaction():
+            tasks = storage.load_tasks()
+            ...
+            storage.save_tasks(tasks)
+
+    Reentrant; single storage writes take it on their own. Raises
+    TimeoutError after LOCK_TIMEOUT seconds of waiting.
+    """
+    return _locked(exclusive=True)
+
+def _reading() -> Any:
+    """Shared lock: no writer can change the files while we read them."""
+    return _locked(exclusive=False)
+
 def _read_json(path: Path) -> list[dict]:
     """
-    Read a JSON list from a file. If file missing or broken, return empty list.
+    Read a JSON list from a file. If file missing or broken, return empty list
+    (or the complete items before a torn end, e.g. from an interrupted append).
     """
     try:
         if not path.exists():
             return []
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        # Ensure list
-        return data if isinstance(data, list) else []
+        with timing.phase("storage.read_json") as counts:
+            raw = path.read_bytes()
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                data = list(_iter_json(path))
+            # Ensure list
+            data = data if isinstance(data, list) else []
+            counts["bytes"], counts["records"] = len(raw), len(data)
+        return data
     except Exception:
-        # In case of invalid JSON or other I/O errors
+        # In case of other I/O errors
         return []
 
-def _write_json(path: Path, data: list[dict]) -> None:
+def _iter_json(path: Path, chunk_size: int = 1 << 16, objects_only: bool = True,
+               status: dict | None = None) -> Iterator[dict]:
     """
-    Write a list of dictionaries to a JSON file in a human-readable format.
+    Yield the objects of a JSON list one by one without loading the whole file
+    (other items are skipped unless objects_only=False).
+    A broken tail ends the stream quietly, like _read_json's empty fallback;
+    pass a status dict to learn about it: once the stream ends it holds
+    "complete" (the closing "]" was reached, or the file is missing or
+    empty) and otherwise "offset", the byte where parsing stopped.
+    """
+    if status is not None:
+        status.update(complete=True, offset=None)
+    if not path.exists():
+        return
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as f:
+        raw = f.read(chunk_size)
+        buf = raw.lstrip()
+        # Characters of the file before buf[0]
+        consumed = len(raw) - len(buf)
+        if not buf:
+            return
+        if not buf.startswith("["):
+            _stopped(path, status, consumed)
+            return
+        pos = 1
+        eof = False
+        while True:
+            # Skip separators between items
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    _stopped(path, status, consumed + pos)
+                    return
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                consumed += pos
+                pos = 0
+                continue
+            if isinstance(item, dict) or not objects_only:
+                yield item
+            pos = end
+
+def _stopped(path: Path, status: dict | None, chars: int) -> None:
+    """Record in status that parsing of path stopped `chars` characters in."""
+    if status is not None:
+        status.update(complete=False, offset=len(path.read_text(encoding="utf-8")[:chars].encode("utf-8")))
+
+def _dump_item(item: Any) -> bytes:
+    """One list item as it appears inside the file (indented by two spaces)."""
+    return ("  " + json.dumps(item, indent=2, ensure_ascii=False).replace("\n", "\n  ")).encode("utf-8")
+
+@contextmanager
+def _atomic_file(path: Path, durable: bool = True) -> Iterator[BinaryIO]:
+    """
+    Binary file that replaces `path` only once it is completely written, so
+    readers see either the old or the new content. durable=True also fsyncs
+    the data and the rename; sidecar files that can be rebuilt skip that.
     """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            yield f
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if durable and hasattr(os, "O_DIRECTORY"):
+        fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def _write_json(path: Path, data: list[dict]) -> list[tuple[int, int]]:
+    """
+    Write a list of dictionaries to a JSON file in a human-readable format
+    (same layout as json.dump(indent=2)), atomically. Returns the (offset,
+    length) byte span of every item so callers can index the file.
+    """
+    spans: list[tuple[int, int]] = []
+    with timing.phase("storage.write_json") as counts, _atomic_file(path) as f:
+        if not data:
+            f.write(b"[]")
+            return spans
+        pos = f.write(b"[\n")
+        for i, item in enumerate(data):
+            if i:
+                pos += f.write(b",\n")
+            chunk = _dump_item(item)
+            # The span skips the two-space indent so it holds exactly the item's JSON
+            spans.append((pos + 2, len(chunk) - 2))
+            pos += f.write(chunk)
+        pos += f.write(b"\n]")
+        counts["bytes"], counts["records"] = pos, len(data)
+    return spans
+
+def _path(entity: str) -> Path:
+    """Snapshot file of an entity ('users', 'projects' or 'tasks')."""
+    files = {"users": USERS_FILE, "projects": PROJECTS_FILE, "tasks": TASKS_FILE}
+    return files[entity]
+
+def _store() -> ModuleType:
+    """Return the backend module selected by STORE."""
+    if STORE not in STORES:
+        raise ValueError(f"Unknown store '{STORE}'. Choose from: {', '.join(STORES)}")
+    return importlib.import_module(STORES[STORE])
+
+def _name_key(value: str) -> str:
+    """Normalised form used for case-insensitive name/title lookups."""
+    return value.strip().lower()
+
+class _Table:
+    """Records of one entity kept in memory, with lookup indexes built on demand."""
+
+    def __init__(self, records: list[dict], fingerprint: tuple) -> None:
+        self.records = records
+        self.fingerprint = fingerprint
+        self._indexes: dict[str, dict[Any, list[dict]]] = {}
+        self._max_id: int | None = None
+        # id -> positions in records, built by the first small replace()
+        self._positions: dict[Any, list[int]] | None = None
+
+    def max_id(self) -> int:
+        if self._max_id is None:
+            self._max_id = max((r["id"] for r in self.records if isinstance(r.get("id"), int)), default=0)
+        return self._max_id
+
+    def index(self, field: str) -> dict[Any, list[dict]]:
+        """field value -> records; names and titles are keyed case-insensitively."""
+        if field not in self._indexes:
+            idx: dict[Any, list[dict]] = {}
+            for r in self.records:
+                idx.setdefault(self._key(field, r), []).append(r)
+            self._indexes[field] = idx
+        return self._indexes[field]
+
+    @staticmethod
+    def _key(field: str, record: dict) -> Any:
+        value = record.get(field)
+        return _name_key(str(value or "")) if field in ("name", "title") else value
+
+    def add(self, records: list[dict]) -> None:
+        if self._positions is not None:
+            for pos, r in enumerate(records, len(self.records)):
+                self._positions.setdefault(r.get("id"), []).append(pos)
+        self.records.extend(records)
+        if self._max_id is not None:
+            self._max_id = max([self._max_id, *(r["id"] for r in records if isinstance(r.get("id"), int))])
+        for field, idx in self._indexes.items():
+            for r in records:
+                idx.setdefault(self._key(field, r), []).append(r)
+
+    def replace(self, records: list[dict]) -> None:
+        changed = {r["id"]: r for r in records}
+        if len(changed) > len(self.records) // 16:
+            self.records = [changed.get(r.get("id"), r) for r in self.records]
+            self._indexes.clear()
+            return
+        # A few records (complete-task): patch them and their index entries in place
+        if self._positions is None:
+            self._positions = {}
+            for pos, r in enumerate(self.records):
+                self._positions.setdefault(r.get("id"), []).append(pos)
+        for rid, new in changed.items():
+            for pos in self._positions.get(rid, ()):
+                old = self.records[pos]
+                self.records[pos] = new
+                for field, idx in list(self._indexes.items()):
+                    key = self._key(field, old)
+                    if key != self._key(field, new):
+                        # Rebuilt on next use, so the entries keep the records' order
+                        del self._indexes[field]
+                        continue
+                    bucket = idx[key]
+                    bucket[next(i for i, r in enumerate(bucket) if r is old)] = new
+
+# (store, entity) -> _Table while the memory cache is on (long-running processes)
+_memory: dict[tuple[str, str], _Table] | None = None
+
+def enable_memory_cache() -> None:
+    """
+    Keep loaded records and their indexes in memory between calls.
+    A table is reloaded when its files change underneath (another process wrote).
+    """
+    global _memory
+    _memory = {}
+
+# Writes held back by deferred_writes() until flush(): (entity, kind, records) in order
+_pending: list[tuple[str, str, list[dict]]] | None = None
+_pending_counts: dict[str, int] = {}
+_pending_run = 0
+
+def fingerprint(entity: str) -> tuple:
+    """
+    (mtime_ns, size) of every file backing an entity in the current store,
+    plus a marker no stored file has while writes to it are deferred.
+    """
+    parts = _file_state(entity)
+    if _pending_counts.get(entity):
+        # Derived data built from unflushed records must not look current after a crash
+        parts += (("pending", _pending_run, _pending_counts[entity]),)
+    return parts
+
+def _file_state(entity: str) -> tuple:
+    store = _store()
+    # A store can name fewer files that still change with every write
+    paths = store.fingerprint_files(entity) if hasattr(store, "fingerprint_files") else store.files(entity)
+    parts = []
+    for path in paths:
+        try:
+            st = path.stat()
+            parts.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            parts.append(None)
+    return tuple(parts)
+
+def _cached(entity: str) -> _Table:
+    fp = _file_state(entity)
+    table = _memory.get((STORE, entity))
+    if table is None or table.fingerprint != fp:
+        table = _memory[(STORE, entity)] = _Table(_store().load(entity), fp)
+    return table
+
+def _drop_results(entity: str) -> None:
+    """Delete cached list output computed from entity (see utils/result_cache.py)."""
+    if (DATA_DIR / ".cache").exists():
+        from utils import result_cache
+        result_cache.invalidate(entity)
+
+def _log_changes(writes: list[tuple[str, str, list[dict]]]) -> None:
+    """Append (entity, kind, records) writes to the change feed (see utils/changes.py)."""
+    from utils import changes
+    changes.record(writes)
+
+def _after_write(entity: str, change) -> None:
+    """Apply a write to the in-memory copy instead of dropping it."""
+    _drop_results(entity)
+    if _memory is None:
+        return
+    table = _memory.get((STORE, entity))
+    if table is not None:
+        change(table)
+        table.fingerprint = _file_state(entity)
+
+def load(entity: str) -> list[dict]:
+    """Load all raw dicts of an entity."""
+    with _reading():
+        if _memory is not None:
+            return list(_cached(entity).records)
+        return _store().load(entity)
+
+def save(entity: str, records: list[dict]) -> None:
+    """Replace all records of an entity."""
+    with transaction():
+        flush()
+        _store().save(entity, records)
+        _drop_results(entity)
+        if _memory is not None:
+            _memory[(STORE, entity)] = _Table(list(records), _file_state(entity))
+
+def insert(entity: str, records: list[dict]) -> None:
+    """Add new records (each with a fresh id)."""
+    if records:
+        with transaction():
+            if _pending is not None:
+                _defer(entity, "insert", records, lambda t: t.add(records))
+                return
+            _store().insert(entity, records)
+            _log_changes([(entity, "insert", records)])
+            _after_write(entity, lambda t: t.add(records))
+
+def update(entity: str, records: list[dict]) -> None:
+    """Replace existing records, matched by id."""
+    if records:
+        with transaction():
+            if _pending is not None:
+                _defer(entity, "update", records, lambda t: t.replace(records))
+                return
+            _store().update(entity, records)
+            _log_changes([(entity, "update", records)])
+            _after_write(entity, lambda t: t.replace(records))
+
+def compact(entity: str) -> None:
+    """Fold any pending changes of an entity back into its snapshot."""
+    with transaction():
+        flush()
+        _store().compact(entity)
+        _after_write(entity, lambda t: None)
+
+@contextmanager
+def deferred_writes() -> Iterator[None]:
+    """
+    Hold the transaction and apply insert()/update() to the in-memory tables
+    only, writing them out in flush() - called on leaving the block, and by
+    save()/compact() - with one insert and one update per entity:
+
+        with storage.deferred_writes():
+            for line in script:
+                run(line)
+                if every_n_lines:
+                    storage.flush()
+
+    Turns on the memory cache. Writes still pending when the block raises are
+    discarded, together with the in-memory tables they touched.
+    """
+    global _pending, _pending_run
+    if _memory is None:
+        enable_memory_cache()
+    with transaction():
+        _pending, _pending_run = [], time.time_ns()
+        try:
+            yield
+            flush()
+        finally:
+            for entity in _pending_counts:
+                _memory.pop((STORE, entity), None)
+            _pending = None
+            _pending_counts.clear()
+
+def deferring() -> bool:
+    """True inside deferred_writes()."""
+    return _pending is not None
+
+def _defer(entity: str, kind: str, records: list[dict], change) -> None:
+    change(_cached(entity))
+    _pending.append((entity, kind, records))
+    _pending_counts[entity] = _pending_counts.get(entity, 0) + 1
+
+def flush() -> None:
+    """Write out the changes held back by deferred_writes() (no-op outside it)."""
+    global _pending
+    if not _pending:
+        return
+    writes = _pending
+    with transaction(), timing.phase("storage.flush") as counts:
+        for entity in ENTITIES:
+            # Later writes of a record win; updates of records added in this run fold into the insert
+            added: dict[Any, dict] = {}
+            changed: dict[Any, dict] = {}
+            for e, kind, records in writes:
+                if e != entity:
+                    continue
+                for r in records:
+                    rid = r.get("id")
+                    if kind == "insert" or rid in added:
+                        added[rid] = r
+                    else:
+                        changed[rid] = r
+            if added:
+                _store().insert(entity, list(added.values()))
+            if changed:
+                _store().update(entity, list(changed.values()))
+            if added or changed:
+                _drop_results(entity)
+                table = _memory.get((STORE, entity))
+                if table is not None:
+                    table.fingerprint = _file_state(entity)
+                _pending_counts.pop(entity, None)
+            counts["records"] = counts.get("records", 0) + len(added) + len(changed)
+        _log_changes(writes)
+        _pending = []
+
+def select(entity: str, **where: int) -> list[dict]:
+    """Records whose fields equal the given values (e.g. project_id=3)."""
+    with _reading(), timing.phase("storage.select") as counts:
+        found = _select(entity, **where)
+        counts["records"] = len(found)
+    return found
+
+def _select(entity: str, **where: int) -> list[dict]:
+    if _memory is not None and where:
+        (field, value), *rest = where.items()
+        candidates = _cached(entity).index(field).get(value, [])
+        return [r for r in candidates if all(r.get(k) == v for k, v in rest)]
+    store = _store()
+    if hasattr(store, "select"):
+        return store.select(entity, **where)
+    return [r for r in load(entity) if all(r.get(k) == v for k, v in where.items())]
+
+def fetch(entity: str, ids: Iterable[int]) -> dict[int, dict]:
+    """Records with the given ids, by id; one read where the store supports it."""
+    wanted = sorted({i for i in ids if isinstance(i, int)})
+    with _reading(), timing.phase("storage.fetch") as counts:
+        if not wanted:
+            found = []
+        elif _memory is not None:
+            by_id = _cached(entity).index("id")
+            found = [by_id[i][0] for i in wanted if by_id.get(i)]
+        elif hasattr(_store(), "fetch"):
+            found = _store().fetch(entity, wanted)
+        else:
+            found = [r for i in wanted for r in _select(entity, id=i)[:1]]
+        counts["records"] = len(found)
+    records: dict[int, dict] = {}
+    for r in found:
+        records.setdefault(r["id"], r)
+    return records
+
+def stream(entity: str, **where: int) -> Iterator[dict]:
+    """Stream records of an entity, optionally filtered like select()."""
+    store = _store()
+    # The shared lock is held until the stream is exhausted or closed
+    with _reading():
+        if _memory is None and hasattr(store, "stream"):
+            records = store.stream(entity, **where)
+        else:
+            records = select(entity, **where) if where else load(entity)
+        counts = {}
+        if timing.ENABLED and not where:
+            counts["bytes"] = sum(p.stat().st_size for p in store.files(entity) if p.exists())
+        yield from timing.wrap("storage.stream", records, **counts)
+
+def lookup(entity: str, key: str) -> dict | None:
+    """First user (by name) or project (by title) matching key, case-insensitive."""
+    with _reading(), timing.phase("storage.lookup") as counts:
+        found = _lookup(entity, _name_key(key))
+        counts["records"] = int(found is not None)
+    return found
+
+def _lookup(entity: str, key: str) -> dict | None:
+    field = "name" if entity == "users" else "title"
+    if _memory is not None:
+        matches = _cached(entity).index(field).get(key)
+        return matches[0] if matches else None
+    store = _store()
+    if hasattr(store, "lookup"):
+        return store.lookup(entity, key)
+    for r in store.load(entity):
+        if _name_key(str(r.get(field) or "")) == key:
+            return r
+    return None
+
+def max_id(entity: str) -> int:
+    """Highest stored id of an entity (0 if empty)."""
+    store = _store()
+    with _reading():
+        if _memory is not None:
+            return _cached(entity).max_id()
+        if hasattr(store, "max_id"):
+            return store.max_id(entity)
+        return max((r["id"] for r in load(entity) if isinstance(r.get("id"), int)), default=0)
+
+def migrate(source: str, target: str) -> dict[str, int]:
+    """Copy every entity from one store to another; returns record counts."""
+    global STORE
+    previous = STORE
+    counts: dict[str, int] = {}
+    try:
+        with transaction():
+            for entity in ENTITIES:
+                STORE = source
+                records = load(entity)
+                STORE = target
+                save(entity, records)
+                counts[entity] = len(records)
+    finally:
+        STORE = previous
+    return counts
+
+def find_user(name: str) -> dict | None:
+    """Raw user dict by name (case-insensitive)."""
+    return lookup("users", name)
+
+def find_project(title: str) -> dict | None:
+    """Raw project dict by title (case-insensitive)."""
+    return lookup("projects", title)
 
 def load_users() -> list[dict]:
     """Load raw user dicts."""
-    return _read_json(USERS_FILE)
+    return load("users")
 
 def save_users(users: list[dict]) -> None:
     """Save raw user dicts."""
-    _write_json(USERS_FILE, users)
+    save("users", users)
+
+def insert_users(users: list[dict]) -> None:
+    """Append new raw user dicts."""
+    insert("users", users)
 
-def load_projects() -> list[dict]:
-    """Load raw project dicts."""
-    return _read_json(PROJECTS_FILE)
+def load_projects(user_id: int | None = None) -> list[dict]:
+    """Load raw project dicts, optionally only those owned by user_id."""
+    if user_id is not None:
+        return select("projects", user_id=user_id)
+    return load("projects")
+
+def iter_projects(user_id: int | None = None) -> Iterator[dict]:
+    """Stream raw project dicts, optionally only those owned by user_id."""
+    return stream("projects", **({} if user_id is None else {"user_id": user_id}))
 
 def save_projects(projects: list[dict]) -> None:
     """Save raw project dicts."""
-    _write_json(PROJECTS_FILE, projects)
+    save("projects", projects)
+
+def insert_projects(projects: list[dict]) -> None:
+    """Append new raw project dicts."""
+    insert("projects", projects)
+
+def load_tasks(project_id: int | None = None, assigned_to: int | None = None) -> list[dict]:
+    """Load raw task dicts, optionally filtered by project and/or assignee."""
+    where = {}
+    if project_id is not None:
+        where["project_id"] = project_id
+    if assigned_to is not None:
+        where["assigned_to"] = assigned_to
+    return select("tasks", **where) if where else load("tasks")
 
-def load_tasks() -> list[dict]:
-    """Load raw task dicts."""
-    return _read_json(TASKS_FILE)
+def iter_tasks(project_id: int | None = None, assigned_to: int | None = None) -> Iterator[dict]:
+    """Stream raw task dicts, optionally filtered by project and/or assignee."""
+    where = {}
+    if project_id is not None:
+        where["project_id"] = project_id
+    if assigned_to is not None:
+        where["assigned_to"] = assigned_to
+    return stream("tasks", **where)
 
 def save_tasks(tasks: list[dict]) -> None:
     """Save raw task dicts."""
-    _write_json(TASKS_FILE, tasks)
\ No newline at end of file
+    save("tasks", tasks)
+
+def insert_tasks(tasks: list[dict]) -> None:
+    """Append new raw task dicts."""
+    insert("tasks", tasks)
+
+def update_tasks(tasks: list[dict]) -> None:
+    """Replace raw task dicts with the same ids."""
+    update("tasks", tasks)
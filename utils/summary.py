@@ -0,0 +1,80 @@
+"""
+Materialized task rollups for `project-cli report`.
+
+The summary holds task counts by status per project and per assignee
+(assignee 0 = unassigned), stored as [todo, in-progress, done] lists in
+data/<store>.summary.json together with the fingerprint of the task files it
+describes. add-task and complete-task fold their change into it, so report
+never rescans tasks; any other writer (import, batch, another store...)
+changes the fingerprint and the next report rebuilds it with one streaming
+pass.
+"""
+from __future__ import annotations
+import json
+from pathlib import Path
+
+from models.task import Task
+from utils import storage
+
+_STATUS_INDEX = {s: i for i, s in enumerate(Task.STATUSES)}
+
+def _path() -> Path:
+    return storage.DATA_DIR / f"{storage.STORE}.summary.json"
+
+def _status(record: dict) -> int:
+    # Unknown statuses count as 'todo', like Task.from_dict reads them
+    return _STATUS_INDEX.get(record.get("status"), 0)
+
+def _count(summary: dict, record: dict, delta: int) -> None:
+    status = _status(record)
+    for group, key in (("by_project", record.get("project_id")), ("by_assignee", record.get("assigned_to") or 0)):
+        counts = summary[group].setdefault(str(key), [0] * len(Task.STATUSES))
+        counts[status] += delta
+
+def _save(summary: dict) -> None:
+    summary["fingerprint"] = list(storage.fingerprint("tasks"))
+    with storage._atomic_file(_path(), durable=False) as f:
+        f.write(json.dumps(summary).encode("utf-8"))
+
+def current() -> dict | None:
+    """The stored summary if it still describes the task data, else None."""
+    if storage.deferring():
+        # Flushing a batch's writes changes the task files anyway; report rebuilds after it
+        return None
+    try:
+        summary = json.loads(_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    # JSON turns the fingerprint's tuples into lists, so compare in that form
+    if summary.get("fingerprint") != json.loads(json.dumps(storage.fingerprint("tasks"))):
+        return None
+    return summary
+
+def build() -> dict:
+    """Recount everything in one pass over the tasks and store the result."""
+    summary: dict = {"by_project": {}, "by_assignee": {}}
+    # One shared lock so the fingerprint saved is the one of the tasks counted
+    with storage._reading():
+        for record in storage.stream("tasks"):
+            _count(summary, record, 1)
+        _save(summary)
+    return summary
+
+def get() -> dict:
+    """Current summary, rebuilding it if the tasks changed behind its back."""
+    return current() or build()
+
+def apply(summary: dict | None, added: list[dict] = (), changed: list[tuple[dict, dict]] = ()) -> None:
+    """
+    Fold a write into `summary` (taken with current() just before the write)
+    and store it: `added` tasks, and `changed` (old record, new record) pairs.
+    A missing or stale summary is left for the next report to rebuild.
+    """
+    if summary is None:
+        return
+    for record in added:
+        _count(summary, record, 1)
+    for old, new in changed:
+        _count(summary, old, -1)
+        _count(summary, new, 1)
+    _save(summary)
@@ -0,0 +1,232 @@
+"""
+`project-cli export --to URL` (alias `sync`): push users, projects and tasks
+to an HTTP endpoint.
+
+Records go out as POST requests with a JSON body {"entity": ..., "records":
+[...]}, BATCH_SIZE records each, optionally gzip-compressed. CONCURRENCY
+workers each keep one HTTP/1.1 connection open and share a queue of at most
+CONCURRENCY batches. The batches of an entity are first encoded into a
+temporary file at disk speed under the shared storage lock, which is then
+released, so a slow endpoint never holds up writers.
+
+data/sync.json keeps, per URL, the highest id sent of every entity; the next
+export only sends records above it (--full ignores it). This catches new
+records, not edits to old ones. The mark only moves once every batch of an
+entity was accepted, so a failed export resends rather than skips records.
+"""
+from __future__ import annotations
+import asyncio
+import gzip
+import json
+import os
+import ssl
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+from urllib.parse import urlsplit
+
+from utils import storage, timing
+
+BATCH_SIZE = int(os.environ.get("PROJECT_CLI_EXPORT_BATCH", 500))
+CONCURRENCY = int(os.environ.get("PROJECT_CLI_EXPORT_CONCURRENCY", 4))
+TIMEOUT = float(os.environ.get("PROJECT_CLI_EXPORT_TIMEOUT", 30))
+
+class SyncError(Exception):
+    """The endpoint refused a batch or could not be reached."""
+
+def _marks_path() -> Path:
+    return storage.DATA_DIR / "sync.json"
+
+def _load_marks() -> dict:
+    try:
+        return json.loads(_marks_path().read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _save_mark(url: str, entity: str, high: int) -> None:
+    marks = _load_marks()
+    marks.setdefault(url, {})[entity] = high
+    with storage._atomic_file(_marks_path()) as f:
+        f.write(json.dumps(marks, indent=2).encode("utf-8"))
+
+def marks(url: str) -> dict[str, int]:
+    """Highest id already exported to url, per entity."""
+    return _load_marks().get(url, {})
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection to the endpoint."""
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise SyncError(f"Not an http(s) URL: {url}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def post(self, body: bytes, compressed: bool) -> None:
+        # A reused connection may have been closed by the server while idle: retry once on a new one
+        reused = self.writer is not None
+        try:
+            await asyncio.wait_for(self._post(body, compressed), TIMEOUT)
+        except (OSError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+            await asyncio.wait_for(self._post(body, compressed), TIMEOUT)
+
+    async def _post(self, body: bytes, compressed: bool) -> None:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        headers = [
+            f"POST {self.target} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+        ]
+        if compressed:
+            headers.append("Content-Encoding: gzip")
+        self.writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by the endpoint")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise SyncError(f"malformed response: {status_line[:80]!r}") from None
+        length, chunked, close = None, False, False
+        while (line := await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = "chunked" in value
+            elif name == "connection":
+                close = value == "close"
+        if chunked:
+            while size := int((await self.reader.readline()).split(b";")[0], 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        elif length is not None:
+            await self.reader.readexactly(length)
+        else:
+            await self.reader.read()
+            close = True
+        if close:
+            self.close()
+        if not 200 <= status < 300:
+            raise SyncError(f"Endpoint answered HTTP {status}")
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+def _batches(records: Iterable[dict], size: int) -> Iterable[list[dict]]:
+    batch = []
+    for r in records:
+        batch.append(r)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _spool(entity: str, since: int, batch_size: int, compress: bool, counts: dict) -> tuple[BinaryIO, int]:
+    """
+    Encode the batches of records with id > since into a temporary file
+    (length-prefixed bodies), holding the read lock only meanwhile. Returns
+    (file, highest id).
+    """
+    spool = tempfile.TemporaryFile()
+    high = since
+    records = (r for r in storage.stream(entity)
+               if isinstance(r.get("id"), int) and r["id"] > since)
+    try:
+        for batch in _batches(records, batch_size):
+            body = json.dumps({"entity": entity, "records": batch}, ensure_ascii=False).encode("utf-8")
+            if compress:
+                body = gzip.compress(body, compresslevel=5)
+            counts[entity] += len(batch)
+            counts["bytes"] += len(body)
+            high = max(high, max(r["id"] for r in batch))
+            spool.write(len(body).to_bytes(8, "little"))
+            spool.write(body)
+    except BaseException:
+        spool.close()
+        raise
+    finally:
+        records.close()
+    spool.seek(0)
+    return spool, high
+
+def _bodies(spool: BinaryIO) -> Iterator[bytes]:
+    while header := spool.read(8):
+        yield spool.read(int.from_bytes(header, "little"))
+
+async def _export_entity(connections: list[_Connection], entity: str, since: int, batch_size: int,
+                         compress: bool, counts: dict) -> int:
+    """Send records of entity with id > since; returns the highest id sent."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=len(connections))
+
+    async def worker(conn: _Connection) -> None:
+        # Runs until cancelled; it only finishes early by raising
+        while True:
+            body = await queue.get()
+            await conn.post(body, compress)
+            counts["batches"] += 1
+            queue.task_done()
+
+    spool, high = _spool(entity, since, batch_size, compress, counts)
+    workers = [asyncio.create_task(worker(conn)) for conn in connections]
+    try:
+        for body in _bodies(spool):
+            # Waits while the queue is full, unless a worker fails meanwhile
+            put = asyncio.ensure_future(queue.put(body))
+            await asyncio.wait([put, *workers], return_when=asyncio.FIRST_COMPLETED)
+            if not put.done():
+                put.cancel()
+                break
+        drained = asyncio.ensure_future(queue.join())
+        await asyncio.wait([drained, *workers], return_when=asyncio.FIRST_COMPLETED)
+        drained.cancel()
+    finally:
+        spool.close()
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    for w in workers:
+        if not w.cancelled() and w.exception() is not None:
+            raise w.exception()
+    return high
+
+def export(url: str, batch_size: int = BATCH_SIZE, concurrency: int = CONCURRENCY,
+           compress: bool = False, full: bool = False) -> dict[str, int]:
+    """Export new records of every entity to url; returns counts per entity plus batches and bytes."""
+    counts = {entity: 0 for entity in storage.ENTITIES}
+    counts.update(batches=0, bytes=0)
+    sent = {} if full else marks(url)
+
+    async def run() -> None:
+        connections = [_Connection(url) for _ in range(concurrency)]
+        try:
+            # Users and projects first, so the endpoint sees owners before what references them
+            for entity in storage.ENTITIES:
+                high = await _export_entity(connections, entity, sent.get(entity, 0), batch_size, compress, counts)
+                if high > sent.get(entity, 0) or full:
+                    _save_mark(url, entity, high)
+        finally:
+            for conn in connections:
+                conn.close()
+
+    with timing.phase("sync.export") as phase_counts:
+        asyncio.run(run())
+        phase_counts["records"] = sum(counts[e] for e in storage.ENTITIES)
+        phase_counts["bytes"] = counts["bytes"]
+    return counts
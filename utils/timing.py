@@ -0,0 +1,136 @@
+"""
+Per-phase timings for one CLI invocation.
+
+Code marks hot spots with `with timing.phase("storage.read_json") as p:` and
+may fill p["bytes"] / p["records"]; streams are timed per item with
+timing.wrap(). Phase times are exclusive: time spent in a nested phase (or in
+pulling from a wrapped stream) is not counted again in the enclosing one.
+
+Everything is a no-op until enable() is called (by --timings or when
+$PROJECT_CLI_TRACE names a JSON-lines file that receives one summary line per
+invocation).
+"""
+from __future__ import annotations
+import json
+import os
+import sys
+import time
+from typing import Any, Iterable, Iterator
+
+TRACE_FILE = os.environ.get("PROJECT_CLI_TRACE")
+
+ENABLED = False
+_totals: dict[str, dict[str, float]] = {}
+# Child time accumulated by each open phase, innermost last
+_stack: list[list[float]] = []
+_started = 0.0
+
+class _Phase:
+    __slots__ = ("name", "counts", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.counts: dict[str, int] = {}
+
+    def __enter__(self) -> dict[str, int]:
+        _stack.append([0.0])
+        self.start = time.perf_counter()
+        return self.counts
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        child = _stack.pop()[0]
+        _record(self.name, elapsed - child, self.counts)
+        if _stack:
+            _stack[-1][0] += elapsed
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> dict[str, int]:
+        return {}
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+_NULL = _NullPhase()
+
+def phase(name: str) -> Any:
+    """Context manager timing one phase; yields a dict for byte/record counts."""
+    return _Phase(name) if ENABLED else _NULL
+
+def wrap(name: str, items: Iterable, **counts: int) -> Iterable:
+    """Time each step of a stream as one phase; records = items produced."""
+    if not ENABLED:
+        return items
+    return _timed_stream(name, iter(items), counts)
+
+def _timed_stream(name: str, it: Iterator, counts: dict[str, int]) -> Iterator:
+    seconds, records = 0.0, 0
+    try:
+        while True:
+            _stack.append([0.0])
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                break
+            finally:
+                elapsed = time.perf_counter() - start
+                seconds += elapsed - _stack.pop()[0]
+                if _stack:
+                    _stack[-1][0] += elapsed
+            records += 1
+            yield item
+    finally:
+        # Also reached when the consumer stops early (e.g. --limit)
+        _record(name, seconds, dict(counts, records=records))
+
+def _record(name: str, seconds: float, counts: dict[str, int]) -> None:
+    entry = _totals.setdefault(name, {"seconds": 0.0, "calls": 0, "bytes": 0, "records": 0})
+    entry["seconds"] += seconds
+    entry["calls"] += 1
+    for key, value in counts.items():
+        entry[key] = entry.get(key, 0) + value
+
+def enable() -> None:
+    """Start collecting for a new invocation."""
+    global ENABLED, _started
+    ENABLED = True
+    _totals.clear()
+    _stack.clear()
+    _started = time.perf_counter()
+
+def finish(argv: list[str], command: str, show: bool) -> None:
+    """Stop collecting; print the breakdown (show=True) and/or append it to the trace file."""
+    global ENABLED
+    if not ENABLED:
+        return
+    ENABLED = False
+    total = time.perf_counter() - _started
+    phases = {name: dict(entry) for name, entry in _totals.items()}
+    if show:
+        _print(phases, total)
+    if TRACE_FILE:
+        line = {
+            "ts": time.time(),
+            "pid": os.getpid(),
+            "command": command,
+            "argv": argv,
+            "seconds": total,
+            "phases": phases,
+        }
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(line) + "\n")
+
+def _print(phases: dict[str, dict[str, float]], total: float) -> None:
+    """Aligned breakdown on stderr, slowest phase first."""
+    out = sys.stderr
+    out.write(f"{'phase':<22} {'ms':>10} {'calls':>7} {'bytes':>12} {'records':>10}\n")
+    accounted = 0.0
+    for name, e in sorted(phases.items(), key=lambda item: -item[1]["seconds"]):
+        accounted += e["seconds"]
+        out.write(f"{name:<22} {e['seconds'] * 1000:>10.1f} {int(e['calls']):>7} "
+                  f"{int(e['bytes']):>12} {int(e['records']):>10}\n")
+    out.write(f"{'other':<22} {(total - accounted) * 1000:>10.1f}\n")
+    out.write(f"{'total':<22} {total * 1000:>10.1f}\n")